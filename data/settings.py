@@ -1,3 +1,5 @@
 # game settings
 # To be implemented in later stage development
-FPS = 60
\ No newline at end of file
+FPS = 60
+# redraw only the board cells, headers and score panels that changed, False redraws full frames
+DIRTY_RECTS = True
@@ -0,0 +1,130 @@
+import os
+import re
+import time
+import random
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# game_id query parameter of showgame.php urls
+_GAME_ID = re.compile(r"game_id=(\d+)")
+
+def synthetic_page(game_id: int) -> str:
+    """A game page laid out like J! Archive's showgame.php: two 6x5 rounds, then the final.
+
+    Clue cells are emitted row by row as on the real site, each followed by its hidden
+    "_r" cell holding the correct response, and surrounded by comparable page chrome.
+    """
+    rng = random.Random(game_id)
+    words = ["river", "capital", "novel", "opera", "planet", "element", "king", "poet", "island", "treaty"]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    parts = [f"<html><head><title>J! Archive - Show #{game_id}</title>",
+             "<link rel='stylesheet' href='j-archive.css'></head><body><div id='content'>",
+             f"<div id='game_title'><h1>Show #{game_id} - game {game_id}</h1></div>",
+             "<div id='contestants'>" + "".join(f"<p class='contestants'><a>{text(2)}</a>, {text(6)}</p>" for _ in range(3)) + "</div>"]
+
+    for round_id, name in (("J", "jeopardy_round"), ("DJ", "double_jeopardy_round")):
+        parts.append(f"<div id='{name}'><table class='round'><tr>")
+        for i in range(1, 7):
+            parts.append(f"<td class='category'><table><tr><td class='category_name'>{text(2).upper()} {game_id}-{round_id}{i}</td></tr>"
+                         "<tr><td class='category_comments'></td></tr></table></td>")
+        parts.append("</tr>")
+        for j in range(1, 6):
+            parts.append("<tr>")
+            for i in range(1, 7):
+                clue_id = f"clue_{round_id}_{i}_{j}"
+                parts.append(
+                    "<td class='clue'><table><tr><td><table class='clue_header'><tr>"
+                    f"<td class='clue_value'>${j * 200}</td><td class='clue_order_number'><a>{rng.randrange(1, 31)}</a></td>"
+                    "</tr></table></td></tr><tr>"
+                    f"<td id='{clue_id}' class='clue_text'>{text(12)} ({game_id}/{clue_id})</td>"
+                    f"<td id='{clue_id}_r' class='clue_text' style='display:none;'>{text(3)}"
+                    f"<em class='correct_response'>{text(2)}</em><table><tr><td class='right'>{text(1)}</td></tr></table></td>"
+                    "</tr></table></td>")
+            parts.append("</tr>")
+        parts.append("</table></div>")
+
+    parts.append("<div id='final_jeopardy_round'><table class='final_round'><tr><td class='category'>"
+                 f"<table><tr><td class='category_name'>{text(2).upper()} {game_id}-FJ</td></tr></table></td></tr>"
+                 f"<tr><td id='clue_FJ' class='clue_text'>{text(15)} ({game_id}/clue_FJ)</td>"
+                 f"<td id='clue_FJ_r' class='clue_text' style='display:none;'><em class='correct_response'>{text(2)}</em></td></tr>"
+                 "</table></div>")
+    parts.append("<div id='footer'>" + text(40) + "</div></div></body></html>")
+    return "".join(parts)
+
+def saved_pages(directory: str) -> Callable[[int], str | None]:
+    """Serves <directory>/<game_id>.html files, e.g. pages saved from the real site."""
+    def page(game_id: int) -> str | None:
+        try:
+            with open(os.path.join(directory, f"{game_id}.html"), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    return page
+
+class ArchiveServer:
+    """
+    Local stand-in for j-archive.com serving game pages over keep-alive HTTP/1.1.
+
+    Attributes:
+        url: url template with a {} for the game id
+        requests: requests served, per game id
+        latency: seconds each response is delayed, like a round trip to the real site
+        error_rate: fraction of requests answered with a 503, drawn from a seeded rng so runs repeat
+        errors: 503s served
+    """
+
+    def __init__(self, pages: Callable[[int], str | None] = synthetic_page, latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: dict[int, int] = {}
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                match = _GAME_ID.search(self.path)
+                game_id = int(match.group(1)) if match else -1
+                with server._lock:
+                    server.requests[game_id] = server.requests.get(game_id, 0) + 1
+                    failed = server.error_rate and server._rng.random() < server.error_rate
+                    server.errors += bool(failed)
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if failed:
+                    page, status = None, 503
+                else:
+                    page = server.pages(game_id) if match else None
+                    status = 200 if page else 404
+                body = (page or ("unavailable" if failed else "not found")).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/showgame.php?game_id={{}}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="archive-server", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
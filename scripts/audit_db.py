@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import time
+import logging
+import sqlite3
+import argparse
+import multiprocessing
+from array import array
+from pathlib import Path
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from src.db import db_path
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+# question ids per parallel chunk
+DEFAULT_CHUNK_ROWS = 50_000
+# examples printed per issue
+DEFAULT_EXAMPLES = 5
+
+# clues that refer to a picture, audio or video the game can't show
+MEDIA_CLUE = re.compile(
+    r"\b(?:seen|shown|pictured|heard|displayed|played) here\b"
+    r"|\bclue crew\b"
+    r"|\b(?:this|the following) (?:video|audio|clip|photo|picture|image|map|sound|recording)\b"
+    r"|\bon the (?:monitor|screen|board)\b",
+    re.IGNORECASE,
+)
+
+# per question issues found by the chunk scan, each makes a question unplayable
+ROW_ISSUES = ("empty", "media", "final_no_category")
+# found across chunks: the same clue and answer again, under any category, the lowest id is kept
+DUPLICATE = "duplicate"
+
+def audit_chunk(job: tuple[str, int, int]) -> tuple[dict[str, array], array, array]:
+    """Pool worker: scans questions with ids in [first, stop) on its own read-only connection.
+
+    Returns the ids per row issue, plus every id with its clue/answer hash for the
+    duplicate pass.
+    """
+    path, first, stop = job
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    issues = {issue: array("q") for issue in ROW_ISSUES}
+    ids, hashes = array("q"), array("q")
+    rows = conn.execute("""
+        SELECT q.id, q.clue, q.answer, q.value, c.title
+        FROM questions q LEFT JOIN categories c ON c.id = q.category_id
+        WHERE q.id >= ? AND q.id < ?
+    """, (first, stop))
+    for question_id, clue, answer, value, title in rows:
+        if not clue.strip() or not answer.strip():
+            issues["empty"].append(question_id)
+        elif MEDIA_CLUE.search(clue):
+            issues["media"].append(question_id)
+        if value == schema.FINAL_VALUE and not (title and title.strip()):
+            issues["final_no_category"].append(question_id)
+        ids.append(question_id)
+        hashes.append(schema.content_hash(clue, answer, None))
+    conn.close()
+    return issues, ids, hashes
+
+def scan(conn: sqlite3.Connection, path: str, workers: int, chunk_rows: int) -> int:
+    """Fills temp.audit_issues with (question id, issue) for every issue found, returns the rows scanned."""
+    conn.execute("CREATE TEMP TABLE audit_issues (id INTEGER NOT NULL, issue TEXT NOT NULL, PRIMARY KEY (id, issue)) WITHOUT ROWID")
+    conn.execute("CREATE TEMP TABLE audit_pairs (hash INTEGER NOT NULL, id INTEGER NOT NULL)")
+    first, last = conn.execute("SELECT MIN(id), MAX(id) FROM questions").fetchone()
+    if first is None:
+        return 0
+
+    scanned = 0
+    jobs = ((path, start, start + chunk_rows) for start in range(first, last + 1, chunk_rows))
+    # spawn, each worker opens its own connection instead of inheriting this one
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        with conn:
+            for issues, ids, hashes in pool.imap_unordered(audit_chunk, jobs):
+                scanned += len(ids)
+                for issue, found in issues.items():
+                    conn.executemany("INSERT INTO audit_issues VALUES (?, ?)", ((i, issue) for i in found))
+                # sqlite sorts the pairs, so memory stays at one chunk however big the db is
+                conn.executemany("INSERT INTO audit_pairs VALUES (?, ?)", zip(hashes, ids))
+
+    with conn:
+        conn.execute("CREATE INDEX temp.audit_pairs_hash ON audit_pairs (hash, id)")
+        conn.execute(f"""
+            INSERT INTO audit_issues (id, issue)
+            SELECT id, '{DUPLICATE}' FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY hash ORDER BY id) AS n FROM audit_pairs
+            ) WHERE n > 1
+        """)
+        conn.execute("DROP TABLE audit_pairs")
+    return scanned
+
+def incomplete_categories(conn: sqlite3.Connection) -> list[tuple[str, list[int]]]:
+    """Categories with some but not all board values once flagged questions are left out, with the values they have."""
+    rows = conn.execute(f"""
+        SELECT c.title, GROUP_CONCAT(DISTINCT q.value)
+        FROM questions q JOIN categories c ON c.id = q.category_id
+        WHERE q.value IN ({", ".join(str(v) for v in schema.BOARD_VALUES)})
+        AND q.id NOT IN (SELECT id FROM audit_issues)
+        GROUP BY q.category_id
+        HAVING COUNT(DISTINCT q.value) < {len(schema.BOARD_VALUES)}
+    """).fetchall()
+    return [(title, sorted(int(v) for v in values.split(","))) for title, values in rows]
+
+def write_playable(conn: sqlite3.Connection) -> int:
+    """Flags every question with an issue unplayable and every other one playable, returns the unplayable count.
+
+    The derived indexes are rebuilt once in the same transaction, so boards only draw
+    playable questions from the next connection on.
+    """
+    with conn:
+        conn.execute("BEGIN")
+        with schema.bulk_load(conn):
+            conn.execute("UPDATE questions SET playable = 1 WHERE playable = 0")
+            conn.execute("UPDATE questions SET playable = 0 WHERE id IN (SELECT id FROM audit_issues)")
+    return conn.execute("SELECT COUNT(*) FROM questions WHERE playable = 0").fetchone()[0]
+
+def playable_counts(conn: sqlite3.Connection) -> tuple[int, int]:
+    """(eligible categories, finals) board generation can draw from."""
+    return (conn.execute("SELECT COUNT(*) FROM eligible_categories").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM final_ranks").fetchone()[0])
+
+def print_report(conn: sqlite3.Connection, scanned: int, examples: int):
+    counts = dict(conn.execute("SELECT issue, COUNT(*) FROM audit_issues GROUP BY issue").fetchall())
+    flagged = conn.execute("SELECT COUNT(DISTINCT id) FROM audit_issues").fetchone()[0]
+    print(f"{scanned:,} questions scanned, {flagged:,} unplayable")
+    for issue in (*ROW_ISSUES, DUPLICATE):
+        print(f"  {issue:18} {counts.get(issue, 0):9,}")
+        for question_id, clue, answer in conn.execute("""
+            SELECT q.id, q.clue, q.answer FROM audit_issues a JOIN questions q ON q.id = a.id
+            WHERE a.issue = ? ORDER BY q.id LIMIT ?
+        """, (issue, examples)):
+            print(f"      #{question_id}: {clue[:70]!r} -> {answer[:30]!r}")
+
+    incomplete = incomplete_categories(conn)
+    print(f"  {'incomplete values':18} {len(incomplete):9,} categories")
+    for title, values in incomplete[:examples]:
+        missing = [v for v in schema.BOARD_VALUES if v not in values]
+        print(f"      {title[:50]!r}: missing {', '.join(map(str, missing))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit questions.db for questions that can't be played.")
+    parser.add_argument("--db", default=db_path, help="path to questions.db")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="scanner processes")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_ROWS, help="question ids per chunk")
+    parser.add_argument("--examples", type=int, default=DEFAULT_EXAMPLES, help="examples printed per issue")
+    parser.add_argument("--write", action="store_true",
+                        help="store the result in the playable flag, boards then skip flagged questions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not os.path.exists(args.db):
+        logger.error(f"No question db at '{args.db}'.")
+        sys.exit(1)
+    conn = sqlite3.connect(args.db)
+    try:
+        if schema.schema_version(conn) < schema.SCHEMA_VERSION:
+            logger.error(f"'{args.db}' is schema version {schema.schema_version(conn)}, current is {schema.SCHEMA_VERSION}: "
+                         f"run scripts/migrate_db.py --db {args.db} first.")
+            sys.exit(1)
+        start = time.perf_counter()
+        scanned = scan(conn, args.db, args.workers, args.chunk)
+        elapsed = time.perf_counter() - start
+        print_report(conn, scanned, args.examples)
+        print(f"scanned in {elapsed:.1f}s ({scanned / elapsed if elapsed else 0:,.0f} rows/s, {args.workers} processes)")
+
+        if args.write:
+            before = playable_counts(conn)
+            unplayable = write_playable(conn)
+            after = playable_counts(conn)
+            print(f"playable flag written, {unplayable:,} questions unplayable")
+            print(f"eligible categories {before[0]:,} -> {after[0]:,}, finals {before[1]:,} -> {after[1]:,}")
+            print("rebuild the question pack (build_question_pack.py) if the game uses one")
+    except sqlite3.Error as e:
+        logger.error(f"Audit failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import argparse
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from src.db import questions_db
+from src.game_utils import load_board
+
+def build_db(path: str, rows: int):
+    """Fills a questions table shaped like the scraper's output with `rows` synthetic clues.
+
+    Roughly one in 61 rows is a final (value -1), like a scraped game.
+    """
+    conn = sqlite3.connect(path)
+    schema.create_table(conn)
+    num_categories = max(6, rows // 25)
+
+    def gen():
+        for i in range(rows):
+            if i % 61 == 60:
+                yield (f"final clue {i}", f"final answer {i}", -1, f"FINAL {i % 997}", "bench")
+            else:
+                value = (i % 5 + 1) * 100
+                yield (f"clue {i}", f"answer {i}", value, f"CATEGORY {(i // 5) % num_categories}", "bench")
+
+    with conn:
+        schema.insert_questions(conn, gen())
+    conn.close()
+
+# the queries Round() and Category() ran before the eligible category and sampling indexes,
+# adapted to the normalized schema, kept here so the legacy column measures the old path
+LEGACY_ELIGIBLE = """
+    SELECT c.title FROM questions q JOIN categories c ON c.id = q.category_id
+    WHERE q.value IN (100, 200, 300, 400, 500)
+    GROUP BY q.category_id
+    HAVING COUNT(DISTINCT q.value) = 5
+"""
+LEGACY_CLUE = """
+    SELECT q.clue, q.answer, q.value, c.title, q.origin
+    FROM questions q JOIN categories c ON c.id = q.category_id
+    WHERE c.title = ? AND q.value = ? ORDER BY RANDOM() LIMIT 1
+"""
+LEGACY_FINAL = "SELECT clue, answer, value, category_id, origin FROM questions WHERE value = -1 ORDER BY RANDOM() LIMIT 1"
+
+def legacy_board(path: str, num_rounds: int):
+    """Builds a board the way GameBoard did before load_board: per round a GROUP BY over every
+    question for the eligible categories, then five ORDER BY RANDOM() queries per category,
+    each on a connection of its own, plus the final query."""
+    rounds = []
+    for _ in range(num_rounds):
+        conn = sqlite3.connect(path)
+        titles = random.sample([row[0] for row in conn.execute(LEGACY_ELIGIBLE)], 6)
+        conn.close()
+        categories = []
+        for title in titles:
+            conn = sqlite3.connect(path)
+            categories.append([conn.execute(LEGACY_CLUE, (title, value)).fetchone() for value in schema.BOARD_VALUES])
+            conn.close()
+        rounds.append(categories)
+    conn = sqlite3.connect(path)
+    row = conn.execute(LEGACY_FINAL).fetchone()
+    conn.close()
+    return rounds, row
+
+def time_it(fn, repeat: int) -> tuple[float, str]:
+    """Returns the best time of repeat runs and the db counters of the last run."""
+    best = float("inf")
+    for _ in range(repeat):
+        db_stats = questions_db.stats()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best, questions_db.describe(db_stats)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-category board building against load_board.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="rows in the synthetic questions table")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", help="benchmark an existing questions.db instead of a synthetic one")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.db
+    if not path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "questions.db")
+        start = time.perf_counter()
+        build_db(path, args.rows)
+        print(f"built {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+    questions_db.open(path)
+
+    random.seed(0)
+    # open the shared connection outside the timed runs
+    with questions_db.connection():
+        pass
+    legacy, _ = time_it(lambda: legacy_board(path, args.rounds), args.repeat)
+    bulk, bulk_db = time_it(lambda: load_board(args.rounds), args.repeat)
+
+    # the legacy path opens its own connections, outside the shared connection's counters
+    legacy_db = f"{args.rounds * 7 + 1} connects, {args.rounds * 31 + 1} queries"
+    print(f"legacy GROUP BY/RANDOM() board: {legacy * 1000:9.1f} ms  ({legacy_db})")
+    print(f"load_board:                      {bulk * 1000:9.1f} ms  ({bulk_db})")
+    print(f"speedup:                         {legacy / bulk:9.1f}x")
+
+    questions_db.close()
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import argparse
+import requests
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from archive_server import ArchiveServer, saved_pages, synthetic_page
+from fetcher import PageFetcher
+from scraper import search_page
+
+def legacy_fetch(url_template: str, game_ids: range) -> int:
+    """The old scraper's traffic: two unpooled requests.get per page, one page at a time."""
+    pages = 0
+    for i in game_ids:
+        url = url_template.format(i)
+        for _ in range(2):
+            response = requests.get(url)
+            response.raise_for_status()
+        pages += 1
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page fetching against a local stand-in archive server.")
+    parser.add_argument("--pages", type=int, default=200, help="game pages fetched per run")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the server delays each response")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--saved", help="directory of saved <game_id>.html pages, synthetic pages otherwise")
+    args = parser.parse_args()
+
+    pages = saved_pages(args.saved) if args.saved else synthetic_page
+    game_ids = range(1, args.pages + 1)
+    with ArchiveServer(pages, args.latency) as server:
+        start = time.perf_counter()
+        legacy_fetch(server.url, game_ids)
+        legacy = time.perf_counter() - start
+        print(f"legacy sequential, 2 GETs per page: {args.pages / legacy:7.1f} pages/s  "
+              f"({sum(server.requests.values())} requests)")
+
+        for concurrency in args.concurrency:
+            server.requests.clear()
+            fetcher = PageFetcher(concurrency, rate=None)
+            # bodies are kept and parsed after timing so only fetching is measured
+            bodies = dict(fetcher.fetch_many((server.url.format(i), server.url.format(i)) for i in game_ids))
+            fetcher.close()
+            parsed = sum(len(search_page(url, html)) == 61 for url, html in bodies.items() if html)
+
+            once = all(server.requests.get(i) == 1 for i in game_ids)
+            print(f"PageFetcher concurrency {concurrency:3}:       {fetcher.pages / fetcher.seconds:7.1f} pages/s  "
+                  f"({sum(server.requests.values())} requests, each page once: {'yes' if once else 'NO'}, "
+                  f"{parsed} complete games)")
+
+if __name__ == "__main__":
+    main()
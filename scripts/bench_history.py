@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src.db import questions_db
+from src.game_utils import load_board
+from src.history import PlayHistory
+from bench_board_loader import build_db
+
+def board_ids(rounds, final_q) -> tuple[list[int], list[str]]:
+    ids = [q.id for round in rounds for cat in round.categories for q in cat.questions]
+    if final_q is not None:
+        ids.append(final_q.id)
+    return ids, [cat.title for round in rounds for cat in round.categories]
+
+def fill_history(history: PlayHistory, played: int, max_id: int, rng: random.Random):
+    """Records synthetic 61-clue games until the window holds about `played` clues."""
+    for _ in range(played // 61):
+        history.record_game(rng.sample(range(1, max_id + 1), 61), [f"CATEGORY {rng.randrange(max_id // 25)}"])
+
+def time_boards(history: PlayHistory | None, rounds: int, boards: int) -> float:
+    start = time.perf_counter()
+    for _ in range(boards):
+        load_board(rounds, history=history)
+    return (time.perf_counter() - start) / boards
+
+def check_no_repeats(path: str, rounds: int, games: int, window: int) -> bool:
+    """Plays games back to back and checks no clue or category repeats within the window."""
+    history = PlayHistory(path, window)
+    recent: list[tuple[set[int], set[str]]] = []
+    repeats = 0
+    for _ in range(games):
+        ids, titles = board_ids(*load_board(rounds, history=history))
+        for old_ids, old_titles in recent[-window:]:
+            repeats += len(old_ids & set(ids)) + len(old_titles & set(titles))
+        history.record_game(ids, titles)
+        recent.append((set(ids), set(titles)))
+    print(f"no-repeat check: {games} games, window {window}, {repeats} repeats  {'ok' if repeats == 0 else 'FAIL'}")
+    return repeats == 0
+
+def check_overlap(path: str, window: int) -> bool:
+    """A clue served by two games in the window stays played until the newer game leaves it."""
+    history = PlayHistory(path, window)
+    history.record_game([42], ["REPEATED"])
+    history.record_game([42], ["REPEATED"])
+    for i in range(window - 1):
+        history.record_game([1000 + i], [f"FILLER {i}"])
+    # the first game has left the window, the second hasn't
+    kept = history.played(42) and history.category_played("REPEATED")
+    history.record_game([2000], ["LAST"])
+    released = not history.played(42) and not history.category_played("REPEATED")
+    ok = kept and released
+    print(f"overlap check: window {window}, kept while in window {'yes' if kept else 'no'}, "
+          f"released after {'yes' if released else 'no'}  {'ok' if ok else 'FAIL'}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Time board loading against play histories of growing size.")
+    parser.add_argument("--rows", type=int, default=500_000, help="rows in the synthetic questions table")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--boards", type=int, default=20, help="boards timed per history size")
+    parser.add_argument("--played", type=int, nargs="+", default=[0, 10_000, 100_000, 300_000],
+                        help="clues in the no-repeat window for each timing run")
+    parser.add_argument("--check-games", type=int, default=100, help="games played for the no-repeat check")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp_dir.name, "questions.db")
+    start = time.perf_counter()
+    build_db(path, args.rows)
+    print(f"built {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+    questions_db.open(path)
+
+    rng = random.Random(0)
+    random.seed(0)
+    for played in args.played:
+        # a window large enough to keep every synthetic game
+        history = PlayHistory(os.path.join(tmp_dir.name, f"history-{played}.db"), played // 61 + 1)
+        fill_history(history, played, args.rows, rng)
+        per_board = time_boards(history if played else None, args.rounds, args.boards)
+        check = time.perf_counter()
+        for question_id in range(100_000):
+            history.played(question_id)
+        per_check = (time.perf_counter() - check) / 100_000
+        print(f"{played:9,} played clues: {per_board * 1000:7.2f} ms per board, {per_check * 1e9:6.0f} ns per played() check")
+
+    ok = check_no_repeats(os.path.join(tmp_dir.name, "history-check.db"), args.rounds, args.check_games, 20)
+    ok = check_overlap(os.path.join(tmp_dir.name, "history-overlap.db"), 2) and ok
+
+    questions_db.close()
+    tmp_dir.cleanup()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
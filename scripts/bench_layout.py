@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+import pygame
+from src.display import load_fonts, draw_board, BoardLayout, board_grid
+from src.game_utils import Player
+from bench_loop import sample_board
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hit-testing clicks on the board layout against scanning every cell rect, headless.")
+    parser.add_argument("--clicks", type=int, default=100000)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--step", type=int, default=3, help="pixel grid spacing of the agreement check")
+    args = parser.parse_args()
+
+    pygame.init()
+    size = (args.width, args.height)
+    screen = pygame.display.set_mode(size)
+    fonts = load_fonts(args.height)
+    categories = sample_board()
+    players = [Player(i + 1) for i in range(3)]
+    question_rects = draw_board(screen, categories, players, fonts)
+
+    start = time.perf_counter()
+    layout = BoardLayout(size, len(categories), len(players))
+    layout_ms = (time.perf_counter() - start) * 1000
+    grid = board_grid(categories)
+
+    def scan(pos):
+        """play_round before the layout: collidepoint over every cell."""
+        for q, rect in question_rects.items():
+            if rect.collidepoint(pos):
+                return q
+        return None
+
+    def hit(pos):
+        cell = layout.hit_test(pos)
+        return grid[cell[0]][cell[1]] if cell else None
+
+    # every pixel of a grid over the screen lands on the same question either way
+    mismatches = sum(scan((x, y)) is not hit((x, y))
+                     for x in range(0, args.width, args.step) for y in range(0, args.height, args.step))
+
+    rng = random.Random(0)
+    clicks = [(rng.randrange(args.width), rng.randrange(args.height)) for _ in range(args.clicks)]
+    print(f"{args.width}x{args.height}, {args.clicks:,} clicks, layout built in {layout_ms:.3f} ms")
+    for name, test in (("collidepoint scan", scan), ("layout hit_test", hit)):
+        start = time.perf_counter()
+        for pos in clicks:
+            test(pos)
+        us = (time.perf_counter() - start) / args.clicks * 1e6
+        print(f"{name:20} {us:6.2f} us per click")
+    print(f"hit_test agrees with collidepoint: {'yes' if not mismatches else f'no, {mismatches} pixels differ'}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import argparse
+import threading
+
+# no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+import pygame
+from src.display import load_fonts, draw_board
+from src.game_utils import Category, Question, Player
+from src.loop import FrameLoop
+
+def sample_board() -> list[Category]:
+    categories = []
+    for col in range(6):
+        title = f"SAMPLE CATEGORY NUMBER {col + 1}"
+        questions = [Question(f"clue {col} {row}", "answer", (row + 1) * 200, title, "bench") for row in range(5)]
+        categories.append(Category(title, questions))
+    return categories
+
+def post_input(stop: threading.Event, motion_hz: float, click_every: float):
+    """Mouse motion at motion_hz, plus a click every click_every seconds, like a host at the board."""
+    next_click = time.monotonic() + click_every
+    while not stop.wait(1 / motion_hz):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 10), rel=(1, 0), buttons=(0, 0, 0)))
+        if click_every and time.monotonic() >= next_click:
+            next_click += click_every
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(10, 10), button=1))
+
+def measure(run, seconds: float, motion_hz: float = 0, click_every: float = 0) -> tuple[float, int]:
+    """Runs a loop for `seconds`, returns (cpu % of one core, frames drawn)."""
+    pygame.event.clear()
+    stop = threading.Event()
+    poster = None
+    if motion_hz:
+        poster = threading.Thread(target=post_input, args=(stop, motion_hz, click_every), daemon=True)
+        poster.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    frames = run(seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    stop.set()
+    if poster:
+        poster.join()
+    return cpu / wall * 100, frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the cpu cost of the old busy loops against the frame loop, headless.")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of each run")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=int, help="frame cap, data/settings.py FPS by default")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    fonts = load_fonts(args.height)
+    categories = sample_board()
+    players = [Player(i + 1) for i in range(3)]
+
+    def legacy_board(seconds: float) -> int:
+        """play_round before the frame loop: draw_board and a full flip every pass."""
+        frames, end = 0, time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            draw_board(screen, categories, players, fonts)
+            frames += 1
+            for event in pygame.event.get():
+                pass
+        return frames
+
+    def legacy_wait(seconds: float) -> int:
+        """The old wait-for-space loops: draw once, then spin on pygame.event.get."""
+        draw_board(screen, categories, players, fonts)
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            for event in pygame.event.get():
+                pass
+        return 1
+
+    loop = FrameLoop(args.fps) if args.fps else FrameLoop()
+
+    def frame_loop(seconds: float) -> int:
+        frames = loop.frames
+
+        def handle(event: pygame.event.Event) -> bool:
+            # a click changes the board, motion doesn't
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                players[0].score += 200
+                loop.invalidate()
+            return False
+
+        loop.run(handle, lambda: draw_board(screen, categories, players, fonts), timeout_ms=int(seconds * 1000))
+        return loop.frames - frames
+
+    print(f"{args.width}x{args.height}, {args.seconds:.0f}s per run, frame cap {loop.fps} fps")
+    for name, run, motion_hz, click_every in (
+            ("legacy play_round loop, idle", legacy_board, 0, 0),
+            ("legacy wait loop, idle", legacy_wait, 0, 0),
+            ("frame loop, idle", frame_loop, 0, 0),
+            ("frame loop, 60 Hz mouse motion", frame_loop, 60, 0),
+            ("frame loop, motion + 1 click/s", frame_loop, 60, 1.0)):
+        cpu, frames = measure(run, args.seconds, motion_hz, click_every)
+        print(f"{name:32} {cpu:6.1f}% cpu  {frames / args.seconds:8.1f} frames/s")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
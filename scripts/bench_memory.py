@@ -0,0 +1,77 @@
+import os
+import sys
+import gc
+import time
+import random
+import tempfile
+import argparse
+import tracemalloc
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src.db import questions_db
+from src.game_utils import Question, load_board
+from src.board_pack import decode_board, encode_board
+from bench_board_loader import build_db
+
+class DictQuestion:
+    """Question as it was before __slots__ and interning, for comparison."""
+
+    def __init__(self, clue, answer, value, category, origin, id=None):
+        self.id = id
+        self.clue = clue
+        self.answer = answer
+        self.value = value
+        self.category = category
+        self.origin = origin
+        self.answered = False
+
+def traced(build) -> tuple[object, int]:
+    """Returns build()'s result and the bytes still allocated by it."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, size
+
+def question_rows(count: int) -> list[tuple]:
+    """Rows as separate string objects per question, like fresh db or pack reads."""
+    return [(f"clue {i}", f"answer {i}", (i % 5 + 1) * 100, f"CATEGORY {i // 5 % 2000}".upper().lower(),
+             "season 1 game 1".upper().lower(), i) for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory of boards and questions with tracemalloc.")
+    parser.add_argument("--rows", type=int, default=200_000, help="rows in the synthetic questions table")
+    parser.add_argument("--boards", type=int, default=100, help="boards kept alive for the per-board figure")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp_dir.name, "questions.db")
+    start = time.perf_counter()
+    build_db(path, args.rows)
+    print(f"built {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+    questions_db.open(path)
+    random.seed(0)
+
+    # encoded first so decoding (what the board pack does) is the only thing traced
+    encoded = [encode_board(*load_board(2)) for _ in range(args.boards)]
+    boards, size = traced(lambda: [decode_board(data) for data in encoded])
+    print(f"board (2 rounds + final, 61 questions): {size / len(boards) / 1024:8.1f} KiB")
+
+    for name, cls in (("dict Question", DictQuestion), ("slots Question", Question)):
+        # rows are dropped as they are built, so only strings the questions keep are counted
+        questions, size = traced(lambda: [cls(*row[:5], id=row[5]) for row in question_rows(10_000)])
+        print(f"10k x {name:15} {size / 1024:8.1f} KiB, {size / len(questions):6.1f} bytes per question")
+        del questions
+
+    questions_db.close()
+    tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import argparse
+from bs4 import BeautifulSoup, Tag
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from archive_server import synthetic_page
+from page_cache import PageCache
+from page_parser import parse_game
+from scraper import search_page
+
+def legacy_questions(html: str) -> list[tuple[str, str]]:
+    """search_page_for_questions before the single-pass parser: a full tree per call."""
+    soup = BeautifulSoup(html, "html.parser")
+    pairs = []
+    for ele in soup.find_all("td", class_="clue_text"):
+        if not isinstance(ele, Tag) or ele["id"].endswith("_r"):
+            continue
+        question = ele.get_text(strip=True)
+        answer_td = ele.find_next_sibling()
+        answer_em = answer_td.find("em", class_="correct_response") if isinstance(answer_td, Tag) else None
+        if answer_em and question:
+            pairs.append((question, answer_em.get_text(strip=True)))
+    return pairs
+
+def legacy_categories(html: str) -> list[str]:
+    """search_page_for_categories before the single-pass parser: a second full tree."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [ele.get_text(strip=True) for ele in soup.find_all("td", class_="category_name") if isinstance(ele, Tag)]
+
+def legacy_rows(html: str) -> set[tuple]:
+    """The old search_page mapping, as (clue, answer, value, category) rows."""
+    categories, content = legacy_categories(html), legacy_questions(html)
+    if len(categories) != 13 or len(content) != 61:
+        return set()
+    rows = set()
+    for i in range(12):
+        for j in range(5):
+            clue, answer = content[i + j * 6] if i < 6 else content[i + 24 + j * 6]
+            rows.add((clue, answer, j * 100 + 100, categories[i]))
+    rows.add((content[60][0], content[60][1], -1, categories[12]))
+    return rows
+
+def load_corpus(directory: str | None, cache: str | None, count: int) -> list[str]:
+    if cache:
+        pages = PageCache(cache)
+        return [pages.get(i) for i in pages.game_ids()[:count]]
+    if not directory:
+        return [synthetic_page(i) for i in range(1, count + 1)]
+    names = sorted(n for n in os.listdir(directory) if n.endswith(".html"))[:count]
+    pages = []
+    for name in names:
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+def per_page(fn, pages: list[str]) -> float:
+    start = time.perf_counter()
+    for html in pages:
+        fn(html)
+    return (time.perf_counter() - start) / len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the two-tree page parse against the single-pass parser.")
+    parser.add_argument("--corpus", help="directory of saved <game_id>.html pages, synthetic pages otherwise")
+    parser.add_argument("--cache", help="scraper page cache to use as the corpus (scraper.py --cache)")
+    parser.add_argument("--pages", type=int, default=200, help="pages parsed per method")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.cache, args.pages)
+    legacy = per_page(lambda html: (legacy_categories(html), legacy_questions(html)), pages)
+    single = per_page(parse_game, pages)
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB average")
+    print(f"legacy, two full trees:  {legacy * 1000:7.2f} ms/page")
+    print(f"parse_game, one pass:    {single * 1000:7.2f} ms/page  ({legacy / single:.1f}x)")
+
+    # the new parser must produce the same questions for every page the old one accepted
+    mismatches = 0
+    for html in pages:
+        old = legacy_rows(html)
+        new = {(q.clue, q.answer, q.value, q.category) for q in search_page("corpus", html)}
+        mismatches += bool(old) and old != new
+    print(f"pages with different questions: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
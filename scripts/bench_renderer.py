@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import argparse
+
+# no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+import pygame
+from src.board_renderer import BoardRenderer
+from src.display import load_fonts, draw_board
+from src.game_utils import Player
+from bench_loop import sample_board
+
+def play(render, categories, players, frames: int, change: str, on_cover=None) -> tuple[float, float]:
+    """Renders `frames` frames each after one change, returns (ms, pixels) per frame."""
+    questions = [q for category in categories for q in category.questions]
+    pixels = 0
+    start = time.perf_counter()
+    for i in range(frames):
+        if change in ("cell", "covered"):
+            questions[i % len(questions)].answered ^= True
+        if change in ("score", "covered"):
+            players[i % len(players)].score += 200
+        if change == "covered" and on_cover:
+            on_cover()
+        pixels += render()
+    return (time.perf_counter() - start) / frames * 1000, pixels / frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-frame board drawing against the dirty-rect renderer, headless.")
+    parser.add_argument("--frames", type=int, default=300, help="frames per scenario")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    fonts = load_fonts(args.height)
+    full_pixels = args.width * args.height
+
+    print(f"{args.width}x{args.height}, {args.frames} frames per scenario")
+    print(f"{'change per frame':28} {'full frame':>20} {'dirty rects':>24}")
+    for change, label in (("none", "nothing"), ("cell", "one cell"), ("score", "one score"),
+                          ("covered", "cell + score after overlay")):
+        categories, players = sample_board(), [Player(i + 1) for i in range(3)]
+        full_ms, _ = play(lambda: (draw_board(screen, categories, players, fonts), full_pixels)[1],
+                          categories, players, args.frames, change)
+
+        categories, players = sample_board(), [Player(i + 1) for i in range(3)]
+        renderer = BoardRenderer(screen, fonts, dirty_rects=True)
+        renderer.render(categories, players)
+
+        def render():
+            renderer.render(categories, players)
+            return renderer.pixels
+        dirty_ms, dirty_px = play(render, categories, players, args.frames, change, on_cover=renderer.invalidate)
+        print(f"{label:28} {full_ms:8.2f} ms {full_pixels:9,} px {dirty_ms:8.2f} ms {dirty_px:11,.0f} px")
+
+    # the retained board must look exactly like a full redraw of the same state
+    renderer.render(categories, players)
+    retained = screen.copy()
+    draw_board(screen, categories, players, fonts)
+    identical = pygame.image.tobytes(retained, "RGB") == pygame.image.tobytes(screen, "RGB")
+    print(f"dirty-rect board identical to a full redraw: {'yes' if identical else 'NO'}")
+    pygame.quit()
+    sys.exit(0 if identical else 1)
+
+if __name__ == "__main__":
+    main()
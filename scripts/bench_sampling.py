@@ -0,0 +1,113 @@
+import os
+import sys
+import math
+import time
+import random
+import sqlite3
+import tempfile
+import argparse
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from bench_board_loader import build_db
+
+def legacy_clue(conn, category: str, value: int):
+    return conn.execute(
+        """SELECT q.id FROM questions q JOIN categories c ON c.id = q.category_id
+        WHERE c.title = ? AND q.value = ? ORDER BY RANDOM() LIMIT 1""", (category, value)
+    ).fetchone()
+
+def legacy_final(conn):
+    return conn.execute("SELECT id FROM questions WHERE value = -1 ORDER BY RANDOM() LIMIT 1").fetchone()
+
+def time_per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+def chi_square_uniform(counts: list[int]) -> tuple[float, float]:
+    """Returns the chi-square statistic of counts against a uniform distribution and its
+    critical value at p = 0.001 (Wilson-Hilferty approximation)."""
+    k = len(counts) - 1
+    expected = sum(counts) / len(counts)
+    statistic = sum((c - expected) ** 2 / expected for c in counts)
+    z = 3.09
+    critical = k * (1 - 2 / (9 * k) + z * math.sqrt(2 / (9 * k))) ** 3
+    return statistic, critical
+
+def check_uniformity(draws_per_clue: int) -> bool:
+    """Samples a bucket and the finals of a small db many times, after deleting rows so the
+    swap-with-last compaction has run, and checks each draw count is uniform."""
+    rng = random.Random(0)
+    conn = sqlite3.connect(":memory:")
+    schema.create_table(conn)
+    with conn:
+        rows = [(f"clue {i}", "answer", (i % 5 + 1) * 100, "UNIFORM", "check") for i in range(400)]
+        rows += [(f"final {i}", "answer", -1, f"FINAL {i}", "check") for i in range(150)]
+        schema.insert_questions(conn, rows)
+        ids = [row[0] for row in conn.execute("SELECT id FROM questions")]
+        for question_id in rng.sample(ids, 100):
+            conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+
+    passed = True
+    bucket = [row[0] for row in conn.execute(
+        "SELECT q.id FROM questions q JOIN categories c ON c.id = q.category_id WHERE c.title = 'UNIFORM' AND q.value = 300")]
+    finals = [row[0] for row in conn.execute("SELECT id FROM questions WHERE value = -1")]
+    for name, population, draw in (
+        ("UNIFORM $300", bucket, lambda: schema.random_clue_ids(conn, [("UNIFORM", 300)], rng)[("UNIFORM", 300)]),
+        ("finals", finals, lambda: schema.random_final_id(conn, rng)),
+    ):
+        counts = dict.fromkeys(population, 0)
+        for _ in range(draws_per_clue * len(population)):
+            counts[draw()] += 1
+        statistic, critical = chi_square_uniform(list(counts.values()))
+        ok = statistic < critical
+        passed = passed and ok
+        print(f"uniformity {name:13} {len(population):4} clues  chi2 = {statistic:8.1f}  critical = {critical:8.1f}  {'ok' if ok else 'FAIL'}")
+    conn.close()
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ORDER BY RANDOM() picks against the sampling index.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="rows in the synthetic questions table")
+    parser.add_argument("--calls", type=int, default=20, help="picks timed per method")
+    parser.add_argument("--draws", type=int, default=200, help="draws per clue for the uniformity check")
+    parser.add_argument("--db", help="benchmark an existing questions.db instead of a synthetic one")
+    args = parser.parse_args()
+
+    if not check_uniformity(args.draws):
+        sys.exit(1)
+
+    tmp_dir = None
+    path = args.db
+    if not path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "questions.db")
+        build_db(path, args.rows)
+
+    conn = sqlite3.connect(path)
+    schema.migrate(conn)
+    titles = [row[0] for row in conn.execute(
+        "SELECT c.title FROM eligible_categories e JOIN categories c ON c.id = e.category_id LIMIT 50")]
+    pick = lambda: (random.choice(titles), random.choice(schema.BOARD_VALUES))
+
+    results = [
+        ("clue   ORDER BY RANDOM()", time_per_call(lambda: legacy_clue(conn, *pick()), args.calls)),
+        ("clue   sampling index", time_per_call(lambda: schema.random_clue_ids(conn, [pick()]), args.calls * 50)),
+        ("final  ORDER BY RANDOM()", time_per_call(lambda: legacy_final(conn), args.calls)),
+        ("final  sampling index", time_per_call(lambda: schema.random_final_id(conn), args.calls * 50)),
+    ]
+    for name, seconds in results:
+        print(f"{name:26} {seconds * 1000:9.3f} ms/pick")
+
+    conn.close()
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from src.db import questions_db
+from src.game import GameBoard
+from src.game_utils import Round, Category
+from generate_db import generate_db
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+def time_calls(fn, repeat: int) -> tuple[float, float, float]:
+    """Median and max milliseconds of repeat calls, plus queries per call."""
+    times = []
+    queries = questions_db.queries
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times), (questions_db.queries - queries) / repeat
+
+def bench_size(path: str, repeat: int, rng: random.Random) -> dict[str, tuple[float, float, float]]:
+    conn = sqlite3.connect(path)
+    titles = schema.pick_eligible_categories(conn, repeat, rng)
+    conn.close()
+    questions_db.open(path)
+    # open the shared connection and warm the page cache outside the timed runs
+    GameBoard(2)
+
+    titles = iter(titles * 2)
+    return {
+        "Round()": time_calls(Round, repeat),
+        "Category(title)": time_calls(lambda: Category(next(titles)), repeat),
+        "GameBoard(2)": time_calls(lambda: GameBoard(2), repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time board generation against synthetic question dbs of growing size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="rows per db, e.g. 10000 100000 1000000 10000000")
+    parser.add_argument("--repeat", type=int, default=50, help="calls timed per operation and size")
+    parser.add_argument("--dir", help="keep the generated dbs here and reuse them on later runs, a temp dir otherwise")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # board loads log at INFO, only the table is of interest
+    logging.basicConfig(level=logging.WARNING)
+
+    tmp_dir = None
+    directory = args.dir
+    if not directory:
+        tmp_dir = tempfile.TemporaryDirectory()
+        directory = tmp_dir.name
+    os.makedirs(directory, exist_ok=True)
+
+    print(f"{'rows':>11} {'operation':16} {'median ms':>10} {'max ms':>9} {'queries':>8}")
+    for size in args.sizes:
+        path = os.path.join(directory, f"questions_{size}.db")
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            generate_db(path, size, args.seed)
+            print(f"{size:11,} generated in {time.perf_counter() - start:.1f}s, {os.path.getsize(path) / 2**20:.0f} MiB")
+
+        results = bench_size(path, args.repeat, random.Random(args.seed))
+        for operation, (median, worst, queries) in results.items():
+            print(f"{size:11,} {operation:16} {median:10.2f} {worst:9.2f} {queries:8.1f}")
+        questions_db.close()
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import multiprocessing
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from archive_server import ArchiveServer, synthetic_page
+from db_writer import QuestionWriter, DEFAULT_BATCH_ROWS, peak_rss_mib, format_rss
+from fetcher import PageFetcher, DEFAULT_CONCURRENCY
+from page_cache import PageCache
+from scraper import ScrapeStats, scrape
+
+def load_corpus(directory: str | None, cache: str | None, count: int) -> dict[int, str]:
+    """The fixed pages served by the stand-in server, by game id: saved <game_id>.html files,
+    a scraper page cache, or synthetic pages."""
+    if cache:
+        pages = PageCache(cache)
+        return {i: pages.get(i) for i in pages.game_ids()[:count]}
+    if not directory:
+        return {i: synthetic_page(i) for i in range(1, count + 1)}
+    names = sorted((n for n in os.listdir(directory) if n.removesuffix(".html").isdigit()),
+                   key=lambda n: int(n.removesuffix(".html")))[:count]
+    corpus = {}
+    for name in names:
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+            corpus[int(name.removesuffix(".html"))] = f.read()
+    return corpus
+
+def run_pipeline(job: tuple[str, list[int], int, int]) -> dict:
+    """One full scraper run into a fresh db, in its own process so peak RSS is per run."""
+    url, game_ids, concurrency, batch_rows = job
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        writer = QuestionWriter(os.path.join(tmp, "questions.db"), batch_rows)
+        writer.start()
+        fetcher = PageFetcher(concurrency, rate=None)
+        stats = ScrapeStats()
+        scrape(fetcher, writer, url, game_ids, stats)
+        fetcher.close()
+        writer.close()
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "pages": fetcher.pages, "fetch_errors": fetcher.errors, "parsed": stats.parsed,
+            "parse_seconds": stats.parse_seconds, "rows": writer.rows, "write_seconds": writer.write_seconds,
+            "peak_rss": peak_rss_mib()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the full scraper pipeline against a local stand-in archive server.")
+    parser.add_argument("--pages", type=int, default=300, help="game pages in the corpus")
+    parser.add_argument("--corpus", help="directory of saved <game_id>.html pages, synthetic pages otherwise")
+    parser.add_argument("--cache", help="scraper page cache to use as the corpus (scraper.py --cache)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds the server delays each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[DEFAULT_CONCURRENCY])
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_ROWS, help="rows written per transaction")
+    parser.add_argument("--min-pages-per-sec", type=float, help="exit non-zero if any run is slower than this")
+    args = parser.parse_args()
+
+    # retried 503s are expected here, only the summary lines are of interest
+    logging.basicConfig(level=logging.CRITICAL)
+
+    corpus = load_corpus(args.corpus, args.cache, args.pages)
+    if not corpus:
+        print("empty corpus")
+        sys.exit(1)
+    game_ids = sorted(corpus)
+    print(f"{len(corpus)} pages, {sum(map(len, corpus.values())) / len(corpus) / 1024:.0f} KiB average, "
+          f"{args.latency * 1000:.0f} ms latency, {args.error_rate:.0%} errors")
+
+    slow = False
+    # spawn, a fresh interpreter per run so peak RSS isn't inherited from earlier runs or the corpus
+    context = multiprocessing.get_context("spawn")
+    with ArchiveServer(corpus.get, args.latency, args.error_rate) as server:
+        for concurrency in args.concurrency:
+            server.requests.clear()
+            server.errors = 0
+            with context.Pool(1) as pool:
+                result = pool.apply(run_pipeline, ((server.url, game_ids, concurrency, args.batch),))
+
+            pages_per_sec = result["parsed"] / result["seconds"]
+            slow |= args.min_pages_per_sec is not None and pages_per_sec < args.min_pages_per_sec
+            print(f"concurrency {concurrency:3}: {pages_per_sec:7.1f} pages/s  {result['rows'] / result['seconds']:9,.0f} clues/s  "
+                  f"parse {result['parse_seconds'] / max(result['parsed'], 1) * 1000:5.2f} ms/page  "
+                  f"db write {result['write_seconds']:5.2f}s of {result['seconds']:.2f}s  "
+                  f"peak RSS {format_rss(result['peak_rss'])}")
+            print(f"                 {sum(server.requests.values())} requests, {server.errors} 503s served, "
+                  f"{result['fetch_errors']} pages lost after retries, {result['rows']} clues written")
+
+    if slow:
+        print(f"slower than {args.min_pages_per_sec} pages/s")
+    sys.exit(1 if slow else 0)
+
+if __name__ == "__main__":
+    main()
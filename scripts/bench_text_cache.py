@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import argparse
+
+# no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+import pygame
+from src.display import load_fonts, draw_board
+from src.game_utils import Player
+from src.text_cache import text_cache, TEXT_CACHE_ENTRIES
+from bench_loop import sample_board
+
+RESOLUTIONS = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+
+def frame_ms(screen, categories, players, fonts, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw_board(screen, categories, players, fonts)
+    return (time.perf_counter() - start) / frames * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Time full board frames with and without the text surface cache, headless.")
+    parser.add_argument("--frames", type=int, default=100, help="board frames per run")
+    args = parser.parse_args()
+
+    pygame.init()
+    categories, players = sample_board(), [Player(i + 1) for i in range(3)]
+    for name, size in RESOLUTIONS.items():
+        screen = pygame.display.set_mode(size)
+        fonts = load_fonts(size[1])
+
+        text_cache.max_entries = 0
+        text_cache.clear()
+        uncached = frame_ms(screen, categories, players, fonts, args.frames)
+
+        text_cache.max_entries = TEXT_CACHE_ENTRIES
+        text_cache.hits = text_cache.misses = 0
+        cached = frame_ms(screen, categories, players, fonts, args.frames)
+        print(f"{name:6} board frame: {uncached:7.2f} ms uncached, {cached:7.2f} ms cached "
+              f"({uncached / cached:.1f}x), {text_cache.describe()}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
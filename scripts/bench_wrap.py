@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+
+# no window or sound device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+import pygame
+from src.db import db_path
+from src.display import load_fonts
+from src.text_wrap import TextWrapper
+
+def legacy_wrap_text(text: str, font: pygame.font.Font, max_width: int) -> list[str]:
+    """wrap_text before the wrapping engine: the joined line is re-measured for every word,
+    long words one character at a time."""
+    lines = []
+    current_line_words = []
+
+    def _split_long_word(long_word: str) -> list[str]:
+        sub_lines = []
+        current_segment = ""
+        for char in long_word:
+            if font.size(current_segment + char)[0] <= max_width:
+                current_segment += char
+            else:
+                sub_lines.append(current_segment)
+                current_segment = char
+        if current_segment:
+            sub_lines.append(current_segment)
+        return sub_lines
+
+    for word in text.split(' '):
+        if font.size(word)[0] > max_width:
+            if current_line_words:
+                lines.append(' '.join(current_line_words))
+                current_line_words = []
+            lines.extend(_split_long_word(word))
+            continue
+        if font.size(' '.join(current_line_words + [word]))[0] <= max_width:
+            current_line_words.append(word)
+        else:
+            if current_line_words:
+                lines.append(' '.join(current_line_words))
+            current_line_words = [word]
+    if current_line_words:
+        lines.append(' '.join(current_line_words))
+    return lines
+
+def load_corpus(path: str, count: int) -> tuple[list[str], str]:
+    """The longest clues in questions.db, or synthetic long clues with a few unbreakable words if there is no db."""
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        clues = [row[0] for row in conn.execute("SELECT clue FROM questions ORDER BY length(clue) DESC LIMIT ?", (count,))]
+        conn.close()
+        if clues:
+            return clues, f"{len(clues)} longest clues of {path}"
+
+    rng = random.Random(0)
+    words = ["the", "capital", "of", "this", "country", "was", "renamed", "in", "1991", "after", "independence",
+             "Kyrgyzstan's", "parliament", "voted", "(Sarah", "reports", "from", "Bishkek.)"]
+    clues = []
+    for i in range(count):
+        clue = [rng.choice(words) for _ in range(rng.randint(40, 80))]
+        if i % 10 == 0:
+            # urls and run-together words are what the long word splitting is for
+            clue.insert(rng.randrange(len(clue)), "www." + "".join(rng.choice(words) for _ in range(12)) + ".com")
+        clues.append(" ".join(clue))
+    return clues, f"{count} synthetic long clues (no db at {path})"
+
+def per_clue_us(wrap, clues: list[str], font, width: int) -> float:
+    start = time.perf_counter()
+    for clue in clues:
+        wrap(clue, font, width)
+    return (time.perf_counter() - start) / len(clues) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark clue wrapping against the old wrap_text.")
+    parser.add_argument("--db", default=db_path, help="questions.db to take the longest clues from")
+    parser.add_argument("--clues", type=int, default=500, help="clues in the corpus")
+    parser.add_argument("--height", type=int, default=1080, help="screen height the fonts are sized for")
+    args = parser.parse_args()
+
+    pygame.init()
+    font = load_fonts(args.height)["question"]
+    width = args.height * 16 // 9 - 200  # draw_question_screen's wrap width
+    clues, source = load_corpus(args.db, args.clues)
+    print(f"{source}, {sum(map(len, clues)) / len(clues):.0f} chars average, wrapped to {width}px")
+
+    legacy = per_clue_us(legacy_wrap_text, clues, font, width)
+    wrapper = TextWrapper()
+    cold = per_clue_us(wrapper.wrap, clues, font, width)
+    warm = per_clue_us(wrapper.wrap, clues, font, width)
+    print(f"legacy wrap_text:          {legacy:9.1f} us/clue")
+    print(f"TextWrapper, first wrap:   {cold:9.1f} us/clue  ({legacy / cold:.1f}x)")
+    print(f"TextWrapper, memoized:     {warm:9.1f} us/clue  ({legacy / warm:.0f}x)")
+
+    # summed widths can differ from measuring the joined line by kerning, count where lines differ
+    different = sum(list(wrapper.wrap(clue, font, width)) != legacy_wrap_text(clue, font, width) for clue in clues)
+    too_wide = sum(font.size(line)[0] > width for clue in clues for line in wrapper.wrap(clue, font, width))
+    print(f"clues wrapped differently: {different}, lines wider than {width}px: {too_wide}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
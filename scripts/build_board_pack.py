@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src.db import questions_db, db_path
+from src.board_pack import BoardPack, pack_path
+from src.game_utils import load_board
+from src.history import PlayHistory, history_path
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+def report_startup(pack: BoardPack, round_num: int):
+    """Times a cold board build from the db against taking one board from the pack.
+
+    The board taken for the report is consumed like any other.
+    """
+    questions_db.close()
+    start = time.perf_counter()
+    load_board(round_num)
+    without_pack = time.perf_counter() - start
+
+    start = time.perf_counter()
+    board = pack.take()
+    with_pack = time.perf_counter() - start
+
+    if board is None:
+        print("pack is empty, nothing to compare")
+        return
+    print(f"startup board without pack: {without_pack * 1000:8.2f} ms (cold connection + queries)")
+    print(f"startup board with pack:    {with_pack * 1000:8.2f} ms (one read, no sql)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate complete boards into a board pack.")
+    parser.add_argument("count", type=int, help="number of boards to add")
+    parser.add_argument("--rounds", type=int, default=2, help="rounds per board")
+    parser.add_argument("--db", default=db_path, help="path to questions.db")
+    parser.add_argument("--pack", default=pack_path, help="path to the board pack")
+    parser.add_argument("--history", default=history_path, help="play history the boards avoid")
+    parser.add_argument("--no-history", action="store_true", help="ignore the play history")
+    parser.add_argument("--report", action="store_true", help="report startup time with and without the pack")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    questions_db.open(args.db)
+    pack = BoardPack(args.pack)
+    history = None if args.no_history else PlayHistory(args.history)
+
+    start = time.perf_counter()
+    added = pack.generate(args.count, args.rounds, history)
+    elapsed = time.perf_counter() - start
+    print(f"added {added} boards in {elapsed:.2f}s, {len(pack)} in pack ({os.path.getsize(args.pack) / 1024:.0f} KiB)")
+
+    if args.report:
+        report_startup(pack, args.rounds)
+    questions_db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import logging
+import sqlite3
+import argparse
+import multiprocessing
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from src.db import questions_db, db_path
+from src.question_pack import QuestionPack, write_question_pack, question_pack_path
+from src.game_utils import load_board
+from db_writer import peak_rss_mib, format_rss
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+def measure(source: str, db: str, pack_file: str, rounds: int, boards: int, results):
+    """Runs in a fresh process so RSS only reflects one source."""
+    start = time.perf_counter()
+    if source == "db":
+        questions_db.open(db)
+        for _ in range(boards):
+            load_board(rounds)
+    else:
+        pack = QuestionPack(pack_file)
+        for _ in range(boards):
+            load_board(rounds, questions=pack)
+    elapsed = time.perf_counter() - start
+    results.put((source, elapsed / boards, peak_rss_mib()))
+
+def report(db: str, pack_file: str, rounds: int, boards: int):
+    """Compares per-board time and peak RSS of building boards from the db and from the pack."""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    for source in ("db", "pack"):
+        process = ctx.Process(target=measure, args=(source, db, pack_file, rounds, boards, results))
+        process.start()
+        source, per_board, peak_rss = results.get()
+        process.join()
+        print(f"{source:5} {per_board * 1000:8.2f} ms per board (first includes open), peak RSS {format_rss(peak_rss)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert questions.db into a memory-mapped question pack.")
+    parser.add_argument("--db", default=db_path, help="path to questions.db")
+    parser.add_argument("--pack", default=question_pack_path, help="path to the question pack")
+    parser.add_argument("--report", action="store_true", help="compare board building from the db and the pack")
+    parser.add_argument("--rounds", type=int, default=2, help="rounds per board for the report")
+    parser.add_argument("--boards", type=int, default=50, help="boards built per source for the report")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not os.path.exists(args.db):
+        logger.error(f"No database at {args.db}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(args.db)
+    if schema.schema_version(conn) < schema.SCHEMA_VERSION:
+        schema.migrate(conn)
+    start = time.perf_counter()
+    counts = write_question_pack(conn, args.pack)
+    conn.close()
+    print(f"wrote {counts['questions']:,} questions and {counts['finals']:,} finals in {time.perf_counter() - start:.1f}s, "
+          f"{os.path.getsize(args.pack) / 2**20:.1f} MiB (db is {os.path.getsize(args.db) / 2**20:.1f} MiB)")
+
+    if args.report:
+        report(args.db, args.pack, args.rounds, args.boards)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import time
+import queue
+import sys
+import logging
+import sqlite3
+import threading
+try:
+    import resource
+except ImportError:
+    # posix only, peak RSS isn't reported on windows
+    resource = None
+
+from src.game_utils import Question
+from src import schema
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+# rows per executemany batch and transaction
+DEFAULT_BATCH_ROWS = 5000
+# parsed games waiting for the writer, bounds memory when the db falls behind
+DEFAULT_QUEUE_GAMES = 256
+
+def peak_rss_mib() -> float | None:
+    """Peak resident set size of this process so far, None where the resource module is missing."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on linux and the BSDs
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 1024
+
+def format_rss(mib: float | None) -> str:
+    return "n/a" if mib is None else f"{mib:.1f} MiB"
+
+class QuestionWriter:
+    """
+    Streaming writer stage: parsed games go in through put(), batched rows go out to the db.
+
+    A dedicated thread owns the connection, drains the queue and writes a batch with
+    executemany in one explicit transaction whenever `batch_rows` rows are waiting, so no
+    more than a batch plus the queue is ever held in memory. Every game is checkpointed in
+    scraped_games within the same transaction as its rows, and games that already have a
+    checkpoint are skipped, so re-runs never duplicate questions. The db runs in WAL mode while
+    writing and is switched back to a rollback journal on close(), which the game's
+    read-only connection needs.
+
+    Attributes:
+        path: path to questions.db
+        games: games written
+        skipped: games skipped because they were already checkpointed
+        rows: questions written
+        duplicates: questions ignored because their content hash was already stored
+        batches: transactions committed
+        write_seconds: time spent inside write transactions
+    """
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS, queue_games: int = DEFAULT_QUEUE_GAMES):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.games = 0
+        self.skipped = 0
+        self.rows = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+        self.error: Exception | None = None
+        self._queue: queue.Queue[tuple[int, list[Question]] | None] = queue.Queue(queue_games)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._started = time.perf_counter()
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def put(self, game_id: int, questions: list[Question]):
+        """Queues a parsed game, blocks while the queue is full."""
+        if self.error:
+            raise self.error
+        self._queue.put((game_id, questions))
+
+    def close(self):
+        """Writes whatever is left, waits for the writer and re-raises its error, if any."""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error:
+            raise self.error
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        schema.create_table(conn)
+        logger.info("Table 'questions' checked/created.")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WAL makes NORMAL durable across application crashes, only power loss can drop a batch
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Couldn't connect to or operate on database at '{self.path}': {e}")
+            self.error = e
+            # keep draining so producers never block on a dead writer
+            while self._queue.get() is not None:
+                pass
+            return
+
+        games: list[tuple[int, list[tuple]]] = []
+        pending_rows = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                game_id, questions = item
+                games.append((game_id, [(q.clue, q.answer, q.value, q.category, q.origin) for q in questions]))
+                pending_rows += len(questions)
+                if pending_rows >= self.batch_rows:
+                    self._write(conn, games)
+                    games, pending_rows = [], 0
+            if games:
+                self._write(conn, games)
+            conn.execute("PRAGMA journal_mode = DELETE")
+        except sqlite3.Error as e:
+            logger.error(f"Couldn't write questions: {e}")
+            self.error = e
+            while self._queue.get() is not None:
+                pass
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, games: list[tuple[int, list[tuple]]]):
+        start = time.perf_counter()
+        with conn:
+            conn.execute("BEGIN")
+            new = schema.checkpoint_games(conn, [(game_id, len(rows)) for game_id, rows in games])
+            rows = [row for game_id, game_rows in games if game_id in new for row in game_rows]
+            inserted = schema.insert_questions(conn, rows)
+        self.write_seconds += time.perf_counter() - start
+        self.games += len(new)
+        self.skipped += len(games) - len(new)
+        self.rows += inserted
+        self.duplicates += len(rows) - inserted
+        self.batches += 1
+
+    def describe(self) -> str:
+        elapsed = time.perf_counter() - self._started
+        throughput = self.rows / self.write_seconds if self.write_seconds else 0.0
+        return (f"{self.rows} rows ({self.duplicates} duplicates ignored) from {self.games} games "
+                f"({self.skipped} already scraped) in {self.batches} batches, "
+                f"{throughput:,.0f} rows/s while writing, {self.write_seconds:.1f}s of {elapsed:.1f}s, "
+                f"peak RSS {format_rss(peak_rss_mib())}")
@@ -0,0 +1,142 @@
+import time
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from page_cache import PageCache
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+# defaults kept polite towards j-archive.com
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10.0     # requests per second across all workers, None for unlimited
+DEFAULT_TIMEOUT = 30    # seconds per request
+DEFAULT_RETRIES = 3     # retries on connection errors and 429/5xx, with backoff
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate: float | None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class PageFetcher:
+    """
+    Fetches pages concurrently over one pooled keep-alive session.
+
+    A thread pool of `concurrency` workers shares a single requests.Session whose connection
+    pool holds one connection per worker, so every request after the first reuses an open
+    connection. Request starts are rate limited across all workers. With a cache, fetch_many
+    keys are game ids and cached pages are read from disk instead of the network. Fetched
+    pages are not added to it here, the caller caches a page once it has checked it is
+    worth keeping (scraper.scrape keeps complete games only).
+
+    Attributes:
+        concurrency: worker threads and pooled connections
+        cache: page cache, optional
+        pages: pages fetched successfully
+        cache_hits: pages read from the cache
+        errors: pages that failed after retries
+        bytes: response bytes received
+        seconds: wall time spent in fetch_many
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rate: float | None = DEFAULT_RATE,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, cache: PageCache | None = None):
+        self.concurrency = concurrency
+        self.cache = cache
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate)
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pages = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def fetch(self, url: str) -> str | None:
+        """GETs url once (plus transport retries), returns the body or None on error."""
+        self.limiter.wait()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching URL: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            return None
+
+        with self._stats_lock:
+            self.pages += 1
+            self.bytes += len(response.content)
+        return response.text
+
+    def _fetch_cached(self, game_id: int, url: str) -> str | None:
+        html = self.cache.get(game_id)
+        if html is not None:
+            with self._stats_lock:
+                self.cache_hits += 1
+            return html
+        return self.fetch(url)
+
+    def fetch_many(self, urls: Iterable[tuple[object, str]]) -> Iterator[tuple[object, str | None]]:
+        """Fetches (key, url) pairs concurrently, yielding (key, body) in completion order.
+
+        At most twice `concurrency` requests are queued at once, so urls can be a lazy
+        iterable of any length.
+        """
+        start = time.perf_counter()
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fetch") as executor:
+            pending = {}
+
+            def submit() -> bool:
+                try:
+                    key, url = next(urls)
+                except StopIteration:
+                    return False
+                if self.cache is not None:
+                    pending[executor.submit(self._fetch_cached, key, url)] = key
+                else:
+                    pending[executor.submit(self.fetch, url)] = key
+                return True
+
+            while len(pending) < self.concurrency * 2 and submit():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    submit()
+                    yield key, future.result()
+        self.seconds += time.perf_counter() - start
+
+    def describe(self) -> str:
+        rate = self.pages / self.seconds if self.seconds else 0.0
+        return (f"{self.pages} pages, {self.cache_hits} from cache, {self.errors} errors, {self.bytes / 2**20:.1f} MiB "
+                f"in {self.seconds:.1f}s ({rate:.1f} pages/s)")
+
+    def close(self):
+        self.session.close()
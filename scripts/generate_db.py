@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import itertools
+from collections.abc import Iterator
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+# shape of the J! Archive data the scraper produces
+CATEGORIES_PER_GAME = 12        # two rounds of 6, each category holds one clue per board value
+RECURRING_SHARE = 0.3           # category slots that reuse a recurring title such as POTPOURRI
+RECURRING_EVERY = 100           # one recurring title per this many rows
+ZIPF_EXPONENT = 0.9             # popularity of recurring titles falls off like 1/rank^s
+MISSING_CLUES = 0.03            # clues never revealed on the show, leaving incomplete categories
+ORIGIN = "synthetic"
+DEFAULT_BATCH_ROWS = 50_000
+
+_WORDS = ("river", "capital", "novel", "opera", "planet", "element", "king", "poet", "island", "treaty",
+          "science", "history", "word", "potpourri", "movie", "sport", "food", "music", "art", "state")
+
+def synthetic_rows(rows: int, seed: int = 0) -> Iterator[tuple]:
+    """Yields exactly `rows` (clue, answer, value, category, origin) rows game by game.
+
+    Each game has 12 categories of 5 clues at 100-500 followed by a final at -1 in its own
+    category. Most titles are used once, the rest are drawn from a pool of recurring titles
+    with a zipf-like skew, so a few categories collect hundreds of clues per value like the
+    real archive's. A few clues are left out, some one-off categories end up incomplete.
+    """
+    rng = random.Random(seed)
+
+    def words(n: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+    recurring = [f"{words(2).upper()} {i}" for i in range(max(50, rows // RECURRING_EVERY))]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(recurring))))
+
+    emitted = 0
+    for game in itertools.count(1):
+        for c in range(CATEGORIES_PER_GAME):
+            if rng.random() < RECURRING_SHARE:
+                title = rng.choices(recurring, cum_weights=cum_weights)[0]
+            else:
+                title = f"{words(2).upper()} G{game}C{c}"
+            for row in range(1, len(schema.BOARD_VALUES) + 1):
+                if rng.random() < MISSING_CLUES:
+                    continue
+                yield (f"{words(9)} ({game}/{c}/{row})", words(2), schema.BOARD_VALUES[row - 1], title, ORIGIN)
+                emitted += 1
+                if emitted == rows:
+                    return
+        yield (f"{words(14)} ({game}/final)", words(2), schema.FINAL_VALUE, f"{words(2).upper()} G{game}F", ORIGIN)
+        emitted += 1
+        if emitted == rows:
+            return
+
+def generate_db(path: str, rows: int, seed: int = 0, batch_rows: int = DEFAULT_BATCH_ROWS) -> int:
+    """Builds a fresh questions.db at path holding `rows` synthetic questions, returns the rows inserted.
+
+    Rows go in through insert_questions in one transaction with the derived indexes rebuilt
+    once at the end, the same path the importer takes.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    # a generated db is rebuilt rather than recovered
+    conn.execute("PRAGMA synchronous = OFF")
+    try:
+        schema.create_table(conn)
+        inserted = 0
+        with conn:
+            conn.execute("BEGIN")
+            with schema.bulk_load(conn):
+                for batch in itertools.batched(synthetic_rows(rows, seed), batch_rows):
+                    inserted += schema.insert_questions(conn, batch)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return inserted
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic questions.db shaped like the scraper's output.")
+    parser.add_argument("path", help="db to create, replaced if it exists")
+    parser.add_argument("--rows", type=int, default=100_000, help="questions to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed, the same seed gives the same db")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_ROWS, help="rows per executemany batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    start = time.perf_counter()
+    try:
+        inserted = generate_db(args.path, args.rows, args.seed, args.batch)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Couldn't generate '{args.path}': {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    conn = sqlite3.connect(args.path)
+    categories = conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
+    eligible = conn.execute("SELECT COUNT(*) FROM eligible_categories").fetchone()[0]
+    finals = conn.execute("SELECT COUNT(*) FROM final_ranks").fetchone()[0]
+    conn.close()
+    print(f"{inserted:,} questions in {elapsed:.1f}s ({inserted / elapsed:,.0f} rows/s), "
+          f"{categories:,} categories ({eligible:,} eligible), {finals:,} finals, "
+          f"{os.path.getsize(args.path) / 2**20:.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import csv
+import sys
+import json
+import time
+import logging
+import sqlite3
+import argparse
+import itertools
+from collections.abc import Iterable, Iterator
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+from src.db import db_path
+from db_writer import peak_rss_mib, format_rss
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+FIELDS = ("clue", "answer", "value", "category", "origin")
+# rows per executemany batch
+DEFAULT_BATCH_ROWS = 10_000
+# invalid rows logged individually, the rest are only counted
+MAX_LOGGED_ERRORS = 20
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.inserted = 0
+
+def read_records(path: str, file_format: str) -> Iterator[tuple[int, dict]]:
+    """Yields (line number, record) from a CSV file with a header row or a JSONL file, one at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_num, {"_error": f"invalid json: {e.msg}"}
+                    continue
+                yield line_num, record if isinstance(record, dict) else {"_error": "not an object"}
+
+def validate(record: dict, default_origin: str) -> tuple[tuple | None, str | None]:
+    """Returns an insert_questions row, or an error, under the same rules as the questions table:
+    clue and answer are required text, value is an integer, category and origin are optional."""
+    if "_error" in record:
+        return None, record["_error"]
+
+    clue, answer = record.get("clue"), record.get("answer")
+    if not isinstance(clue, str) or not clue.strip():
+        return None, "missing clue"
+    if not isinstance(answer, str) or not answer.strip():
+        return None, "missing answer"
+
+    value = record.get("value")
+    try:
+        # "200" from csv or 200 from json, but not 200.5, true or "$200"
+        value = None if isinstance(value, (bool, float)) else int(value)
+    except (TypeError, ValueError):
+        value = None
+    if value is None:
+        return None, f"value {record.get('value')!r} is not an integer"
+
+    category = record.get("category") or None
+    if category is not None and not isinstance(category, str):
+        return None, "category is not text"
+    origin = record.get("origin") or default_origin
+    return (clue.strip(), answer.strip(), value, category.strip() if category else None, str(origin)), None
+
+def valid_rows(records: Iterable[tuple[int, dict]], default_origin: str, stats: ImportStats) -> Iterator[tuple]:
+    for line_num, record in records:
+        stats.read += 1
+        row, error = validate(record, default_origin)
+        if error:
+            stats.invalid += 1
+            if stats.invalid <= MAX_LOGGED_ERRORS:
+                logger.warning(f"line {line_num}: {error}, skipped")
+            continue
+        yield row
+
+def import_file(conn: sqlite3.Connection, path: str, file_format: str, batch_rows: int,
+                default_origin: str, rebuild: bool = True) -> ImportStats:
+    """Streams a file into questions in one transaction, batch_rows rows per executemany.
+
+    With rebuild the derived indexes are dropped for the load and rebuilt once at the end
+    instead of being maintained by triggers row by row.
+    """
+    stats = ImportStats()
+    rows = valid_rows(read_records(path, file_format), default_origin, stats)
+    with conn:
+        conn.execute("BEGIN")
+        if rebuild:
+            with schema.bulk_load(conn):
+                for batch in itertools.batched(rows, batch_rows):
+                    stats.inserted += schema.insert_questions(conn, batch)
+        else:
+            for batch in itertools.batched(rows, batch_rows):
+                stats.inserted += schema.insert_questions(conn, batch)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Import questions from CSV or JSONL files into questions.db.")
+    parser.add_argument("files", nargs="+", help=f"CSV files with a header row or JSONL files, fields: {', '.join(FIELDS)}")
+    parser.add_argument("--db", default=db_path, help="path to questions.db")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="file format, guessed from the extension otherwise")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_ROWS, help="rows per executemany batch")
+    parser.add_argument("--origin", help="origin for rows without one, defaults to the file name")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep the derived indexes and update them per row, faster for small files into a big db")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    conn = sqlite3.connect(args.db)
+    if schema.needs_migration(conn):
+        logger.error(f"'{args.db}' is schema version {schema.schema_version(conn)}, current is {schema.SCHEMA_VERSION}: "
+                     f"run scripts/migrate_db.py --db {args.db} first.")
+        conn.close()
+        sys.exit(1)
+    conn.execute("PRAGMA journal_mode = WAL")
+    try:
+        # a new db is created at the current version
+        schema.create_table(conn)
+        for path in args.files:
+            file_format = args.format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+            start = time.perf_counter()
+            stats = import_file(conn, path, file_format, args.batch, args.origin or os.path.basename(path),
+                                rebuild=not args.incremental)
+            elapsed = time.perf_counter() - start
+            print(f"{path}: {stats.read:,} rows read, {stats.inserted:,} imported, "
+                  f"{stats.read - stats.invalid - stats.inserted:,} duplicates, {stats.invalid:,} invalid "
+                  f"in {elapsed:.1f}s ({stats.read / elapsed if elapsed else 0:,.0f} rows/s)")
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Import failed, nothing from the failing file was written: {e}")
+        sys.exit(1)
+    finally:
+        # back to a rollback journal for the game's read-only connection
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+    print(f"peak RSS {format_rss(peak_rss_mib())}")
+
+if __name__ == "__main__":
+    main()
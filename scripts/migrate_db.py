@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import logging
+import sqlite3
+import argparse
+
+#path setup for modules
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+sys.path.append(project_root)
+
+from src import schema
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+# Board queries per schema version as (name, sql, params). Version 0 is the legacy text
+# schema the game used to query directly; later versions add the indexed lookups
+# game_utils.py and game.py make now. Params are filled from the db being profiled.
+QUERIES = {
+    0: [
+        ("eligible categories (Round.get_eligible_categories)", """
+            SELECT category FROM questions
+            WHERE value IN (100, 200, 300, 400, 500)
+            GROUP BY category
+            HAVING COUNT(DISTINCT value) = 5
+        """, ()),
+        ("clue pick (Category._get_unique_value_questions)", """
+            SELECT clue, answer, value, category, origin FROM questions
+            WHERE category = :title AND value = 300
+            ORDER BY RANDOM() LIMIT 1
+        """, ("title",)),
+        ("final pick (GameBoard.set_final_q)", """
+            SELECT clue, answer, value, category, origin FROM questions
+            WHERE value = -1
+            ORDER BY RANDOM() LIMIT 1
+        """, ()),
+    ],
+    1: [
+        ("eligible categories, aggregate", """
+            SELECT category_id FROM questions
+            WHERE value IN (100, 200, 300, 400, 500)
+            GROUP BY category_id
+            HAVING COUNT(DISTINCT value) = 5
+        """, ()),
+        ("eligible categories, index (pick_eligible_categories)", """
+            SELECT e.id, c.title FROM eligible_categories e JOIN categories c ON c.id = e.category_id
+            WHERE e.id IN (1, 2, 3, 4, 5, 6)
+        """, ()),
+        ("clue pick, ORDER BY RANDOM()", """
+            SELECT q.clue, q.answer, q.value, c.title, q.origin
+            FROM questions q JOIN categories c ON c.id = q.category_id
+            WHERE c.title = :title AND q.value = 300
+            ORDER BY RANDOM() LIMIT 1
+        """, ("title",)),
+        ("clue pick, rank lookup (random_clue_ids)", """
+            SELECT r.question_id FROM categories c JOIN clue_ranks r ON r.category_id = c.id
+            WHERE c.title = :title AND r.value = 300 AND r.rank = 0
+        """, ("title",)),
+        ("final pick, ORDER BY RANDOM()", """
+            SELECT clue, answer, value, category_id, origin FROM questions
+            WHERE value = -1
+            ORDER BY RANDOM() LIMIT 1
+        """, ()),
+        ("final pick, rank lookup (random_final_id)", """
+            SELECT question_id FROM final_ranks WHERE rank = (SELECT MAX(rank) FROM final_ranks)
+        """, ()),
+        ("question rows (fetch_question_rows)", """
+            SELECT q.id, q.clue, q.answer, q.value, c.title, q.origin
+            FROM questions q LEFT JOIN categories c ON c.id = q.category_id
+            WHERE q.id IN (1, 2, 3, 4, 5)
+        """, ()),
+    ],
+}
+
+def sample_title(conn: sqlite3.Connection, version: int) -> str | None:
+    if version == 0:
+        row = conn.execute("SELECT category FROM questions WHERE value = 300 LIMIT 1").fetchone()
+    else:
+        row = conn.execute(
+            "SELECT c.title FROM questions q JOIN categories c ON c.id = q.category_id WHERE q.value = 300 LIMIT 1"
+        ).fetchone()
+    return row[0] if row else None
+
+def table_stats(conn: sqlite3.Connection) -> str:
+    """Row count and on-disk size of the questions table with its indexes."""
+    rows = conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    try:
+        size = conn.execute("""
+            SELECT SUM(pgsize) FROM dbstat
+            WHERE name = 'questions' OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'questions')
+        """).fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        # sqlite built without dbstat, fall back to the whole file
+        size = conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+    return f"{rows:,} questions, {size / 2**20:.1f} MiB"
+
+def profile(conn: sqlite3.Connection, repeat: int):
+    """Prints the query plan and best-of-repeat time of every board query for the db's version."""
+    version = schema.schema_version(conn)
+    queries = QUERIES[min(version, max(QUERIES))]
+    params = {"title": sample_title(conn, version)}
+
+    for name, sql, keys in queries:
+        args = {k: params[k] for k in keys}
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", args).fetchall()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            best = min(best, time.perf_counter() - start)
+
+        print(f"  {name}: {best * 1000:.2f} ms")
+        for _, _, _, detail in plan:
+            print(f"      {detail}")
+
+def main():
+    default_db = os.path.join(project_root, "data", "questions.db")
+    parser = argparse.ArgumentParser(description="Migrate questions.db to the current schema version.")
+    parser.add_argument("--db", default=default_db, help="path to questions.db")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per query, best is reported")
+    parser.add_argument("--backup", action="store_true", help="copy the db to <db>.bak before migrating")
+    parser.add_argument("--no-analyze", action="store_true", help="skip ANALYZE after migrating")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM after migrating to return freed pages")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not os.path.exists(args.db):
+        logger.error(f"No database at {args.db}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(args.db)
+    version = schema.schema_version(conn)
+    print(f"schema version {version}, current is {schema.SCHEMA_VERSION}")
+    if version >= schema.SCHEMA_VERSION:
+        profile(conn, args.repeat)
+        conn.close()
+        return
+
+    if args.backup:
+        backup = sqlite3.connect(f"{args.db}.bak")
+        conn.backup(backup)
+        backup.close()
+        print(f"backed up to {args.db}.bak")
+
+    print(f"before: {table_stats(conn)}")
+    profile(conn, args.repeat)
+
+    start = time.perf_counter()
+    version = schema.migrate(conn, analyze=not args.no_analyze)
+    print(f"migrated to version {version} in {time.perf_counter() - start:.1f}s")
+    if args.vacuum:
+        conn.execute("VACUUM")
+
+    print(f"after: {table_stats(conn)}")
+    profile(conn, args.repeat)
+    conn.close()
+
+if __name__ == "__main__":
+    main()
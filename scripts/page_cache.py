@@ -0,0 +1,67 @@
+import os
+import re
+import gzip
+import logging
+
+# logger setup
+logger = logging.getLogger(__name__)
+
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
+cache_dir = os.path.join(project_root, "data", "page_cache")
+
+_CACHED_PAGE = re.compile(r"(\d+)\.html\.gz$")
+
+class PageCache:
+    """
+    Gzipped raw game pages on disk keyed by game id, <directory>/<id // 1000>/<id>.html.gz.
+
+    Pages are written to a temporary file and renamed into place, so a crash never leaves a
+    truncated page behind. Safe to read and write from several threads or processes.
+
+    Attributes:
+        directory: root of the cache
+    """
+
+    def __init__(self, directory: str = cache_dir):
+        self.directory = directory
+
+    def path(self, game_id: int) -> str:
+        return os.path.join(self.directory, f"{game_id // 1000:03d}", f"{game_id}.html.gz")
+
+    def get(self, game_id: int) -> str | None:
+        try:
+            with gzip.open(self.path(game_id), "rt", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as e:
+            logger.error(f"Ignoring unreadable cached page for game {game_id}: {e}")
+            return None
+
+    def put(self, game_id: int, html: str):
+        path = self.path(game_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(html)
+        os.replace(tmp, path)
+
+    def __contains__(self, game_id: int) -> bool:
+        return os.path.exists(self.path(game_id))
+
+    def discard(self, game_id: int):
+        try:
+            os.remove(self.path(game_id))
+        except FileNotFoundError:
+            pass
+
+    def game_ids(self) -> list[int]:
+        """Every cached game id, sorted."""
+        ids = []
+        if not os.path.isdir(self.directory):
+            return ids
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                ids.extend(int(m.group(1)) for m in map(_CACHED_PAGE.match, os.listdir(shard.path)) if m)
+        return sorted(ids)
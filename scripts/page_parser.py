@@ -0,0 +1,92 @@
+import re
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# only these cells are built into the tree, the rest of the page is tokenized and dropped
+_RELEVANT_TDS = SoupStrainer("td", class_=["category_name", "clue_text"])
+
+# clue_J_3_2 is round J, category 3, row 2; clue_FJ and clue_TB have no position
+_CLUE_ID = re.compile(r"clue_(J|DJ|FJ|TB)(?:_(\d)_(\d))?(_r)?$")
+
+# board rounds in page order, FJ is the final and TB a tiebreaker
+BOARD_ROUNDS = ("J", "DJ")
+
+class ParsedClue:
+    """One clue cell of a game page, category and row are 1-based board positions."""
+    __slots__ = ("round", "category", "row", "clue", "answer")
+
+    def __init__(self, round: str, category: int, row: int, clue: str, answer: str | None = None):
+        self.round = round
+        self.category = category
+        self.row = row
+        self.clue = clue
+        self.answer = answer
+
+class GameRecord:
+    """
+    Everything scraped from one game page.
+
+    Attributes:
+        categories: category titles per round ("J", "DJ", "FJ", "TB") in board order
+        clues: board clues of the J and DJ rounds, in page order
+        final: the final jeopardy clue, None if the page has none
+    """
+    __slots__ = ("categories", "clues", "final")
+
+    def __init__(self):
+        self.categories: dict[str, list[str]] = {}
+        self.clues: list[ParsedClue] = []
+        self.final: ParsedClue | None = None
+
+    def complete(self) -> bool:
+        """True if both rounds have 6 categories and 30 answered clues, and there is a final."""
+        answered = [c for c in self.clues if c.clue and c.answer]
+        return (all(len(self.categories.get(r, ())) == 6 for r in BOARD_ROUNDS)
+                and len(answered) == 6 * 5 * len(BOARD_ROUNDS)
+                and self.final is not None and bool(self.final.clue and self.final.answer)
+                and len(self.categories.get("FJ", ())) == 1)
+
+def parse_game(html: str) -> GameRecord:
+    """Parses a J! Archive game page in one pass over its category and clue cells.
+
+    Round boundaries come from the clue ids: category cells are collected until the first
+    clue of a round appears and then belong to that round. A clue's hidden "_r" cell holds
+    its correct response.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=_RELEVANT_TDS)
+    record = GameRecord()
+    clues: dict[str, ParsedClue] = {}
+    pending_categories: list[str] = []
+
+    for td in soup.children:
+        if not isinstance(td, Tag):
+            continue
+        classes = td.get("class") or ()
+
+        if "category_name" in classes:
+            pending_categories.append(td.get_text(strip=True))
+            continue
+
+        match = _CLUE_ID.match(td.get("id") or "")
+        if not match:
+            continue
+        round_name, category, row, response = match.groups()
+
+        if response:
+            clue = clues.get(td["id"][:-2])
+            answer = td.find("em", class_="correct_response")
+            if clue and answer:
+                clue.answer = answer.get_text(strip=True)
+            continue
+
+        if pending_categories and round_name not in record.categories:
+            record.categories[round_name] = pending_categories
+            pending_categories = []
+
+        clue = ParsedClue(round_name, int(category or 0), int(row or 0), td.get_text(strip=True))
+        clues[td["id"]] = clue
+        if round_name in BOARD_ROUNDS:
+            record.clues.append(clue)
+        elif round_name == "FJ":
+            record.final = clue
+
+    return record
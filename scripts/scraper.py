@@ -1,9 +1,11 @@
 import os
 import sys
+import time
 import logging
-from bs4 import BeautifulSoup, Tag
-import requests
+import argparse
+import multiprocessing
 import sqlite3
+from collections.abc import Iterable
 
 #Traceback (most recent call last):
 #  File "C:\Users\rhoad\Repositories\jeopardy-game\scripts\scraper.py", line 195, in <module>       
@@ -22,186 +24,177 @@ project_root = os.path.abspath(os.path.join(current_script_dir, os.pardir))
 sys.path.append(project_root)
 
 from src.game_utils import Question
+from src import schema
+from src.db import db_path
+from fetcher import PageFetcher, DEFAULT_CONCURRENCY, DEFAULT_RATE
+from page_parser import parse_game
+from db_writer import QuestionWriter, DEFAULT_BATCH_ROWS, peak_rss_mib, format_rss
+from page_cache import PageCache, cache_dir
 
 # logger setup
 logger = logging.getLogger(__name__)
 
+# game page url, {} is the game id
+GAME_URL = "https://j-archive.com/showgame.php?game_id={}"
+# highest game id scraped by default, somewhere in 9200-10000 is the real max
+LAST_GAME_ID = 9199
+# --update stops after this many ids in a row without a complete game
+UPDATE_MISS_LIMIT = 20
+
+class ScrapeStats:
+    """Counters of the parse stage, the fetcher and writer keep their own."""
+
+    def __init__(self):
+        self.requested = 0
+        self.parsed = 0
+        self.clues = 0
+        self.parse_seconds = 0.0
+        # consecutive ids without a complete game, ends an --update run
+        self.misses = 0
+
+    def add(self, questions: list, seconds: float):
+        self.parsed += 1
+        self.clues += len(questions)
+        self.parse_seconds += seconds
+        self.misses = 0 if questions else self.misses + 1
+
+def scrape(fetcher: PageFetcher, writer: QuestionWriter, url: str, game_ids: Iterable[int], stats: ScrapeStats):
+    """fetch -> parse -> write stream over game_ids.
+
+    Every page is fetched once over the fetcher's pooled session, or read from its cache, and
+    parsed games are written in batches by the writer thread as they arrive, each game
+    checkpointed with its questions. Only complete games are cached: the archive's page for
+    a game not added yet, or one only partly transcribed, is fetched again next time.
+    """
+    for game_id, html in fetcher.fetch_many((i, url.format(i)) for i in game_ids):
+        stats.requested += 1
+        if html is None:
+            stats.misses += 1
+            continue
+        start = time.perf_counter()
+        questions = search_page(url.format(game_id), html)
+        stats.add(questions, time.perf_counter() - start)
+        if fetcher.cache is not None:
+            if not questions:
+                # also drops incomplete pages cached by older runs
+                fetcher.cache.discard(game_id)
+            elif game_id not in fetcher.cache:
+                fetcher.cache.put(game_id, html)
+        writer.put(game_id, questions)
+
 def main():
-    # path setup
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(script_dir)
-    db_path = os.path.join(parent_dir, "data", "questions.db")
+    parser = argparse.ArgumentParser(description="Scrape J! Archive game pages into questions.db.")
+    parser.add_argument("--first", type=int, default=1, help="first game id")
+    parser.add_argument("--last", type=int, default=LAST_GAME_ID, help="last game id")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--resume", action="store_true", help="only fetch ids in range that aren't checkpointed yet")
+    mode.add_argument("--update", action="store_true",
+                      help=f"only fetch ids past the highest scraped one, until {UPDATE_MISS_LIMIT} in a row have no game")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="pages fetched at once")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="max requests per second, 0 for unlimited")
+    parser.add_argument("--url", default=GAME_URL, help="game page url template, {} is the game id")
+    parser.add_argument("--db", default=db_path, help="path to questions.db")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_ROWS, help="rows written per transaction")
+    parser.add_argument("--cache", default=cache_dir, help="directory of the gzipped page cache")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor fill the page cache")
+    parser.add_argument("--offline", action="store_true", help="parse cached pages only, never touch the network")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parser processes for --offline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     try:
-        conn = sqlite3.connect(db_path) 
-        logger.info(f"Successfully connected to database: {db_path}")
+        conn = sqlite3.connect(args.db)
+        schema.create_table(conn)
+        scraped = schema.scraped_game_ids(conn) if args.resume else set()
+        last_scraped = schema.last_scraped_game_id(conn)
+        conn.close()
     except sqlite3.Error as e:
-        logger.error(f"Couldn't connect to or operate on database at '{db_path}': {e}")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred: {e}")
-
-    create_table(conn)
+        logger.error(f"Couldn't connect to or operate on database at '{args.db}': {e}")
+        sys.exit(1)
+
+    stats = ScrapeStats()
+
+    def game_ids():
+        if args.update:
+            game_id = last_scraped + 1
+            while stats.misses < UPDATE_MISS_LIMIT:
+                yield game_id
+                game_id += 1
+        else:
+            yield from (i for i in range(args.first, args.last + 1) if i not in scraped)
+
+    if args.update:
+        logger.info(f"Updating from game id {last_scraped + 1}.")
+    elif args.resume:
+        logger.info(f"Resuming, {len(scraped)} games already checkpointed.")
+
+    cache = None if args.no_cache else PageCache(args.cache)
+    if args.offline and cache is None:
+        logger.error("--offline needs the page cache.")
+        sys.exit(1)
+
+    writer = QuestionWriter(args.db, args.batch)
+    writer.start()
+    if args.offline:
+        # the cache replaces the network, pages are parsed on every core
+        cached = cache.game_ids()
+        if args.update:
+            ids = [i for i in cached if i > last_scraped]
+        else:
+            ids = [i for i in cached if args.first <= i <= args.last and i not in scraped]
+        logger.info(f"Parsing {len(ids)} cached pages with {args.workers} processes.")
+        # spawn, forking next to the writer and fetch threads is unsafe
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            jobs = ((cache.directory, i, args.url.format(i)) for i in ids)
+            for game_id, questions, seconds in pool.imap_unordered(parse_cached_page, jobs, chunksize=8):
+                stats.requested += 1
+                stats.add(questions, seconds)
+                writer.put(game_id, questions)
+    else:
+        fetcher = PageFetcher(args.concurrency, args.rate or None, cache=cache)
+        scrape(fetcher, writer, args.url, game_ids(), stats)
+        fetcher.close()
+        logger.info(f"Fetched {fetcher.describe()}")
 
-    # gather questions
-    questions: list[Question] = []
-    for i in range(9200):
-        if i == 0: i = 1
-        questions += search_page(f"https://j-archive.com/showgame.php?game_id={i}")
-
-    # add questions to db
-    for q in questions:
-        add_jquestion(conn, q)
-
-    if conn:
-        conn.close()
+    try:
+        writer.close()
+    except sqlite3.Error:
+        sys.exit(1)
+    logger.info(f"Wrote {writer.describe()}")
 
     print("STATUS: COMPLETE")
     print("--------------------")
-    print(f"QUESTIONS LOADED: {len(questions)}")
-    print(f"PERCENTAGE OF GAMES USED: {(len(questions) / (9200 * 61.0)) * 100}%")
-
-def search_page(url) -> list[Question]:
-    categories = search_page_for_categories(url)
-    content = search_page_for_questions(url)
-
-    if len(categories) != 13 or len(content) != 61: 
-        logger.error(f"Couldn't scrape sufficient data from {url},\ncontent len = {len(content)}")
+    print(f"QUESTIONS LOADED: {writer.rows}")
+    print(f"PERCENTAGE OF GAMES USED: {(writer.rows / (max(stats.requested, 1) * 61.0)) * 100}%")
+    print(f"PARSE TIME: {stats.parse_seconds / max(stats.parsed, 1) * 1000:.2f} ms/page")
+    print(f"INSERT THROUGHPUT: {writer.rows / writer.write_seconds if writer.write_seconds else 0:,.0f} rows/s")
+    print(f"PEAK RSS: {format_rss(peak_rss_mib())}")
+
+def parse_cached_page(job: tuple[str, int, str]) -> tuple[int, list[Question], float]:
+    """Pool worker for --offline: reads one cached page and parses it, also returns the parse time."""
+    directory, game_id, url = job
+    html = PageCache(directory).get(game_id)
+    start = time.perf_counter()
+    questions = search_page(url, html) if html is not None else []
+    return game_id, questions, time.perf_counter() - start
+
+def search_page(url: str, html: str) -> list[Question]:
+    """Builds the 61 questions of a fetched game page, url is only used in log messages."""
+    record = parse_game(html)
+
+    if not record.complete():
+        logger.error(f"Couldn't scrape sufficient data from {url},\ncontent len = {len(record.clues) + (record.final is not None)}")
         return []
 
     questions: list[Question] = []
-    
-    for i in range(12):
-        # loops through all 12 first and second round categories
-        category = categories[i]
-        for j in range(5):
-            # loops through each question per category
-            # $ value can be determined from j
-            value = (j * 100) + 100
-
-            # determine content index with formula
-            if i < 6:
-                clue = content[i + (j*6)][0]
-                answer = content[i + (j*6)][1]
-            else:
-                clue = content[i + 24 + (j*6)][0]
-                answer = content[i + 24 + (j*6)][1]
-
-            # add Questino obj to list to later be added to db
-            questions.append(Question(clue,answer,value,category,"J! Archive"))
+    for clue in record.clues:
+        # rows 1-5 are the $100-$500 values, Game.play_round scales them per round
+        category = record.categories[clue.round][clue.category - 1]
+        questions.append(Question(clue.clue, clue.answer, clue.row * 100, category, "J! Archive"))
     # Final Jeopardy
-    # hardcoded values work fine as list lengths already determined
-    questions.append(Question(content[60][0],content[60][1],-1,categories[12],"J! Archive"))
+    questions.append(Question(record.final.clue, record.final.answer, -1, record.categories["FJ"][0], "J! Archive"))
     return questions
 
-def search_page_for_questions(url):
-    """Searches jeopardy url for question/answer pairs.
-
-    Args:
-        url (str): 
-            url of J! Archive webparge, example: "https://j-archive.com/showgame.php?game_id=9200"
-            max id somewhere in 9200-10000
-
-    Returns:
-        list[(question,answer)]: list containing question,answer tuples from webpage
-    """
-    try:
-        response = requests.get(url)
-        response.raise_for_status() 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching URL: {e}")
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    answer_question_pairs = []
-    
-    answers_and_clues = soup.find_all("td", class_="clue_text")
-    for ele in answers_and_clues:
-        # skip non-Tag elements
-        if not isinstance(ele, Tag):
-            continue
-
-        id = ele["id"]
-        if isinstance(id, str) and id.endswith('_r'):
-            continue
-
-        question = ele.get_text(strip=True)
-
-        # finds specific answer str text, can have appended text without
-        answer_td = ele.find_next_sibling()
-        if answer_td and isinstance(answer_td, Tag):
-            answer_em = answer_td.find('em', class_='correct_response')
-        if answer_em:
-            answer = answer_em.get_text(strip=True)
-
-        if answer and question:
-            answer_question_pairs.append((question,answer))
-            
-    return answer_question_pairs
-    
-def search_page_for_categories(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status() 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching URL: {e}")
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    categories: list[str] = []
-
-    categories_td = soup.find_all("td", class_="category_name")
-
-    
-    for ele in categories_td:
-        # skip non-Tag elements
-        if not isinstance(ele, Tag):
-            continue
-
-
-        category = ele.get_text(strip=True)
-        categories.append(category)
-    return categories    
-
-def create_table(conn):
-    """Creates necessary table if it don't exist."""
-    cursor = conn.cursor()
-    try:
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                clue TEXT NOT NULL,
-                answer TEXT NOT NULL,
-                value INTEGER,
-                category TEXT,
-                origin TEXT
-            )
-        ''')
-        conn.commit()
-        logger.info("Table 'questions' checked/created.")
-    except sqlite3 as e:
-        logger.error(f"Table couldn't be created: {e}")
-    except Exception as e:
-        logger.error(f"Table couldn't be created: {e}")    
-
-def add_jquestion(conn, question: Question):
-    """Adds jeopardy question to question db
-
-    Args:
-        conn (sqlite connection)
-        clue (str)
-        answer (str)
-        value (int)
-        category (str)
-        origin (str)
-    """
-    cursor = conn.cursor()
-
-    with conn:
-        cursor.execute("INSERT INTO questions (clue, answer, value, category, origin) VALUES (?,?,?,?,?)", (f"{question.clue}",f"{question.answer}",f"{question.value}",f"{question.category}",f"{question.origin}"))
-    if cursor:
-        cursor.close()
-    
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import os
+import logging
+import struct
+import threading
+import zlib
+from .game_utils import Round, Category, Question, load_board, board_history_entry
+from .history import PlayHistory
+
+# logger
+logger = logging.getLogger(__name__)
+
+# path to pack
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+pack_path = os.path.join(parent_dir, "data", "boards.pack")
+
+# boards kept in the pack by background refills
+PACK_REFILL_TARGET = 20
+# packed boards tried before a board is built from the db instead
+PACK_TAKE_TRIES = 5
+
+# each record is a little-endian u32 length followed by a zlib compressed json board
+_LENGTH = struct.Struct("<I")
+
+def encode_board(rounds: list[Round], final_q: Question) -> bytes:
+    """Serializes a board compactly, category titles are stored once per category."""
+    board = {
+        "rounds": [
+            [[cat.title, [[q.clue, q.answer, q.value, q.origin, q.id] for q in cat.questions]] for cat in round.categories]
+            for round in rounds
+        ],
+        "final": [final_q.clue, final_q.answer, final_q.value, final_q.category, final_q.origin, final_q.id],
+    }
+    return zlib.compress(json.dumps(board, separators=(",", ":")).encode("utf-8"))
+
+def decode_board(data: bytes) -> tuple[list[Round], Question]:
+    """Rebuilds the Round/Category/Question objects of an encoded board."""
+    board = json.loads(zlib.decompress(data))
+    # question ids were added later, older packs decode with id None
+    rounds = [
+        Round([Category(title, [Question(clue, answer, value, title, *rest) for clue, answer, value, *rest in questions])
+               for title, questions in round])
+        for round in board["rounds"]
+    ]
+    return rounds, Question(*board["final"])
+
+class BoardPack:
+    """
+    Append-only file of pre-generated boards, consumed front to back so no board is used twice.
+
+    A small sidecar file (<pack>.pos) stores the offset of the next unread board and how many
+    are left, so take() is one seek and one read no matter how big the pack is. Once every
+    board has been read the file is truncated before new boards are appended.
+
+    Attributes:
+        path: path to the pack file
+    """
+
+    def __init__(self, path: str = pack_path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._refill: Future | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def _pos_path(self) -> str:
+        return f"{self.path}.pos"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _read_pos(self) -> tuple[int, int]:
+        try:
+            with open(self._pos_path, "r", encoding="utf-8") as f:
+                pos = json.load(f)
+            return pos["offset"], pos["remaining"]
+        except FileNotFoundError:
+            return 0, 0
+
+    def _write_pos(self, offset: int, remaining: int):
+        # replace atomically so a crash never leaves a cursor pointing at a used board
+        tmp = f"{self._pos_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"offset": offset, "remaining": remaining}, f)
+        os.replace(tmp, self._pos_path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._read_pos()[1]
+
+    def add(self, boards: list[bytes]):
+        """Appends encoded boards (see encode_board) to the pack."""
+        with self._lock:
+            offset, remaining = self._read_pos()
+            # everything has been read, start the file over instead of growing it
+            if remaining == 0 and offset > 0:
+                offset = 0
+                open(self.path, "wb").close()
+
+            with open(self.path, "ab") as f:
+                for data in boards:
+                    f.write(_LENGTH.pack(len(data)))
+                    f.write(data)
+            self._write_pos(offset, remaining + len(boards))
+
+    def take(self) -> tuple[list[Round], Question] | None:
+        """Removes and returns the next board, or None if the pack is empty or missing."""
+        with self._lock:
+            offset, remaining = self._read_pos()
+            if remaining == 0 or not self.exists():
+                return None
+
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+                data = f.read(length)
+            # advance before decoding so a bad record is skipped rather than retried forever
+            self._write_pos(offset + _LENGTH.size + length, remaining - 1)
+
+        try:
+            return decode_board(data)
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Skipping unreadable board in pack: {e}")
+            return None
+
+    def generate(self, count: int, round_num: int, history: PlayHistory | None = None) -> int:
+        """Builds count boards with load_board and appends them, returns how many were added.
+
+        With a history the boards skip its recent categories and clues, and are held in it
+        while the batch is built so boards of the same batch don't share any either.
+        """
+        boards, held = [], []
+        try:
+            for _ in range(count):
+                rounds, final_q = load_board(round_num, history=history)
+                if len(rounds) != round_num or final_q is None:
+                    logger.error("Couldn't build a complete board for the pack.")
+                    break
+                boards.append(encode_board(rounds, final_q))
+                if history is not None:
+                    held.append(board_history_entry(rounds, final_q))
+                    history.hold(*held[-1])
+        finally:
+            # packed boards are checked against the history again when taken
+            for entry in held:
+                history.release(*entry)
+        self.add(boards)
+        return len(boards)
+
+    def refill_in_background(self, target: int, round_num: int, history: PlayHistory | None = None):
+        """Tops the pack back up to target boards on a worker thread, if not already doing so."""
+        if self._refill is not None and not self._refill.done():
+            return
+        missing = target - len(self)
+        if missing <= 0:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="board-pack-refill")
+        self._refill = self._executor.submit(self.generate, missing, round_num, history)
+        logger.info(f"Refilling board pack with {missing} boards.")
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import logging
+import time
+import pygame
+
+from data.settings import DIRTY_RECTS
+from .display import (BLACK, BoardLayout, board_layout, board_grid, draw_board, draw_category_header,
+                      draw_question_cell, draw_player_panel)
+from .game_utils import Category, Question, Player
+
+# logger
+logger = logging.getLogger(__name__)
+
+class BoardRenderer:
+    """
+    Retained-mode board renderer, redraws and updates only the elements that changed.
+
+    The board is kept on an off-screen surface. Each render() compares the round's cells,
+    headers and player panels with what was last drawn, redraws only the changed slots on
+    that surface and copies just those rects to the screen with pygame.display.update(rects).
+    After another screen drew over the board (invalidate()), the retained surface is copied
+    back whole without re-rendering any text. With dirty_rects False every frame goes
+    through the full-frame draw_board instead.
+
+    The BoardLayout is computed once per resolution and board shape and only replaced when
+    either changes. question_at() hit-tests clicks against it.
+
+    Attributes:
+        screen: display surface
+        fonts: fonts from load_fonts
+        dirty_rects: update changed rects only, False falls back to full frames
+        layout: geometry of the board last rendered
+        frames: frames rendered
+        pixels: pixels sent to the display by the last frame
+        seconds: time spent in the last frame
+        total_pixels: pixels sent to the display by every frame
+        total_seconds: time spent in every frame
+    """
+
+    def __init__(self, screen: pygame.Surface, fonts: dict, dirty_rects: bool = DIRTY_RECTS):
+        self.screen = screen
+        self.fonts = fonts
+        self.dirty_rects = dirty_rects
+        self.layout: BoardLayout | None = None
+        self.frames = 0
+        self.pixels = 0
+        self.seconds = 0.0
+        self.total_pixels = 0
+        self.total_seconds = 0.0
+        self._surface: pygame.Surface | None = None
+        self._on_screen = False
+        self._headers: list[str] = []
+        self._grid: list[list[Question]] = []
+        self._cells: dict[tuple[int, int], tuple] = {}
+        self._panels: dict[int, tuple] = {}
+
+    def invalidate(self):
+        """The screen no longer shows the board, e.g. a question screen was drawn over it."""
+        self._on_screen = False
+
+    def question_at(self, pos: tuple[int, int]) -> Question | None:
+        """The question whose cell is under pos on the board last rendered, None between or outside cells."""
+        cell = self.layout.hit_test(pos) if self.layout is not None else None
+        if cell is None:
+            return None
+        col, row = cell
+        if col < len(self._grid) and row < len(self._grid[col]):
+            return self._grid[col][row]
+        return None
+
+    def render(self, categories: list[Category], players: list[Player]):
+        """Brings the displayed board up to date."""
+        start = time.perf_counter()
+        size = self.screen.get_size()
+        layout = board_layout(size, len(categories), len(players), self.layout)
+        self._grid = board_grid(categories)
+
+        if not self.dirty_rects:
+            if categories:
+                self.layout = layout
+            draw_board(self.screen, categories, players, self.fonts, layout)
+            self._on_screen = False
+            self._count(size[0] * size[1], start)
+            return
+
+        titles = [category.title for category in categories]
+        if layout is not self.layout or titles != self._headers:
+            # new round, resolution or board shape: rebuild the retained board
+            self.layout = layout
+            self._rebuild(categories, players)
+            dirty = None
+        else:
+            dirty = self._update(players)
+
+        if not self._on_screen:
+            self.screen.blit(self._surface, (0, 0))
+            pygame.display.update()
+            self._on_screen = True
+            pixels = size[0] * size[1]
+        elif dirty:
+            for rect in dirty:
+                self.screen.blit(self._surface, rect, rect)
+            pygame.display.update(dirty)
+            pixels = sum(rect.width * rect.height for rect in dirty)
+        else:
+            pixels = 0
+        self._count(pixels, start)
+
+    def _rebuild(self, categories: list[Category], players: list[Player]):
+        size = self.layout.size
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size).convert() if pygame.display.get_surface() else pygame.Surface(size)
+        self._surface.fill(BLACK)
+        self._headers = [category.title for category in categories]
+        self._cells, self._panels = {}, {}
+        self._on_screen = False
+
+        for col, category in enumerate(categories):
+            self._draw(self.layout.headers[col], lambda: draw_category_header(self._surface, self.layout, col, category, self.fonts))
+        self._update(players)
+
+    def _update(self, players: list[Player]) -> list[pygame.Rect]:
+        """Redraws the cells and panels whose state changed on the retained surface, returns their slots."""
+        dirty = []
+        for col, questions in enumerate(self._grid):
+            for row, question in enumerate(questions):
+                state = (question, question.value, question.answered)
+                if self._cells.get((col, row)) != state:
+                    self._cells[col, row] = state
+                    slot = self.layout.slots[col][row]
+                    self._draw(slot, lambda: draw_question_cell(self._surface, self.layout, col, row, question, self.fonts))
+                    dirty.append(slot)
+        for i, player in enumerate(players):
+            state = (player.name, player.score)
+            if self._panels.get(i) != state:
+                self._panels[i] = state
+                slot = self.layout.panels[i]
+                self._draw(slot, lambda: draw_player_panel(self._surface, self.layout, i, player, self.fonts))
+                dirty.append(slot)
+        return dirty
+
+    def _draw(self, slot: pygame.Rect, draw):
+        # each element owns its slot: cleared first, and nothing drawn outside it
+        self._surface.set_clip(slot)
+        self._surface.fill(BLACK, slot)
+        draw()
+        self._surface.set_clip(None)
+
+    def _count(self, pixels: int, start: float):
+        self.seconds = time.perf_counter() - start
+        self.pixels = pixels
+        self.frames += 1
+        self.total_pixels += pixels
+        self.total_seconds += self.seconds
+        logger.debug(f"Board frame: {pixels} px in {self.seconds * 1000:.2f} ms")
+
+    def describe(self) -> str:
+        avg_ms = self.total_seconds / self.frames * 1000 if self.frames else 0.0
+        avg_px = self.total_pixels / self.frames if self.frames else 0.0
+        return f"{self.frames} frames, {avg_px:,.0f} px and {avg_ms:.2f} ms per frame"
@@ -0,0 +1,111 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3
+import os
+import logging
+import threading
+import time
+from .schema import SCHEMA_VERSION
+
+# logger
+logger = logging.getLogger(__name__)
+
+# path to db
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+db_path = os.path.join(parent_dir, "data", "questions.db")
+
+# read tuning, the game only ever reads the question db
+MMAP_SIZE = 256 * 1024 * 1024   # bytes mapped instead of read through the page cache
+CACHE_SIZE_KIB = 64 * 1024      # page cache, negative cache_size is KiB
+CACHED_STATEMENTS = 256         # prepared statements kept per connection, reused by identical sql
+
+class QuestionDB:
+    """
+    Shared read-only connection to the question db.
+
+    The connection is opened once, on first use, in read-only and query_only mode and
+    reused by every board-building path. An older db is refused with an error pointing at
+    scripts/migrate_db.py rather than migrated in place. Counters track connects, queries
+    and time spent inside connection() blocks so per-game db overhead can be logged.
+
+    Attributes:
+        path: path to the sqlite db
+        connects: connections opened
+        queries: statements executed
+        seconds: time spent inside connection() blocks
+    """
+
+    def __init__(self, path: str = db_path):
+        self.path = path
+        self.connects = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self._conn: sqlite3.Connection | None = None
+        # the connection is shared with the board prefetch thread
+        self._lock = threading.RLock()
+
+    def open(self, path: str):
+        """Points the manager at another db, the next connection() opens it."""
+        with self._lock:
+            self.close()
+            self.path = path
+
+    @contextmanager
+    def connection(self):
+        """Yields the shared connection, opening it on first use, and times the block."""
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                if self._conn is None:
+                    self._conn = self._connect()
+                yield self._conn
+            finally:
+                self.seconds += time.perf_counter() - start
+
+    def _connect(self) -> sqlite3.Connection:
+        if not os.path.exists(self.path):
+            raise sqlite3.OperationalError(f"no question db at {self.path}")
+
+        uri = f"{Path(self.path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=CACHED_STATEMENTS, check_same_thread=False)
+        self.connects += 1
+
+        # the game never changes the schema or deletes rows, migrating is done offline
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            conn.close()
+            raise sqlite3.OperationalError(
+                f"question db at {self.path} is schema version {version}, the game needs {SCHEMA_VERSION}: "
+                f"run scripts/migrate_db.py --db {self.path} first")
+
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        conn.set_trace_callback(self._count_query)
+        logger.info(f"Opened question db read-only: {self.path}")
+        return conn
+
+    def _count_query(self, statement: str):
+        self.queries += 1
+
+    def stats(self) -> dict[str, float]:
+        """Returns the counters as a dict, pass it to describe() later for a delta."""
+        return {"connects": self.connects, "queries": self.queries, "seconds": self.seconds}
+
+    def describe(self, since: dict[str, float] | None = None) -> str:
+        """Formats the counters, relative to an earlier stats() snapshot if given."""
+        since = since or {"connects": 0, "queries": 0, "seconds": 0.0}
+        now = self.stats()
+        return (f"{now['connects'] - since['connects']} connects, {now['queries'] - since['queries']} queries, "
+                f"{(now['seconds'] - since['seconds']) * 1000:.1f} ms")
+
+    def close(self):
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+# shared by game_utils.py and game.py
+questions_db = QuestionDB()
@@ -1,10 +1,20 @@
 import logging
+import os
 import pygame
 from .game_utils import Round, Category, Question, Player
+from .text_cache import text_cache
+from .text_wrap import text_wrapper
 
 # get logger
 logger = logging.getLogger(__name__)
 
+# font shipped with the game
+current_dir = os.path.dirname(os.path.abspath(__file__))
+PIXEL_FONT = os.path.join(os.path.dirname(current_dir), "assets", "fonts", "pixel.ttf")
+
+# font sizes as fractions of the screen height
+FONT_SIZES = {"category": 0.035, "dollar": 0.05, "player": 0.03, "score": 0.04, "question": 0.06, "title": 0.1}
+
 
 # colors
 BLACK = (0, 0, 0)
@@ -15,6 +25,11 @@ RED = (255, 0, 0)
 GREEN = (0, 128, 0)
 GRAY = (100, 100, 100)
 
+def load_fonts(height: int) -> dict[str, pygame.font.Font]:
+    """Loads the game fonts sized for a screen `height` pixels tall."""
+    pygame.font.init()
+    return {name: pygame.font.Font(PIXEL_FONT, int(height * size)) for name, size in FONT_SIZES.items()}
+
 def draw_text(surface, text, font, color, x, y, align="center", max_width=None, max_height=None):
     """
     Draws text on a surface, with optional alignment and wrapping.
@@ -29,25 +44,12 @@ def draw_text(surface, text, font, color, x, y, align="center", max_width=None,
         max_width (int, optional): Maximum width for text before wrapping.
         max_height (int, optional): Maximum height. If text exceeds, it will be clipped.
     """
-    words = text.split(' ')
-    lines = []
-    current_line = ""
-
-    # Text wrapping logic
-    for word in words:
-        # Check if adding the next word exceeds max_width
-        if max_width:
-            test_line = current_line + " " + word if current_line else word
-            if font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        else: # No max_width, just append
-            current_line += " " + word if current_line else word
-    lines.append(current_line)
-
-    total_text_height = sum(font.size(line)[1] for line in lines)
+    # Text wrapping, measured and memoized by the shared wrapper
+    lines = text_wrapper.wrap(text, font, max_width) if max_width else (text,)
+    # the same titles, values and scores are drawn every frame, rendered once and cached
+    surfaces = [text_cache.render(font, line, color) for line in lines]
+
+    total_text_height = sum(text_surface.get_height() for text_surface in surfaces)
     current_y_offset = 0
 
     if align == "center":
@@ -57,8 +59,7 @@ def draw_text(surface, text, font, color, x, y, align="center", max_width=None,
     elif align == "bottom":
         current_y_offset = y - total_text_height
 
-    for line in lines:
-        text_surface = font.render(line, True, color)
+    for text_surface in surfaces:
         text_rect = text_surface.get_rect()
 
         if align == "center":
@@ -108,218 +109,194 @@ def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> list[str]:
     Returns:
         list[str]: A list of strings, where each string represents a wrapped line.
     """
-    lines = []
-    current_line_words = []
-
-    # Helper function to break a single word that's too long for a line
-    def _split_long_word(long_word: str) -> list[str]:
-        """
-        Breaks a single word that exceeds max_width into multiple sub-lines.
-        Each sub-line will fit within max_width.
-        """
-        sub_lines = []
-        current_segment = ""
-        for char in long_word:
-            # Check if adding the next character makes the segment too long
-            if font.size(current_segment + char)[0] <= max_width:
-                current_segment += char
-            else:
-                # Current segment is full, add it as a sub-line
-                sub_lines.append(current_segment)
-                current_segment = char # Start new segment with the current character
-        
-        # Add any remaining segment as the last sub-line
-        if current_segment:
-            sub_lines.append(current_segment)
-        return sub_lines
-
-    # Split the input text into words. This handles spaces correctly.
-    words = text.split(' ')
-
-    for word in words:
-        # Measure the width of the current word
-        word_width = font.size(word)[0]
-
-        # --- Case 1: The current 'word' itself is too long for any single line ---
-        if word_width > max_width:
-            # If there are already words in the current line, finalize that line first
-            if current_line_words:
-                lines.append(' '.join(current_line_words))
-                current_line_words = [] # Reset for the new, long word
-
-            # Break the oversized word into smaller, fitting sub-lines
-            broken_word_parts = _split_long_word(word)
-            for part in broken_word_parts:
-                lines.append(part) # Add each part as a new full line
-
-            # Continue to the next word from the original list after processing this long one
-            continue
-
-        # --- Case 2: The current 'word' fits on the current line or starts a new one ---
-        # Test if adding the current word to the current_line_words exceeds the max_width
-        # Join current_line_words and the new word with a space for accurate width measurement
-        test_line_string = ' '.join(current_line_words + [word])
-        test_line_width = font.size(test_line_string)[0]
-
-        if test_line_width <= max_width:
-            # The word fits, so add it to the current line
-            current_line_words.append(word)
-        else:
-            # The word does not fit on the current line
-            # Finalize the current line (if it's not empty)
-            if current_line_words:
-                lines.append(' '.join(current_line_words))
-            
-            # Start a new line with the current word
-            current_line_words = [word]
-
-    # --- Final Step: Add any remaining words as the last line ---
-    # After the loop, if there are any words left in current_line_words,
-    # they form the last line.
-    if current_line_words:
-        lines.append(' '.join(current_line_words))
-
-    return lines
+    # words and glyphs are measured once, whole results are memoized (text_wrap.py)
+    return list(text_wrapper.wrap(text, font, max_width))
+
+# board layout, vertical space ratios for the different sections
+TOP_MARGIN_RATIO = 0.04          # Reduced top margin slightly
+BOTTOM_BOARD_GAP_RATIO = 0.02    # Reduced gap
+PLAYER_INFO_HEIGHT_RATIO = 0.12  # Reduced player info height slightly
+SIDE_MARGIN_RATIO = 0.03         # Reduced side margins for more board space
+NUM_QUESTION_ROWS = 5            # Fixed number of questions per category
+PLAYER_BG_COLOR = (30, 30, 30)   # Darker gray for player background
+
+class BoardLayout:
+    """
+    Board geometry for one resolution and board shape, computed once and shared by the
+    renderer and the click handler.
+
+    Slots are the areas each element owns, neighbouring slots share edges without
+    overlapping. Cells are the clickable rects inside the cell slots.
+
+    Attributes:
+        size: screen width and height
+        num_categories: board columns
+        num_players: player panels along the bottom
+        headers: category header slot per column
+        slots: question cell slot per column and row
+        cells: clickable question cell rect per column and row
+        panels: player panel slot per player
+        panel_boxes: background box inside each player panel
+    """
+
+    def __init__(self, size: tuple[int, int], num_categories: int, num_players: int):
+        self.size = size
+        self.num_categories = num_categories
+        self.num_players = num_players
+        width, height = size
+
+        # Calculate pixel dimensions for each section
+        top_margin_px = height * TOP_MARGIN_RATIO
+        bottom_board_gap_px = height * BOTTOM_BOARD_GAP_RATIO
+        player_info_height_px = height * PLAYER_INFO_HEIGHT_RATIO
+        side_margin_px = width * SIDE_MARGIN_RATIO
+
+        # Calculate board dimensions
+        board_start_y = top_margin_px
+        board_end_y = height - player_info_height_px - bottom_board_gap_px
+        board_height = board_end_y - board_start_y
+        board_width = width - (2 * side_margin_px)
+
+        # Cell dimensions for the board, +1 row for the category headers
+        self.cell_width = board_width / max(1, num_categories)
+        self.cell_height = board_height / (NUM_QUESTION_ROWS + 1)
+        # Starting position for the question grid cells (below category headers)
+        self.grid_x = side_margin_px
+        self.grid_y = board_start_y + self.cell_height
+
+        def span(x0: float, y0: float, x1: float, y1: float) -> pygame.Rect:
+            # rounded edges so neighbouring slots tile exactly
+            return pygame.Rect(round(x0), round(y0), round(x1) - round(x0), round(y1) - round(y0))
+
+        self.headers, self.slots = [], []
+        for col in range(num_categories):
+            x0, x1 = self.grid_x + col * self.cell_width, self.grid_x + (col + 1) * self.cell_width
+            self.headers.append(span(x0, board_start_y, x1, self.grid_y))
+            self.slots.append([span(x0, self.grid_y + row * self.cell_height, x1, self.grid_y + (row + 1) * self.cell_height)
+                               for row in range(NUM_QUESTION_ROWS)])
+
+        # Inner padding for cells, dynamic border radius and thickness
+        self.cell_padding = max(5, int(min(self.cell_width, self.cell_height) * 0.03))
+        self.cells = [[slot.inflate(-2 * self.cell_padding, -2 * self.cell_padding) for slot in column]
+                      for column in self.slots]
+        inner = min(self.cell_width, self.cell_height) - 2 * self.cell_padding
+        self.cell_radius = int(inner * 0.1)
+        self.cell_border = max(1, int(inner * 0.01))
+
+        self.panels, self.panel_boxes = [], []
+        player_area_y = height - player_info_height_px # Top of the player info area
+        for i in range(num_players):
+            player_cell_width = width / num_players
+            panel = span(i * player_cell_width, player_area_y, (i + 1) * player_cell_width, height)
+            # Add some padding/margin to player cells
+            player_inner_padding = max(5, int(panel.height * 0.05))
+            self.panels.append(panel)
+            self.panel_boxes.append(panel.inflate(-2 * player_inner_padding, -2 * player_inner_padding))
+        self.panel_radius = int(min(width / max(1, num_players), player_info_height_px) * 0.05)
+
+    def matches(self, size: tuple[int, int], num_categories: int, num_players: int) -> bool:
+        return (self.size, self.num_categories, self.num_players) == (tuple(size), num_categories, num_players)
+
+    def hit_test(self, pos: tuple[int, int]) -> tuple[int, int] | None:
+        """Maps a screen position to the (column, row) of the question cell under it, by arithmetic."""
+        x, y = pos
+        col = int((x - self.grid_x) // self.cell_width)
+        row = int((y - self.grid_y) // self.cell_height)
+        if not (0 <= col < self.num_categories and 0 <= row < NUM_QUESTION_ROWS):
+            return None
+        # the padding between cells isn't part of any cell
+        return (col, row) if self.cells[col][row].collidepoint(pos) else None
+
+def board_layout(size: tuple[int, int], num_categories: int, num_players: int,
+                 layout: BoardLayout | None = None) -> BoardLayout:
+    """Returns layout if it still fits the screen and board shape, a new BoardLayout otherwise."""
+    if layout is not None and layout.matches(size, num_categories, num_players):
+        return layout
+    return BoardLayout(tuple(size), num_categories, num_players)
+
+def board_grid(categories: list[Category]) -> list[list[Question]]:
+    """Questions per column in display order, sorted by value."""
+    return [sorted(category.questions, key=lambda q: q.value)[:NUM_QUESTION_ROWS] for category in categories]
+
+def draw_category_header(surface: pygame.Surface, layout: BoardLayout, col: int, category: Category, fonts):
+    """Draws a category title wrapped to 90% of its column."""
+    slot = layout.headers[col]
+    draw_text(surface, category.title.upper(), fonts["category"], YELLOW,
+              slot.centerx, slot.centery,
+              align="center", max_width=int(slot.width * 0.9))
+
+def draw_question_cell(surface: pygame.Surface, layout: BoardLayout, col: int, row: int, question: Question, fonts) -> pygame.Rect:
+    """Draws a question cell, returns the cell rect for click detection."""
+    rect = layout.cells[col][row]
+
+    if question.answered:
+        # Draw answered cell
+        pygame.draw.rect(surface, GRAY, rect, border_radius=layout.cell_radius)
+        draw_text(surface, "X", fonts["dollar"], BLACK, rect.centerx, rect.centery)
+    else:
+        # Draw active question cell
+        pygame.draw.rect(surface, BLUE, rect, border_radius=layout.cell_radius)
+        pygame.draw.rect(surface, WHITE, rect, layout.cell_border, border_radius=layout.cell_radius) # White border
+
+        # Use max_width for the dollar value text as well
+        draw_text(surface, f"${question.value}", fonts["dollar"], YELLOW,
+                  rect.centerx, rect.centery,
+                  align="center", max_width=int(rect.width * 0.8)) # 80% of rect width
+    return rect
+
+def draw_player_panel(surface: pygame.Surface, layout: BoardLayout, i: int, player: Player, fonts):
+    """Draws a player's name and score panel."""
+    slot = layout.panels[i]
+    pygame.draw.rect(surface, PLAYER_BG_COLOR, layout.panel_boxes[i], border_radius=layout.panel_radius)
+
+    # Draw player name, aligned to the top-ish of its section
+    draw_text(surface, player.name.upper(), fonts["player"], WHITE,
+              slot.centerx, slot.y + slot.height * 0.3,
+              align="center", max_width=int(slot.width * 0.9))
+
+    # Draw player score, aligned to the bottom-ish of its section
+    draw_text(surface, f"${player.score}", fonts["score"], YELLOW,
+              slot.centerx, slot.y + slot.height * 0.7,
+              align="center", max_width=int(slot.width * 0.9))
 
 def draw_board(screen: pygame.Surface, categories: list[Category], players: list[Player], 
-               fonts):
+               fonts, layout: BoardLayout | None = None):
     """
     Draws the main Jeopardy game board, including categories, dollar values,
-    and player names/scores at the bottom.
+    and player names/scores at the bottom, then flips the full display.
+
+    Full-frame path, BoardRenderer (board_renderer.py) redraws only what changed.
 
     Args:
         screen (pygame.Surface): The Pygame screen surface to draw on.
         categories (list[Category]): A list of Category objects, expected to be of length 6.
         players (list[Player]): A list of Player objects (1 to 4 players).
-        category_font (pygame.font.Font): The font for category titles.
-        dollar_font (pygame.font.Font): The font for dollar values.
-        player_font (pygame.font.Font): The font for player names.
-        score_font (pygame.font.Font): The font for player scores.
+        fonts (dict): fonts from load_fonts
+        layout (BoardLayout, optional): layout to reuse, computed for the screen if missing or stale
 
     Returns:
         dict: A dictionary storing the Pygame Rect objects for each question cell.
               Keys are (question_obj) tuples, values are pygame.Rect objects.
     """
-
-    width, height = screen.get_size()
     screen.fill(BLACK)
 
-    # --- Layout Calculations for Board and Player Area ---
     num_categories = len(categories)
     if num_categories != 6:
         logger.warning(f"Expected 6 categories, but got {num_categories}. Board layout may be off.")
         if num_categories == 0:  # Avoid division by zero if no categories
             return {}
 
-    num_question_rows = 5  # Fixed number of questions per category
-
-    # Define vertical space ratios for different sections
-    TOP_MARGIN_RATIO = 0.04          # Reduced top margin slightly
-    BOTTOM_BOARD_GAP_RATIO = 0.02    # Reduced gap
-    PLAYER_INFO_HEIGHT_RATIO = 0.12  # Reduced player info height slightly
-    SIDE_MARGIN_RATIO = 0.03         # Reduced side margins for more board space
-
-    # Calculate pixel dimensions for each section
-    top_margin_px = height * TOP_MARGIN_RATIO
-    bottom_board_gap_px = height * BOTTOM_BOARD_GAP_RATIO
-    player_info_height_px = height * PLAYER_INFO_HEIGHT_RATIO
-    side_margin_px = width * SIDE_MARGIN_RATIO
-
-    # Calculate board dimensions
-    board_start_y = top_margin_px
-    board_end_y = height - player_info_height_px - bottom_board_gap_px
-    board_height = board_end_y - board_start_y
-    board_width = width - (2 * side_margin_px)
-
-    # Cell dimensions for the board
-    cell_width = board_width / num_categories
-    # +1 for category header row
-    cell_height = board_height / (num_question_rows + 1)
-
-    # Starting position for the question grid cells (below category headers)
-    grid_start_x = side_margin_px
-    grid_start_y = board_start_y + cell_height # Start below the category headers
-
+    layout = board_layout(screen.get_size(), num_categories, len(players), layout)
     question_rects = {}
 
-    # --- Draw Category Headers ---
-    for col, category in enumerate(categories):
-        # Calculate the center X for the category column
-        cat_x_center = grid_start_x + col * cell_width + cell_width // 2
-        # Calculate the Y center for the category header cell
-        cat_y_center = board_start_y + cell_height // 2
-        
-        # The crucial part: use max_width for text wrapping
-        # Pass the effective width for the category text
-        draw_text(screen, category.title.upper(), fonts["category"], YELLOW, 
-                  cat_x_center, cat_y_center, 
-                  align="center", max_width=int(cell_width * 0.9)) # 90% of cell_width for padding
-
-        # Ensure questions are sorted by value for consistent display
-        # Use a defensive check if questions might be missing or not sorted
-        sorted_questions = sorted(category.questions, key=lambda q: q.value)
-
-        # --- Draw Question Cells ---
-        for row, question_obj in enumerate(sorted_questions):
-            rect_x = grid_start_x + col * cell_width
-            rect_y = grid_start_y + row * cell_height
-
-            # Inner padding for cells
-            rect_padding = max(5, int(min(cell_width, cell_height) * 0.03)) # Dynamic padding
-            
-            rect = pygame.Rect(rect_x + rect_padding, rect_y + rect_padding,
-                               cell_width - (2 * rect_padding), cell_height - (2 * rect_padding))
-
-            question_rects[question_obj] = rect
-
-            if hasattr(question_obj, 'answered') and question_obj.answered:
-                # Draw answered cell
-                pygame.draw.rect(screen, GRAY, rect, border_radius=int(min(rect.width, rect.height) * 0.1)) # Dynamic border radius
-                draw_text(screen, "X", fonts["dollar"], BLACK, rect.centerx, rect.centery)
-            else:
-                # Draw active question cell
-                pygame.draw.rect(screen, BLUE, rect, border_radius=int(min(rect.width, rect.height) * 0.1)) # Dynamic border radius
-                pygame.draw.rect(screen, WHITE, rect, max(1, int(min(rect.width, rect.height) * 0.01)), border_radius=int(min(rect.width, rect.height) * 0.1)) # White border, dynamic thickness
-                
-                # Use max_width for the dollar value text as well
-                draw_text(screen, f"${question_obj.value}", fonts["dollar"], YELLOW, 
-                          rect.centerx, rect.centery, 
-                          align="center", max_width=int(rect.width * 0.8)) # 80% of rect width
+    for col, (category, questions) in enumerate(zip(categories, board_grid(categories))):
+        draw_category_header(screen, layout, col, category, fonts)
+        for row, question_obj in enumerate(questions):
+            question_rects[question_obj] = draw_question_cell(screen, layout, col, row, question_obj, fonts)
 
     # --- Draw Player Names and Scores at the Bottom ---
-    num_players = len(players)
-    if num_players > 0:
-        player_area_width = width
-        player_cell_width = player_area_width / num_players
-        player_area_y = height - player_info_height_px # Top of the player info area
-
-        for i, player in enumerate(players):
-            player_rect_x = i * player_cell_width
-            player_rect = pygame.Rect(player_rect_x, player_area_y, player_cell_width, player_info_height_px)
-
-            # Draw a background for each player's info
-            player_bg_color = (30, 30, 30) # Darker gray for player background
-            # Add some padding/margin to player cells
-            player_inner_padding = max(5, int(player_rect.height * 0.05)) # Dynamic inner padding
-            
-            pygame.draw.rect(screen, player_bg_color, 
-                             (player_rect.x + player_inner_padding, 
-                              player_rect.y + player_inner_padding, 
-                              player_rect.width - 2 * player_inner_padding, 
-                              player_rect.height - 2 * player_inner_padding), 
-                             border_radius=int(min(player_rect.width, player_rect.height) * 0.05))
-            
-            # Draw player name
-            # Align player name to the top-ish of its section
-            draw_text(screen, player.name.upper(), fonts["player"], WHITE, 
-                      player_rect.centerx, player_rect.y + player_info_height_px * 0.3,
-                      align="center", max_width=int(player_rect.width * 0.9))
-            
-            # Draw player score
-            # Align player score to the bottom-ish of its section
-            draw_text(screen, f"${player.score}", fonts["score"], YELLOW, 
-                      player_rect.centerx, player_rect.y + player_info_height_px * 0.7,
-                      align="center", max_width=int(player_rect.width * 0.9))
+    for i, player in enumerate(players):
+        draw_player_panel(screen, layout, i, player, fonts)
 
     pygame.display.flip() # Update the full display Surface to the screen
     return question_rects
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 from pygame import Surface
 import pygame
-from .display import draw_board, draw_question_screen, draw_main_menu, display_buzzed, display_correct_answer, display_final_jeopardy_title
-from .game_utils import Question, Category, Round, Player
+from .display import load_fonts, draw_question_screen, draw_main_menu, display_buzzed, display_correct_answer, display_final_jeopardy_title
+from .loop import FrameLoop
+from .board_renderer import BoardRenderer
+from .text_cache import text_cache
+from .game_utils import Question, Category, Round, Player, load_board, board_history_entry, fetch_questions
+from .schema import random_final_id
+from .db import questions_db
+from .prefetch import BoardPrefetcher
+from .board_pack import BoardPack, PACK_REFILL_TARGET, PACK_TAKE_TRIES
+from .history import PlayHistory
+from .question_pack import QuestionPack
 from .music import play_music, stop_music, set_music_volume, load_music_files, final_music_list, victory_music_list, title_music_list
 import logging
 import os
 import sqlite3
 import serial
+from typing import Iterable
 import sys
 import os
 
@@ -19,10 +29,9 @@ proj_root = os.path.abspath(os.path.join(current_dir, ".."))
 # get logger
 logger = logging.getLogger(__name__)
 
-# path to db
-script_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(script_dir)
-db_path = os.path.join(parent_dir, "data", "questions.db")
+# length of the final jeopardy timer
+FINAL_SECONDS = 30
+
 class Game:
     """
     Responsible for managing and executing a game.
@@ -30,14 +39,32 @@ class Game:
     Attributes:
         players: list of player objects
         screen: pygame surface on which the game will appear (set by main.py)
-        board: GameBoard object used to keep track of board state
+        board: GameBoard object used to keep track of board state, taken from board_prefetcher when a game starts
+        board_prefetcher: builds the next GameBoard in the background
+        history: clues and categories of recent games, not repeated by new boards
+        questions: memory-mapped question pack read instead of questions.db, if one exists
+        loop: frame-capped event loop every screen runs on
+        renderer: retained-mode board renderer, redraws only what changed
     """ 
 
     def __init__(self, screen: Surface):
-        self.board = GameBoard(2) # two rounds are standard, will be variable when settings are implemented
+        # boards are built on a worker thread while the menu or the previous game runs
+        # pre-generated boards are used first when a pack exists (scripts/build_board_pack.py)
+        board_pack = BoardPack()
+        pack = board_pack if board_pack.exists() else None
+        self.history = PlayHistory()
+        # kiosks ship a question pack (scripts/build_question_pack.py) instead of questions.db
+        question_pack = QuestionPack()
+        self.questions = question_pack if question_pack.exists() else None
+        self.board_prefetcher: BoardPrefetcher[GameBoard] = BoardPrefetcher(
+            lambda: GameBoard(2, pack, self.history, self.questions)) # two rounds are standard, will be variable when settings are implemented
+        self.board_prefetcher.prefetch()
+        self.board: GameBoard | None = None
         self.players : list[Player] = []
         self.add_players(3) # 3 player games are standard, will be variable when settings are implemented
         self.screen = screen
+        # screens redraw only when their state changes, idle screens sleep on the event queue
+        self.loop = FrameLoop(on_quit=self.quit)
 
         # device specific port where arduino is connected
         SERIAL_PORT = 'COM4'
@@ -59,30 +86,10 @@ class Game:
 
         
         # font setup
-        pygame.font.init()
-        try:
-            PIXEL_FONT = os.path.join(proj_root, "assets", "fonts", "pixel.ttf")
-        except pygame.error as e:
-            logger.error(f"Unable to load font: {e}")
-        except Exception as e:
-            logger.error(f"Unable to load font: {e}")
-
-        height = pygame.display.Info().current_h
-        category_font_size = int(height * 0.035) 
-        dollar_font_size = int(height * 0.05)   
-        player_font_size = int(height * 0.03)   
-        score_font_size = int(height * 0.04)    
-        question_font_size = int(height * 0.06)
-        title_font_size = int(height * 0.1)
-        category_font = pygame.font.Font(PIXEL_FONT, category_font_size)
-        dollar_font = pygame.font.Font(PIXEL_FONT, dollar_font_size)
-        player_font = pygame.font.Font(PIXEL_FONT, player_font_size)
-        score_font = pygame.font.Font(PIXEL_FONT, score_font_size)
-        question_font = pygame.font.Font(PIXEL_FONT, question_font_size)
-        title_font = pygame.font.Font(PIXEL_FONT, title_font_size)
-
-        self.fonts = {"category": category_font, "dollar": dollar_font, "player": player_font, "score": score_font, 
-                      "question": question_font, "title": title_font}
+        self.fonts = load_fonts(pygame.display.Info().current_h)
+        self.renderer = BoardRenderer(self.screen, self.fonts)
+        # a damaged or resized window gets the whole board pushed again, not just changed cells
+        self.loop.on_expose = self.renderer.invalidate
 
         # music setup
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096) # reduce buffer by powers of two if aduio lags
@@ -91,32 +98,37 @@ class Game:
         load_music_files(MUSIC_DIR)
 
     def start(self):
-        # main menu
-        buttons = draw_main_menu(self.screen, self.fonts)
-        play_music(title_music_list[0])
+        # back-to-back games, each takes the prefetched board while the next one is built
+        while True:
+            # main menu
+            play_music(title_music_list[0])
+            buttons: dict[str, pygame.Rect] = {}
 
-        
-        running = True
-        while running:
-            for event in pygame.event.get(): 
-                if event.type == pygame.QUIT: 
-                    running = False
+            def draw_menu():
+                buttons.update(draw_main_menu(self.screen, self.fonts))
+
+            def handle_menu(event: pygame.event.Event) -> bool:
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    if buttons['exit_button'].collidepoint(pos):
-                        running = False
-                    elif buttons['start_button'].collidepoint(pos):
-                        running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-
-        stop_music()
-        round_num = 1
-        for round in self.board.rounds:
-            self.play_round(round, round_num)
-            round_num += 1
-        self.play_final()
+                    if buttons['exit_button'].collidepoint(event.pos):
+                        self.quit()
+                    return buttons['start_button'].collidepoint(event.pos)
+                return event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+
+            self.loop.run(handle_menu, draw_menu)
+
+            stop_music()
+            # instant when the prefetch finished during the menu, synchronous build otherwise
+            self.board = self.board_prefetcher.take()
+            # only boards that are actually played count against the no-repeat window
+            self.board.record()
+            self.players = []
+            self.add_players(3)
+
+            round_num = 1
+            for round in self.board.rounds:
+                self.play_round(round, round_num)
+                round_num += 1
+            self.play_final()
     
     def play_round(self, round: Round, round_num : int):
         # daily doubles to implement
@@ -126,76 +138,48 @@ class Game:
             for q in cat.questions:
                 q.value *= round_num
 
-        running = True
-        while running:
-            # update board
-            # quesntion_rects is dict {Question: rect}
-            question_rects = draw_board(self.screen, round.categories, self.players, self.fonts)
+        def draw():
+            self.renderer.render(round.categories, self.players)
+
+        def handle(event: pygame.event.Event) -> bool:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # the renderer's layout maps the click straight to a cell
+                q = self.renderer.question_at(event.pos)
+                if q is not None:
+                    self.buzzer_round(q)
+                    # the buzzer round drew over the board
+                    self.renderer.invalidate()
+                    self.loop.invalidate()
+                    # exit round if all questions have been answered
+                    return check_for_all_answered(q for cat in round.categories for q in cat.questions)
+            elif event.type == pygame.KEYDOWN:
+                return event.key == pygame.K_ESCAPE
+            return False
 
-            for event in pygame.event.get():
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    for q in question_rects:
-                        if question_rects[q].collidepoint(pos):
-                            self.buzzer_round(q)
-
-                            # exit round if all questions have been answered
-                            if check_for_all_answered(question_rects):
-                                running = False
-                                
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-                    
+        self.loop.run(handle, draw)
+        logger.info(f"Board frames after round {round_num}: {self.renderer.describe()}")
+        logger.info(f"Text cache: {text_cache.describe()}")
 
     def play_final(self):
         # awaiting betting implementation
         play_music(final_music_list[0])
-        display_final_jeopardy_title(self.screen, self.fonts, self.players)
-
         # clear events
         pygame.event.get()
 
         # wait for host to continue
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            waiting = False
-
-        draw_question_screen(self.screen, self.board.final_q, self.fonts)
-        
-        start_final = pygame.time.get_ticks()
-
+        self.loop.wait_for_key(pygame.K_SPACE, draw=lambda: display_final_jeopardy_title(self.screen, self.fonts, self.players))
 
         # clear events
         pygame.event.get()
-        # 30 second timer for final jeopardy
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            running = False
-                # redundant to ensure holding down a button doesn't interfere with timer
-                if (pygame.time.get_ticks() - start_final > 30000):
-                    running = False
-            if (pygame.time.get_ticks() - start_final > 30000):
-                running = False
-
-        display_correct_answer(self.screen, self.board.final_q, self.fonts)
-
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            running = False
-
-        # end game for now
+        # 30 second timer for final jeopardy, escape ends it early
+        self.loop.run(lambda event: event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE,
+                      lambda: draw_question_screen(self.screen, self.board.final_q, self.fonts),
+                      timeout_ms=FINAL_SECONDS * 1000)
+
+        self.loop.wait_for_key(pygame.K_SPACE, draw=lambda: display_correct_answer(self.screen, self.board.final_q, self.fonts))
+
+        # end game for now, back to the main menu for the next game
         # create winner screen, betting screen, betting system in future
-        self.quit()
 
     def reset_buzzed(self):
         for p in self.players:
@@ -203,10 +187,9 @@ class Game:
     
         
     def wait_for_buzz_in(self, ser: serial.Serial):
-        # wait for serial response
-        while ser.in_waiting == 0:
-            pass
-        
+        # wait for serial response, the loop sleeps between polls and keeps the window responsive
+        self.loop.run(lambda event: False, poll=lambda: ser.in_waiting > 0)
+
         byte_response = ser.readline()
         return byte_response.decode("utf-8").strip()
 
@@ -239,35 +222,26 @@ class Game:
         buzzed_player: Player = self.players[resp]
         buzzed_player.answered = True
 
-        # display buzzed in screen
-        # update player score based on host response
-        display_buzzed(self.fonts["question"], buzzed_player, self.screen, self.fonts)
-
         # clear event list
         pygame.event.get()
 
-        # wait for host response
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        # update score
-                        buzzed_player.score += question_value
-
-                        # inform buzzer system
-                        if self.serial:
-                            self.serial.write(b"correct\n")
+        # display buzzed in screen, wait for host response
+        # update player score based on host response
+        key = self.loop.wait_for_key(pygame.K_SPACE, pygame.K_BACKSPACE,
+                                     draw=lambda: display_buzzed(self.fonts["question"], buzzed_player, self.screen, self.fonts))
+        if key == pygame.K_SPACE:
+            # update score
+            buzzed_player.score += question_value
 
-                        # exit round 
-                        return False
+            # inform buzzer system
+            if self.serial:
+                self.serial.write(b"correct\n")
 
-                    if event.key == pygame.K_BACKSPACE:
-                        # update score
-                        buzzed_player.score -= question_value
+            # exit round
+            return False
 
-                        # exit loop to check if all players have answered
-                        waiting = False
+        # update score, then check if all players have answered
+        buzzed_player.score -= question_value
 
         # check if all players have buzzed
         for player in self.players:
@@ -288,44 +262,33 @@ class Game:
         # clear event list
         pygame.event.get()
         
-        draw_question_screen(self.screen, q, self.fonts)
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        if self.serial:
-                            self.serial.write(b"start\n")
-
-                        buzzing = True
-                        while buzzing:
-                            draw_question_screen(self.screen, q, self.fonts)
-                            if self.serial:
-                                ser_response = self.wait_for_buzz_in(self.serial)
-
-                            # returns False if player gets correct answer or out of players
-                            buzzing = self.handle_buzz_in_response(ser_response, q.value)
-                        running = False
-                        
+        self.loop.wait_for_key(pygame.K_SPACE, draw=lambda: draw_question_screen(self.screen, q, self.fonts))
+        if self.serial:
+            self.serial.write(b"start\n")
+
+        buzzing = True
+        while buzzing:
+            draw_question_screen(self.screen, q, self.fonts)
+            if self.serial:
+                ser_response = self.wait_for_buzz_in(self.serial)
 
+            # returns False if player gets correct answer or out of players
+            buzzing = self.handle_buzz_in_response(ser_response, q.value)
 
         q.answered = True
         self.reset_buzzed()
-        display_correct_answer(self.screen, q, self.fonts)
         # clear events
-        pygame.event.get() 
+        pygame.event.get()
         # wait until space to continue
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        waiting = False
+        self.loop.wait_for_key(pygame.K_SPACE, draw=lambda: display_correct_answer(self.screen, q, self.fonts))
 
-    
     def quit(self):
         if self.serial:
             self.serial.close()
+        self.board_prefetcher.shutdown()
+        questions_db.close()
+        if self.questions:
+            self.questions.close()
         if pygame:
             pygame.quit()
         sys.exit()
@@ -356,12 +319,76 @@ class GameBoard:
     Attributes:
         rounds: list[Round]
         round_final: Question
+        history: play history the board avoids and is recorded in, optional
+        questions: question pack to build from instead of the db, optional
     """
-    def __init__(self, round_num):
-        self.rounds = []
-        for _ in range(round_num):
-            self.rounds.append(Round())
-        self.set_final_q()
+    def __init__(self, round_num, pack: BoardPack | None = None, history: PlayHistory | None = None,
+                 questions: QuestionPack | None = None):
+        self.history = history
+        self.questions = questions
+        # a pre-generated board needs no sql at all, the pack is topped up in the background
+        if pack is not None:
+            board = self.take_packed(pack, round_num)
+            pack.refill_in_background(PACK_REFILL_TARGET, round_num, history)
+            if board is not None:
+                self.rounds, self.final_q = board
+                logger.info("Board taken from pack.")
+                self.hold()
+                return
+
+        db_stats = questions_db.stats()
+        # every round and the final are loaded over the shared connection in one pass
+        self.rounds, self.final_q = load_board(round_num, history=history, questions=questions)
+        if self.final_q is None:
+            self.set_final_q()
+        logger.info(f"Board loaded: {questions_db.describe(db_stats)}")
+        # held until played so the prefetched next board already avoids it
+        self.hold()
+
+    def take_packed(self, pack: BoardPack, round_num: int) -> tuple[list[Round], Question] | None:
+        """Takes packed boards until one fits, None after PACK_TAKE_TRIES misfits or an empty pack."""
+        for _ in range(PACK_TAKE_TRIES):
+            board = pack.take()
+            if board is None:
+                return None
+            rounds, final_q = board
+            if len(rounds) != round_num:
+                logger.warning(f"Discarded packed board with {len(rounds)} rounds, wanted {round_num}.")
+                continue
+            played = self.recently_played(rounds, final_q)
+            if played is not None:
+                logger.warning(f"Discarded packed board, {played} was played recently.")
+                continue
+            return board
+        return None
+
+    def recently_played(self, rounds: list[Round], final_q: Question) -> str | None:
+        """Describes the first category or clue of the board played within the history window, None if none was."""
+        if self.history is None:
+            return None
+        for round in rounds:
+            for cat in round.categories:
+                if self.history.category_played(cat.title):
+                    return f"category '{cat.title}'"
+                for q in cat.questions:
+                    if self.history.played(q.id):
+                        return f"clue {q.id} in '{cat.title}'"
+        if self.history.played(final_q.id):
+            return f"final {final_q.id}"
+        return None
+
+    def hold(self):
+        """Keeps the board's clues and categories out of boards built while it waits to be played."""
+        if self.history is not None:
+            self.history.hold(*board_history_entry(self.rounds, self.final_q))
+
+    def record(self):
+        """Adds the board's clues and categories to the play history, called once it is played."""
+        if self.history is None:
+            return
+        question_ids, titles = board_history_entry(self.rounds, self.final_q)
+        self.history.record_game(question_ids, titles)
+        self.history.release(question_ids, titles)
     
     def set_final_q(self):
         """Returns random Question with given questino value.
@@ -372,44 +399,35 @@ class GameBoard:
         Returns:
             Question: object containing question attributes
         """
+        self.final_q = None
+        if self.questions is not None:
+            self.final_q = self.questions.random_final(self.history)
+            return
+
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-        except Exception as e:
+            with questions_db.connection() as conn:
+                # random rank lookup in the sampling index instead of ORDER BY RANDOM() over every final
+                final_id = random_final_id(conn, exclude=self.history.played if self.history else None)
+                questions = fetch_questions(conn, [final_id] if final_id is not None else [])
+        except sqlite3.Error as e:
             logger.error(f"Couldn't connect to db for random quesiton: {e}")
             return
 
-        sql_query = f"""
-        SELECT clue,answer,value,category,origin
-        FROM questions
-        WHERE value = -1
-        ORDER BY RANDOM()
-        LIMIT 1
-        """
-
-        cursor.execute(sql_query)
-        question_tuple = cursor.fetchone()
-
-
-
-        self.final_q = Question(question_tuple[0],question_tuple[1],question_tuple[2],question_tuple[3],question_tuple[4])
-
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        self.final_q = questions.get(final_id)
+        if self.final_q is None:
+            logger.error("No final jeopardy question found in the database.")
 
 
 # helper functions
 
-def check_for_all_answered(question_rects: dict[Question, pygame.rect.Rect]) -> bool:
-    """Checks if every question in dict has been answered. Returns bool answer.
+def check_for_all_answered(questions: Iterable[Question]) -> bool:
+    """Checks if every question has been answered. Returns bool answer.
 
     Args:
-        question_rects (dict[Question, pygame.rect.Rect]): Gameboard dictionary containing questions
+        questions (Iterable[Question]): questions on the gameboard
     """
 
-    for q in question_rects:
+    for q in questions:
         if not q.answered:
             return False
     return True
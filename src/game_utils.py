@@ -1,137 +1,124 @@
 from __future__ import annotations
-from locale import currency
 import sqlite3
-import os
 import logging
 import random
+import sys
+from typing import TYPE_CHECKING
+from .schema import BOARD_VALUES, pick_eligible_categories, random_clue_ids, random_final_id
+from .db import questions_db
+from .history import PlayHistory
+
+if TYPE_CHECKING:
+    from .question_pack import QuestionPack
 
 # logger
 logger = logging.getLogger(__name__)
 
-# path to db
-script_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(script_dir)
-db_path = os.path.join(parent_dir, "data", "questions.db")
-
 class Round:
-    def __init__(self):
+    # boards are prefetched and packed, slots keep thousands of these small
+    __slots__ = ("categories",)
+
+    def __init__(self, categories: list[Category] | None = None, history: PlayHistory | None = None):
         self.categories: list[Category] = []
-        cats = self.get_eligible_categories(6)
+        # categories already loaded in bulk by load_board
+        if categories is not None:
+            self.categories = categories
+            return
+
+        cats = self.get_eligible_categories(6, history)
         for cat in cats:
-            self.categories.append(Category(cat))
+            self.categories.append(Category(cat, history=history))
 
-    def get_eligible_categories(self, num_categories: int = 6) -> list[str]:
+    def get_eligible_categories(self, num_categories: int = 6, history: PlayHistory | None = None) -> list[str]:
         """
         Selects N random categories that have at least one question for each
         of the 5 standard dollar values (100, 200, 300, 400, 500).
-        It explicitly excludes categories that only contain questions with value -1.
+        It explicitly excludes categories that only contain questions with value -1,
+        and categories played in the last few games when a history is given.
         """
         eligible_categories = []
-        
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-        except Exception as e:
-            logger.error(f"Unable to connect to db: {e}")
-            return []
-
-        # SQL to find categories that have at least one question for each of the 5 values
-        # and ensure they have questions with values other than -1
-        sql_query = """
-        SELECT category
-        FROM questions
-        WHERE value IN (100, 200, 300, 400, 500)
-        GROUP BY category
-        HAVING COUNT(DISTINCT value) = 5
-        AND SUM(CASE WHEN value != -1 THEN 1 ELSE 0 END) > 0; -- Ensures it's not a -1 only category
-        """
-        
+
         try:
-            cursor.execute(sql_query)
-            all_eligible_titles = [row[0] for row in cursor.fetchall()]
-            
-            if len(all_eligible_titles) == 0:
+            with questions_db.connection() as conn:
+                # indexed lookup in the eligible category index instead of aggregating every question
+                eligible_categories = pick_eligible_categories(
+                    conn, num_categories, exclude=history.category_played if history else None)
+
+            if len(eligible_categories) == 0:
                 logger.critical("No categories found in the database that meet the criteria (5 unique standard values and not -1 only). Please check your database.")
                 return []
 
-            if len(all_eligible_titles) < num_categories:
-                logger.warning(f"Only found {len(all_eligible_titles)} categories with 5 unique standard values. Requesting {num_categories}. Will return fewer.")
-                # Return all available eligible categories, even if fewer than requested
-                return all_eligible_titles 
-                
-            # Randomly select num_categories from the eligible list
-            eligible_categories = random.sample(all_eligible_titles, num_categories)
+            if len(eligible_categories) < num_categories:
+                logger.warning(f"Only found {len(eligible_categories)} categories with 5 unique standard values. Requesting {num_categories}. Will return fewer.")
 
         except sqlite3.Error as e:
             logger.error(f"Database error fetching eligible categories: {e}")
-        finally:
-            conn.close()
-            
-        return eligible_categories        
+
+        return eligible_categories
+
 class Category:
-    def __init__(self, title: str):
-        self.title = title
+    __slots__ = ("title", "questions")
+
+    def __init__(self, title: str, questions: list[Question] | None = None, history: PlayHistory | None = None):
+        self.title = sys.intern(title)
         self.questions: list[Question] = []
-        self._get_unique_value_questions(title)
+        # questions already loaded in bulk by load_board
+        if questions is not None:
+            self.questions = sorted(questions, key=lambda q: q.value)
+            return
+
+        self._get_unique_value_questions(title, history)
 
-    def _get_unique_value_questions(self, category_title: str):
+    def _get_unique_value_questions(self, category_title: str, history: PlayHistory | None = None):
         """
         Attempts to retrieve one question for each of the standard Jeopardy dollar values
-        (100, 200, 300, 400, 500) for a given category.
+        (100, 200, 300, 400, 500) for a given category, skipping clues played in the
+        last few games when a history is given.
         If a value is not found, it will not be included.
         """
-        desired_values = [100, 200, 300, 400, 500]
         found_questions = []
 
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-        except Exception as e:
-            logger.error(f"Unable to connect to db: {e}")
-            return []
-
-        for value in desired_values:
-            sql_query = """
-            SELECT clue, answer, value, category, origin
-            FROM questions
-            WHERE category = ? AND value = ?
-            ORDER BY RANDOM()
-            LIMIT 1;
-            """
-            try:
-                # Pass a tuple of parameters as the second argument to execute 
-                # so quotes don't mess with retrival
-                cursor.execute(sql_query, (category_title, value))
-                
-                row = cursor.fetchone()
-                if row:
-                    found_questions.append(Question(*row))
+            with questions_db.connection() as conn:
+                # random rank lookups in the sampling index instead of ORDER BY RANDOM() per value
+                ids = random_clue_ids(conn, [(category_title, value) for value in BOARD_VALUES],
+                                      exclude=history.played if history else None)
+                questions = fetch_questions(conn, list(ids.values()))
+
+            for value in BOARD_VALUES:
+                question_id = ids.get((category_title, value))
+                if question_id in questions:
+                    found_questions.append(questions[question_id])
                 else:
                     logger.warning(f"Category '{category_title}' missing question for value ${value}.")
-            except sqlite3.Error as e:
-                logger.error(f"Database error fetching question for {category_title} at ${value}: {e}")
-                continue # Continue to next value even if one fails
+        except sqlite3.Error as e:
+            logger.error(f"Database error fetching questions for {category_title}: {e}")
 
-        conn.close()
         found_questions.sort(key=lambda q: q.value)
         self.questions = found_questions
+
 class Question:
     """
     Represents a question including its clue, answer, value, category, and origin.
     
     Notes: 
         value = -1 defines a final jeopardy question
+        id is the row id in questions.db, stable across db, board pack and question pack, None when unknown
+        category and origin are interned, every question of a category shares one string
     """
+    __slots__ = ("id", "clue", "answer", "value", "category", "origin", "answered")
     
-    def __init__(self, clue: str, answer: str, value: int, category: str, origin: str):
+    def __init__(self, clue: str, answer: str, value: int, category: str, origin: str, id: int | None = None):
+        self.id = id
         self.clue = clue
         self.answer = answer
         self.value = value
-        self.category = category
-        self.origin = origin
+        self.category = sys.intern(category) if category is not None else None
+        self.origin = sys.intern(origin) if origin is not None else None
         self.answered = False
 
 class Player:
+    __slots__ = ("name", "score", "answered")
 
     def __init__(self, player_num: int) -> None:
          self.name = f"Player {player_num}"
@@ -139,7 +126,95 @@ class Player:
          self.answered = False
 
 
-    
-
+def load_board(num_rounds: int, num_categories: int = 6, history: PlayHistory | None = None,
+               questions: QuestionPack | None = None) -> tuple[list[Round], Question | None]:
+    """
+    Loads every round of a board plus the final jeopardy question over the shared
+    connection: categories come from the eligible category index and questions from
+    the sampling index, instead of one eligibility query per Round and five
+    ORDER BY RANDOM() queries per Category.
+
+    Args:
+        num_rounds (int): number of rounds to build
+        num_categories (int): categories per round
+        history (PlayHistory, optional): categories and clues played in its window are skipped
+        questions (QuestionPack, optional): read from this memory-mapped pack instead of the db
+
+    Returns:
+        tuple[list[Round], Question | None]: the rounds and the final question
+        (None if no final question could be found)
+    """
+    if questions is not None:
+        return questions.load_board(num_rounds, num_categories, history)
+
+    rounds: list[Round] = []
+    final_q = None
+    try:
+        with questions_db.connection() as conn:
+            # categories for the whole board come from the eligible category index at once
+            # so rounds never share one
+            needed = num_rounds * num_categories
+            picked = pick_eligible_categories(conn, needed, exclude=history.category_played if history else None)
+
+            if len(picked) == 0:
+                logger.critical("No categories found in the database that meet the criteria (5 unique standard values and not -1 only). Please check your database.")
 
-    
\ No newline at end of file
+            if len(picked) >= needed:
+                round_titles = [picked[i * num_categories:(i + 1) * num_categories] for i in range(num_rounds)]
+            else:
+                logger.warning(f"Only found {len(picked)} categories with 5 unique standard values. Requesting {needed}. Rounds may repeat categories or have fewer.")
+                round_titles = [random.sample(picked, min(num_categories, len(picked))) for _ in range(num_rounds)]
+
+            # one random question per (category, value) for every picked category plus the
+            # final, all from indexed rank lookups
+            titles = list({t for titles in round_titles for t in titles})
+            played = history.played if history else None
+            ids = random_clue_ids(conn, [(title, value) for title in titles for value in BOARD_VALUES], exclude=played)
+            final_id = random_final_id(conn, exclude=played)
+            rows = fetch_question_rows(conn, list(ids.values()) + ([final_id] if final_id is not None else []))
+
+        rows_by_title: dict[str, list[tuple]] = {}
+        for question_id, *row in rows:
+            if question_id == final_id:
+                final_q = Question(*row, id=question_id)
+            else:
+                rows_by_title.setdefault(row[3], []).append((question_id, row))
+
+        for titles in round_titles:
+            categories = []
+            for title in titles:
+                # fresh Question objects per round, values are scaled per round by Game.play_round
+                questions = [Question(*row, id=question_id) for question_id, row in rows_by_title.get(title, [])]
+                if len(questions) != len(BOARD_VALUES):
+                    logger.warning(f"Category '{title}' loaded {len(questions)} of {len(BOARD_VALUES)} questions.")
+                categories.append(Category(title, questions))
+            rounds.append(Round(categories))
+
+        if final_q is None:
+            logger.error("No final jeopardy question found in the database.")
+
+    except sqlite3.Error as e:
+        logger.error(f"Database error loading board: {e}")
+
+    return rounds, final_q
+
+def board_history_entry(rounds: list[Round], final_q: Question | None) -> tuple[list[int], list[str]]:
+    """Question ids and distinct category titles of a board, as PlayHistory stores them."""
+    question_ids = [q.id for round in rounds for cat in round.categories for q in cat.questions]
+    if final_q is not None:
+        question_ids.append(final_q.id)
+    return question_ids, list({cat.title for round in rounds for cat in round.categories})
+
+def fetch_question_rows(conn: sqlite3.Connection, question_ids: list[int]) -> list[tuple]:
+    """Returns (id, clue, answer, value, category, origin) rows for the given question ids."""
+    if not question_ids:
+        return []
+    return conn.execute(f"""
+        SELECT q.id, q.clue, q.answer, q.value, c.title, q.origin
+        FROM questions q LEFT JOIN categories c ON c.id = q.category_id
+        WHERE q.id IN ({",".join("?" * len(question_ids))})
+    """, question_ids).fetchall()
+
+def fetch_questions(conn: sqlite3.Connection, question_ids: list[int]) -> dict[int, Question]:
+    """Returns Question objects for the given question ids, keyed by id."""
+    return {row[0]: Question(*row[1:], id=row[0]) for row in fetch_question_rows(conn, question_ids)}
@@ -0,0 +1,182 @@
+from __future__ import annotations
+from collections import Counter, deque
+import os
+import logging
+import sqlite3
+import threading
+
+# logger
+logger = logging.getLogger(__name__)
+
+# path to history db, kept apart from questions.db which the game opens read-only
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+history_path = os.path.join(parent_dir, "data", "history.db")
+
+# clues and categories are not repeated within this many games
+HISTORY_GAMES = 50
+
+HISTORY_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        played_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS played_questions (
+        game_id INTEGER NOT NULL REFERENCES games (id),
+        question_id INTEGER NOT NULL,
+        PRIMARY KEY (game_id, question_id)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS played_categories (
+        game_id INTEGER NOT NULL REFERENCES games (id),
+        title TEXT NOT NULL,
+        PRIMARY KEY (game_id, title)
+    ) WITHOUT ROWID
+    ''',
+]
+
+class PlayHistory:
+    """
+    Play history across sessions with constant-time "played recently" checks.
+
+    Every game's question ids and category titles are stored in history.db. Only the last
+    `games` games are loaded: question ids into a bitmap (one bit per id) and titles into a
+    counter, so a pick checks one bit or one dict entry however long the history gets. A
+    clue can be used by more than one game in the window, so ids are counted as well and
+    a bit is only cleared once no game in the window uses that id.
+
+    Boards that were built but not played yet are held in memory only (hold()), so boards
+    built after them avoid them too without anything being stored until record_game().
+
+    Attributes:
+        path: path to the history db
+        games: size of the no-repeat window in games
+    """
+
+    def __init__(self, path: str = history_path, games: int = HISTORY_GAMES):
+        self.path = path
+        self.games = games
+        self._bits = bytearray()
+        self._questions: Counter[int] = Counter()
+        self._categories: Counter[str] = Counter()
+        # ids and titles of boards built but not played yet, never stored
+        self._held_questions: Counter[int] = Counter()
+        self._held_categories: Counter[str] = Counter()
+        # (question ids, titles) per game in the window, oldest first
+        self._window: deque[tuple[list[int], list[str]]] = deque()
+        # boards are built and recorded on the prefetch thread
+        self._lock = threading.Lock()
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        with conn:
+            for statement in HISTORY_TABLES:
+                conn.execute(statement)
+        return conn
+
+    def _load(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Unable to open play history, repeats are possible: {e}")
+            return
+
+        try:
+            game_ids = [row[0] for row in conn.execute("SELECT id FROM games ORDER BY id DESC LIMIT ?", (self.games,))]
+            for game_id in reversed(game_ids):
+                question_ids = [row[0] for row in conn.execute(
+                    "SELECT question_id FROM played_questions WHERE game_id = ?", (game_id,))]
+                titles = [row[0] for row in conn.execute(
+                    "SELECT title FROM played_categories WHERE game_id = ?", (game_id,))]
+                self._add_to_window(question_ids, titles)
+        except sqlite3.Error as e:
+            logger.error(f"Unable to load play history: {e}")
+        finally:
+            conn.close()
+
+        logger.info(f"Loaded play history: {len(self._window)} games, {len(self._categories)} categories.")
+
+    def _set_bit(self, question_id: int, on: bool):
+        byte, bit = divmod(question_id, 8)
+        if byte >= len(self._bits):
+            if not on:
+                return
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        if on:
+            self._bits[byte] |= 1 << bit
+        else:
+            self._bits[byte] &= ~(1 << bit) & 0xFF
+
+    def _add_to_window(self, question_ids: list[int], titles: list[str]):
+        for question_id in question_ids:
+            self._questions[question_id] += 1
+            self._set_bit(question_id, True)
+        self._categories.update(titles)
+        self._window.append((question_ids, titles))
+
+        while len(self._window) > self.games:
+            old_ids, old_titles = self._window.popleft()
+            for question_id in old_ids:
+                self._questions[question_id] -= 1
+                # still used by a newer game in the window
+                if self._questions[question_id] <= 0:
+                    del self._questions[question_id]
+                    self._set_bit(question_id, False)
+            self._categories.subtract(old_titles)
+            self._categories += Counter()  # drop titles whose count reached zero
+
+    def played(self, question_id: int | None) -> bool:
+        """True if the question was used in the last `games` games."""
+        if question_id is None:
+            return False
+        byte, bit = divmod(question_id, 8)
+        if byte < len(self._bits) and self._bits[byte] >> bit & 1:
+            return True
+        return question_id in self._held_questions
+
+    def category_played(self, title: str) -> bool:
+        """True if the category was used in the last `games` games."""
+        return title in self._categories or title in self._held_categories
+
+    def hold(self, question_ids: list[int], titles: list[str]):
+        """Keeps a built but unplayed board's clues and categories out of new boards until released."""
+        with self._lock:
+            self._held_questions.update(i for i in question_ids if i is not None)
+            self._held_categories.update(titles)
+
+    def release(self, question_ids: list[int], titles: list[str]):
+        """Undoes hold(), for a board that was played (and recorded) or thrown away."""
+        with self._lock:
+            self._held_questions.subtract(i for i in question_ids if i is not None)
+            self._held_categories.subtract(titles)
+            # drop entries whose count reached zero
+            self._held_questions += Counter()
+            self._held_categories += Counter()
+
+    def record_game(self, question_ids: list[int], titles: list[str]):
+        """Stores a game's questions and categories and adds them to the no-repeat window."""
+        question_ids = [i for i in question_ids if i is not None]
+        with self._lock:
+            self._add_to_window(question_ids, titles)
+
+            try:
+                conn = self._connect()
+            except sqlite3.Error as e:
+                logger.error(f"Unable to save play history: {e}")
+                return
+            try:
+                with conn:
+                    game_id = conn.execute("INSERT INTO games DEFAULT VALUES").lastrowid
+                    conn.executemany("INSERT OR IGNORE INTO played_questions (game_id, question_id) VALUES (?, ?)",
+                                     ((game_id, i) for i in question_ids))
+                    conn.executemany("INSERT OR IGNORE INTO played_categories (game_id, title) VALUES (?, ?)",
+                                     ((game_id, t) for t in titles))
+            except sqlite3.Error as e:
+                logger.error(f"Unable to save play history: {e}")
+            finally:
+                conn.close()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Callable
+import heapq
+import itertools
+import logging
+import pygame
+
+from data.settings import FPS
+
+# logger
+logger = logging.getLogger(__name__)
+
+# how often a poll callback is checked while waiting on something outside pygame, e.g. serial
+POLL_MS = 10
+
+# events after which the screen contents can't be trusted and are redrawn
+_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED,
+                  pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED}
+
+class FrameLoop:
+    """
+    Central event loop shared by every screen of the game.
+
+    A screen hands run() an event handler and a draw callback. The screen is drawn once,
+    then only again after invalidate() (or an expose event), never more than `fps` times a
+    second. While nothing animates the loop sleeps inside pygame.event.wait until an event,
+    a scheduled callback, a timeout or the next poll is due, so an idle screen costs close
+    to no cpu instead of spinning on pygame.event.get.
+
+    Attributes:
+        fps: frame cap
+        frames: frames drawn
+        wakeups: times the loop woke up from waiting
+        on_quit: called for pygame.QUIT, optional
+        on_expose: called when the window contents were damaged or resized, optional, e.g. to
+            drop a renderer's idea of what is on screen
+    """
+
+    def __init__(self, fps: int = FPS, on_quit: Callable[[], None] | None = None,
+                 on_expose: Callable[[], None] | None = None):
+        self.fps = fps
+        self.on_quit = on_quit
+        self.on_expose = on_expose
+        self.frames = 0
+        self.wakeups = 0
+        self.clock = pygame.time.Clock()
+        self._dirty = True
+        self._timers: list[tuple[int, int, Callable[[], bool | None]]] = []
+        self._order = itertools.count()
+
+    def invalidate(self):
+        """Marks the screen as changed, the running draw callback is called on the next frame."""
+        self._dirty = True
+
+    def after(self, delay_ms: int, callback: Callable[[], bool | None]):
+        """Schedules callback in delay_ms, a callback returning True ends the innermost run()."""
+        heapq.heappush(self._timers, (pygame.time.get_ticks() + delay_ms, next(self._order), callback))
+
+    def run(self, handle: Callable[[pygame.event.Event], bool | None], draw: Callable[[], None] | None = None,
+            timeout_ms: int | None = None, poll: Callable[[], bool] | None = None, animate: bool = False) -> bool:
+        """Draws and dispatches events until handle or a poll/timer callback returns True.
+
+        Args:
+            handle (Callable): called with every event, True ends the run
+            draw (Callable, optional): draws and updates the display, called once and after invalidate()
+            timeout_ms (int, optional): ends the run after this long
+            poll (Callable, optional): checked every POLL_MS, True ends the run
+            animate (bool): redraw every frame at the frame cap instead of waiting for changes
+
+        Returns:
+            bool: False if the run timed out, True otherwise
+        """
+        deadline = pygame.time.get_ticks() + timeout_ms if timeout_ms is not None else None
+        self._dirty = True
+        while True:
+            if draw is not None and (self._dirty or animate):
+                self._dirty = False
+                draw()
+                self.frames += 1
+                # spaces frames at least 1/fps apart
+                self.clock.tick(self.fps)
+
+            now = pygame.time.get_ticks()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, callback = heapq.heappop(self._timers)
+                if callback():
+                    return True
+            if poll is not None and poll():
+                return True
+            if deadline is not None and now >= deadline:
+                return False
+
+            # sleep until something can happen, indefinitely if nothing is due
+            due = [when for when in (deadline, self._timers[0][0] if self._timers else None) if when is not None]
+            if poll is not None:
+                due.append(now + POLL_MS)
+            if animate:
+                due.append(now + 1000 // self.fps)
+            event = pygame.event.wait(max(0, min(due) - now)) if due else pygame.event.wait()
+            self.wakeups += 1
+
+            # drain everything queued behind the event in the same wakeup
+            for event in itertools.chain((event,), pygame.event.get()):
+                if event.type == pygame.NOEVENT:
+                    continue
+                if event.type in _EXPOSE_EVENTS:
+                    self._dirty = True
+                    if self.on_expose is not None:
+                        self.on_expose()
+                if event.type == pygame.QUIT and self.on_quit is not None:
+                    self.on_quit()
+                if handle(event):
+                    return True
+
+    def wait_for_key(self, *keys: int, draw: Callable[[], None] | None = None) -> int:
+        """Shows draw until one of keys is pressed, returns that key."""
+        pressed = None
+
+        def handle(event: pygame.event.Event) -> bool:
+            nonlocal pressed
+            if event.type == pygame.KEYDOWN and event.key in keys:
+                pressed = event.key
+                return True
+            return False
+
+        self.run(handle, draw)
+        return pressed
+
+    def describe(self) -> str:
+        return f"{self.frames} frames, {self.wakeups} wakeups, {self.clock.get_fps():.0f} fps"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, TypeVar
+import logging
+
+# logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class BoardPrefetcher(Generic[T]):
+    """
+    Builds the next board on a worker thread so a game can start without waiting on the db.
+
+    take() hands over the prefetched board and immediately starts building the one after
+    it. If the prefetch is still running take() waits for it: a synchronous build would
+    only queue behind it on the shared db connection. A board is built synchronously only
+    when nothing was prefetched or the prefetch failed.
+
+    Attributes:
+        build: callable returning a new board, e.g. lambda: GameBoard(2)
+    """
+
+    def __init__(self, build: Callable[[], T]):
+        self.build = build
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="board-prefetch")
+        self._future: Future[T] | None = None
+
+    def prefetch(self):
+        """Starts building the next board unless one is already built or in progress."""
+        if self._future is None:
+            self._future = self._executor.submit(self.build)
+
+    def ready(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def take(self) -> T:
+        """Returns a board, prefetched if one was started, and starts prefetching the next one."""
+        board = None
+        if self._future is not None:
+            if not self._future.done():
+                logger.info("Waiting for the prefetched board.")
+            try:
+                board = self._future.result()
+                logger.info("Using prefetched board.")
+            except Exception as e:
+                logger.error(f"Board prefetch failed: {e}")
+            self._future = None
+
+        if board is None:
+            logger.info("No prefetched board, building synchronously.")
+            board = self.build()
+
+        self.prefetch()
+        return board
+
+    def shutdown(self):
+        """Stops the worker, an in-progress build is left to finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+from array import array
+import mmap
+import os
+import logging
+import random
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+from .schema import BOARD_VALUES, FINAL_VALUE, EXCLUDE_RETRIES
+from .game_utils import Round, Category, Question
+from .history import PlayHistory
+
+# logger
+logger = logging.getLogger(__name__)
+
+# path to pack
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(script_dir)
+question_pack_path = os.path.join(parent_dir, "data", "questions.qpack")
+
+# File layout, little-endian, every section 8-byte aligned:
+#   header       magic, version, counts and the byte offset of each section
+#   string index u64 per string + 1, string i is blob[index[i]:index[i + 1]] as utf-8
+#   string blob  every clue, answer, title and origin (titles and origins stored once)
+#   categories   u32 title string per category number
+#   buckets      u32 per (category, value) + 1, records of category c and the j-th board value
+#                are records[buckets[c * 5 + j]:buckets[c * 5 + j + 1]]
+#   eligible     u32 category numbers that have all five values
+#   records      fixed size question records, board questions sorted by (category, value)
+#                followed by the finals, records[buckets[-1]:]
+_MAGIC = b"JQPK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIIIIQQQQQQ")
+_RECORD = struct.Struct("<IIIiII")  # id, clue, answer, value, category title, origin
+_NONE = 0xFFFFFFFF
+
+def _align(f):
+    f.write(b"\0" * (-f.tell() % 8))
+
+class _StringTable:
+    """Builds the string blob on disk, titles and origins are interned, clues are not."""
+
+    def __init__(self):
+        self.blob = tempfile.TemporaryFile()
+        self.index = array("Q", [0])
+        self._interned: dict[str, int] = {}
+
+    def add(self, text: str | None, intern: bool = False) -> int:
+        if text is None:
+            return _NONE
+        if intern and text in self._interned:
+            return self._interned[text]
+        data = text.encode("utf-8")
+        self.blob.write(data)
+        self.index.append(self.index[-1] + len(data))
+        i = len(self.index) - 2
+        if intern:
+            self._interned[text] = i
+        return i
+
+def write_question_pack(conn: sqlite3.Connection, path: str = question_pack_path) -> dict[str, int]:
+    """Converts the questions table into a question pack, returns the counts written.
+
+    The pack is written next to path and renamed over it once complete.
+    """
+    strings = _StringTable()
+    records = bytearray()
+    category_titles = array("I")
+    buckets = array("I")
+    eligible = array("I")
+    value_slot = {value: j for j, value in enumerate(BOARD_VALUES)}
+
+    # board questions in (category, value) order, the questions_category_value index serves the sort
+    rows = conn.execute(f"""
+        SELECT q.id, q.clue, q.answer, q.value, q.category_id, c.title, q.origin
+        FROM questions q JOIN categories c ON c.id = q.category_id
+        WHERE q.value IN ({", ".join(str(v) for v in BOARD_VALUES)}) AND q.playable
+        ORDER BY q.category_id, q.value
+    """)
+    current = None
+    for question_id, clue, answer, value, category_id, title, origin in rows:
+        if category_id != current:
+            current = category_id
+            category_titles.append(strings.add(title, intern=True))
+            buckets.extend([_NONE] * len(BOARD_VALUES))
+        slot = (len(category_titles) - 1) * len(BOARD_VALUES) + value_slot[value]
+        if buckets[slot] == _NONE:
+            buckets[slot] = len(records) // _RECORD.size
+        records += _RECORD.pack(question_id, strings.add(clue), strings.add(answer), value,
+                                category_titles[-1], strings.add(origin, intern=True))
+    num_board = len(records) // _RECORD.size
+    buckets.append(num_board)
+
+    # empty buckets start where the next one does, so every bucket is [start, next start)
+    for slot in range(len(buckets) - 2, -1, -1):
+        if buckets[slot] == _NONE:
+            buckets[slot] = buckets[slot + 1]
+    for c in range(len(category_titles)):
+        first = c * len(BOARD_VALUES)
+        if all(buckets[first + j] < buckets[first + j + 1] for j in range(len(BOARD_VALUES))):
+            eligible.append(c)
+
+    rows = conn.execute("""
+        SELECT q.id, q.clue, q.answer, q.value, c.title, q.origin
+        FROM questions q LEFT JOIN categories c ON c.id = q.category_id
+        WHERE q.value = ? AND q.playable
+    """, (FINAL_VALUE,))
+    for question_id, clue, answer, value, title, origin in rows:
+        records += _RECORD.pack(question_id, strings.add(clue), strings.add(answer), value,
+                                strings.add(title, intern=True), strings.add(origin, intern=True))
+    num_records = len(records) // _RECORD.size
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        offsets = []
+        for section in (strings.index, None, category_titles, buckets, eligible, records):
+            _align(f)
+            offsets.append(f.tell())
+            if section is None:
+                strings.blob.seek(0)
+                shutil.copyfileobj(strings.blob, f)
+            else:
+                f.write(section)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(strings.index) - 1, len(category_titles),
+                             len(eligible), num_records, *offsets))
+    strings.blob.close()
+    os.replace(tmp, path)
+
+    counts = {"strings": len(strings.index) - 1, "categories": len(category_titles), "eligible": len(eligible),
+              "questions": num_board, "finals": num_records - num_board}
+    logger.info(f"Wrote question pack {path}: {counts}")
+    return counts
+
+class QuestionPack:
+    """
+    Read-only, memory-mapped question pack, an alternative to questions.db for kiosks.
+
+    Boards are picked with index arithmetic on views of the mapping, only the records and
+    strings of the picked questions are ever read, so there is no sql to parse and only
+    touched pages count towards RSS. Built by write_question_pack (scripts/build_question_pack.py).
+
+    Attributes:
+        path: path to the pack file
+    """
+
+    def __init__(self, path: str = question_pack_path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._views: list[memoryview] = []
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _open(self):
+        with self._lock:
+            if self._mmap is not None:
+                return
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            (magic, version, num_strings, num_categories, num_eligible, num_records,
+             strings_at, blob_at, categories_at, buckets_at, eligible_at, records_at) = _HEADER.unpack_from(mm)
+            if magic != _MAGIC or version != _VERSION:
+                mm.close()
+                raise ValueError(f"{self.path} is not a version {_VERSION} question pack")
+
+            view = memoryview(mm)
+            self._string_index = view[strings_at:strings_at + (num_strings + 1) * 8].cast("Q")
+            self._blob = view[blob_at:categories_at]
+            self._categories = view[categories_at:categories_at + num_categories * 4].cast("I")
+            num_buckets = num_categories * len(BOARD_VALUES) + 1
+            self._buckets = view[buckets_at:buckets_at + num_buckets * 4].cast("I")
+            self._eligible = view[eligible_at:eligible_at + num_eligible * 4].cast("I")
+            self._records = view[records_at:records_at + num_records * _RECORD.size]
+            self._num_records = num_records
+            self._views = [view, self._string_index, self._blob, self._categories, self._buckets,
+                           self._eligible, self._records]
+            self._mmap = mm
+            logger.info(f"Opened question pack: {self.path} ({num_records} questions)")
+
+    def close(self):
+        with self._lock:
+            # views must be released before the mapping can close
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def _string(self, i: int) -> str | None:
+        if i == _NONE:
+            return None
+        return str(self._blob[self._string_index[i]:self._string_index[i + 1]], "utf-8")
+
+    def _question(self, record: int) -> Question:
+        question_id, clue, answer, value, title, origin = _RECORD.unpack_from(self._records, record * _RECORD.size)
+        return Question(self._string(clue), self._string(answer), value, self._string(title),
+                        self._string(origin), id=question_id)
+
+    def _pick_record(self, start: int, end: int, rng, history: PlayHistory | None) -> int:
+        """Random record in [start, end), redrawn while the history has played it."""
+        record = rng.randrange(start, end)
+        if history is not None:
+            for _ in range(min(EXCLUDE_RETRIES, end - start - 1)):
+                if not history.played(_RECORD.unpack_from(self._records, record * _RECORD.size)[0]):
+                    break
+                record = rng.randrange(start, end)
+        return record
+
+    def _pick_categories(self, count: int, rng, history: PlayHistory | None) -> list[int]:
+        count = min(count, len(self._eligible))
+        if history is None:
+            return [self._eligible[i] for i in rng.sample(range(len(self._eligible)), count)]
+
+        # same redraws as schema.pick_eligible_categories: oversample, redraw from the untried
+        # eligible categories up to EXCLUDE_RETRIES times, played ones only fill what's left
+        total = len(self._eligible)
+        fresh, played = [], []
+        drawn: set[int] = set()
+        for _ in range(EXCLUDE_RETRIES + 1):
+            wanted = count - len(fresh)
+            available = total - len(drawn)
+            if wanted <= 0 or available <= 0:
+                break
+            sample = min(available, wanted * 2)
+            if not drawn:
+                candidates = rng.sample(range(total), sample)
+            elif available < total // 2:
+                candidates = rng.sample([i for i in range(total) if i not in drawn], sample)
+            else:
+                candidates = []
+                while len(candidates) < sample:
+                    i = rng.randrange(total)
+                    if i not in drawn and i not in candidates:
+                        candidates.append(i)
+            drawn.update(candidates)
+
+            for i in candidates:
+                category = self._eligible[i]
+                if history.category_played(self._string(self._categories[category])):
+                    played.append(category)
+                elif len(fresh) < count:
+                    fresh.append(category)
+
+        if len(fresh) < count and played:
+            logger.warning(f"Reusing {min(len(played), count - len(fresh))} recently played categories.")
+        return (fresh + played)[:count]
+
+    def load_board(self, num_rounds: int, num_categories: int = 6, history: PlayHistory | None = None,
+                   rng=None) -> tuple[list[Round], Question | None]:
+        """Same contract as game_utils.load_board, read from the pack instead of the db."""
+        rng = rng or random
+        self._open()
+
+        needed = num_rounds * num_categories
+        picked = self._pick_categories(needed, rng, history)
+        if len(picked) < needed:
+            logger.warning(f"Only found {len(picked)} eligible categories in the pack. Requesting {needed}. Rounds may repeat categories or have fewer.")
+            round_categories = [rng.sample(picked, min(num_categories, len(picked))) for _ in range(num_rounds)]
+        else:
+            round_categories = [picked[i * num_categories:(i + 1) * num_categories] for i in range(num_rounds)]
+
+        rounds = []
+        for categories in round_categories:
+            round = []
+            for category in categories:
+                first = category * len(BOARD_VALUES)
+                questions = [self._question(self._pick_record(self._buckets[first + j], self._buckets[first + j + 1], rng, history))
+                             for j in range(len(BOARD_VALUES))]
+                round.append(Category(questions[0].category, questions))
+            rounds.append(Round(round))
+
+        return rounds, self.random_final(history, rng)
+
+    def random_final(self, history: PlayHistory | None = None, rng=None) -> Question | None:
+        """A random final jeopardy question, None if the pack has none."""
+        rng = rng or random
+        self._open()
+
+        first = self._buckets[len(self._buckets) - 1]
+        if first >= self._num_records:
+            logger.error("No final jeopardy question found in the question pack.")
+            return None
+        return self._question(self._pick_record(first, self._num_records, rng, history))
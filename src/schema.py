@@ -0,0 +1,693 @@
+from __future__ import annotations
+from typing import Callable
+from contextlib import contextmanager
+import hashlib
+import sqlite3
+import logging
+import random
+import re
+import unicodedata
+
+# logger
+logger = logging.getLogger(__name__)
+
+# standard board values, a category is eligible for a round once it has all of them
+BOARD_VALUES = (100, 200, 300, 400, 500)
+
+# final jeopardy questions are stored with value -1
+FINAL_VALUE = -1
+
+_VALUES_SQL = ", ".join(str(v) for v in BOARD_VALUES)
+
+# schema version stored in PRAGMA user_version, see MIGRATIONS
+SCHEMA_VERSION = 4
+
+# redraws per pick when an exclude callback rejects a category or clue, bounds the cost of
+# skipping recently played ones; a repeat is served once they run out
+EXCLUDE_RETRIES = 8
+
+# Questions
+# category titles live once in categories, questions point at them by id. value is
+# checked to be a real INTEGER so comparisons never depend on type affinity.
+CATEGORIES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL UNIQUE
+    )
+'''
+
+QUESTIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        clue TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        value INTEGER NOT NULL CHECK (typeof(value) = 'integer'),
+        category_id INTEGER REFERENCES categories (id),
+        origin TEXT
+    )
+'''
+
+# (category_id, value) covers the per category lookups and eligibility counts,
+# (value, category_id) covers anything filtering on value first such as finals
+QUESTION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS questions_category_value ON questions (category_id, value)",
+    "CREATE INDEX IF NOT EXISTS questions_value_category ON questions (value, category_id)",
+]
+
+# Content hash
+# 64-bit hash of a question's normalized clue, answer and category (see content_hash), unique
+# so re-scraped or re-imported questions are ignored on insert instead of duplicated
+CONTENT_HASH_COLUMN = "ALTER TABLE questions ADD COLUMN content_hash INTEGER"
+CONTENT_HASH_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS questions_content_hash ON questions (content_hash)"
+
+_WORDS = re.compile(r"\w+")
+
+def _normalize(text: str | None) -> str:
+    # case, unicode forms, punctuation and spacing differences don't make a new question
+    return " ".join(_WORDS.findall(unicodedata.normalize("NFKC", text or "").casefold()))
+
+def content_hash(clue: str | None, answer: str | None, category: str | None) -> int:
+    """Signed 64-bit hash of the normalized clue, answer and category title.
+
+    The value is left out, so a clue re-aired in the same category at another value is still
+    a duplicate.
+    """
+    key = "\x1f".join((_normalize(clue), _normalize(answer), _normalize(category)))
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+# Playable flag
+# 0 for questions the audit (scripts/audit_db.py) found unfit for a board: empty, media
+# dependent, a final without a category or a duplicate. The derived indexes below only hold
+# playable questions, so board generation never draws them. The partial index keeps the
+# flagged ones a seek away.
+PLAYABLE_COLUMN = "ALTER TABLE questions ADD COLUMN playable INTEGER NOT NULL DEFAULT 1"
+PLAYABLE_INDEX = "CREATE INDEX IF NOT EXISTS questions_unplayable ON questions (playable) WHERE playable = 0"
+
+# Scrape checkpoints
+# one row per J! Archive game id committed together with its questions, so an interrupted
+# scrape resumes where it stopped and a re-run never inserts a game twice. questions is 0
+# for pages that were fetched but incomplete.
+SCRAPED_GAMES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS scraped_games (
+        game_id INTEGER PRIMARY KEY,
+        questions INTEGER NOT NULL,
+        scraped_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Eligible category index
+# category_values counts questions per (category, board value). eligible_categories holds
+# every category with all 5 values, its ids are kept dense (1..n) so picking k random
+# categories is k primary key lookups instead of a GROUP BY over the whole questions table.
+ELIGIBLE_INDEX = [
+    '''
+    CREATE TABLE IF NOT EXISTS category_values (
+        category_id INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (category_id, value)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS eligible_categories (
+        id INTEGER PRIMARY KEY,
+        category_id INTEGER NOT NULL UNIQUE
+    )
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_eligible_insert
+    AFTER INSERT ON questions
+    WHEN NEW.value IN ({_VALUES_SQL}) AND NEW.category_id IS NOT NULL AND NEW.playable
+    BEGIN
+        INSERT INTO category_values (category_id, value, n) VALUES (NEW.category_id, NEW.value, 1)
+            ON CONFLICT (category_id, value) DO UPDATE SET n = n + 1;
+        INSERT OR IGNORE INTO eligible_categories (category_id)
+            SELECT NEW.category_id
+            WHERE (SELECT COUNT(*) FROM category_values WHERE category_id = NEW.category_id) = {len(BOARD_VALUES)};
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_eligible_delete
+    AFTER DELETE ON questions
+    WHEN OLD.value IN ({_VALUES_SQL}) AND OLD.playable
+    BEGIN
+        UPDATE category_values SET n = n - 1 WHERE category_id = OLD.category_id AND value = OLD.value;
+        DELETE FROM category_values WHERE category_id = OLD.category_id AND value = OLD.value AND n <= 0;
+        DELETE FROM eligible_categories
+            WHERE category_id = OLD.category_id
+            AND (SELECT COUNT(*) FROM category_values WHERE category_id = OLD.category_id) < {len(BOARD_VALUES)};
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_eligible_update
+    AFTER UPDATE OF value, category_id, playable ON questions
+    BEGIN
+        UPDATE category_values SET n = n - 1
+            WHERE category_id = OLD.category_id AND value = OLD.value AND OLD.value IN ({_VALUES_SQL}) AND OLD.playable;
+        DELETE FROM category_values WHERE category_id = OLD.category_id AND value = OLD.value AND n <= 0;
+        DELETE FROM eligible_categories
+            WHERE category_id = OLD.category_id
+            AND (SELECT COUNT(*) FROM category_values WHERE category_id = OLD.category_id) < {len(BOARD_VALUES)};
+        INSERT INTO category_values (category_id, value, n)
+            SELECT NEW.category_id, NEW.value, 1
+            WHERE NEW.value IN ({_VALUES_SQL}) AND NEW.category_id IS NOT NULL AND NEW.playable
+            ON CONFLICT (category_id, value) DO UPDATE SET n = n + 1;
+        INSERT OR IGNORE INTO eligible_categories (category_id)
+            SELECT NEW.category_id
+            WHERE (SELECT COUNT(*) FROM category_values WHERE category_id = NEW.category_id) = {len(BOARD_VALUES)};
+    END
+    ''',
+    # move the highest id into the hole left by a removed category so ids stay dense
+    '''
+    CREATE TRIGGER IF NOT EXISTS eligible_categories_compact
+    AFTER DELETE ON eligible_categories
+    BEGIN
+        UPDATE eligible_categories SET id = OLD.id
+            WHERE id = (SELECT MAX(id) FROM eligible_categories) AND id > OLD.id;
+    END
+    ''',
+]
+
+# Random sampling index
+# clue_ranks gives the questions of every (category, board value) dense ranks 0..n-1 and
+# final_ranks does the same for all finals. A uniform random clue is then a random rank
+# below n and one primary key lookup, instead of ORDER BY RANDOM() sorting every match.
+# Deletes move the last rank into the hole so ranks stay dense.
+SAMPLING_INDEX = [
+    '''
+    CREATE TABLE IF NOT EXISTS clue_ranks (
+        category_id INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        rank INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        PRIMARY KEY (category_id, value, rank)
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS clue_ranks_question ON clue_ranks (question_id)",
+    '''
+    CREATE TABLE IF NOT EXISTS final_ranks (
+        rank INTEGER PRIMARY KEY,
+        question_id INTEGER NOT NULL
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS final_ranks_question ON final_ranks (question_id)",
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_ranks_insert
+    AFTER INSERT ON questions
+    WHEN NEW.value IN ({_VALUES_SQL}) AND NEW.category_id IS NOT NULL AND NEW.playable
+    BEGIN
+        INSERT INTO clue_ranks (category_id, value, rank, question_id)
+            VALUES (NEW.category_id, NEW.value,
+                    COALESCE((SELECT MAX(rank) FROM clue_ranks WHERE category_id = NEW.category_id AND value = NEW.value), -1) + 1,
+                    NEW.id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS questions_ranks_delete
+    AFTER DELETE ON questions
+    WHEN EXISTS (SELECT 1 FROM clue_ranks WHERE question_id = OLD.id AND category_id = OLD.category_id AND value = OLD.value)
+    BEGIN
+        UPDATE clue_ranks SET question_id = (
+                SELECT question_id FROM clue_ranks
+                WHERE category_id = OLD.category_id AND value = OLD.value
+                ORDER BY rank DESC LIMIT 1)
+            WHERE category_id = OLD.category_id AND value = OLD.value AND question_id = OLD.id;
+        DELETE FROM clue_ranks
+            WHERE category_id = OLD.category_id AND value = OLD.value
+            AND rank = (SELECT MAX(rank) FROM clue_ranks WHERE category_id = OLD.category_id AND value = OLD.value);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS questions_ranks_update_old
+    AFTER UPDATE OF value, category_id, playable ON questions
+    WHEN (OLD.category_id IS NOT NEW.category_id OR OLD.value IS NOT NEW.value OR OLD.playable IS NOT NEW.playable)
+    -- update_new may already have ranked the row under the same key when only playable changed
+    AND OLD.playable AND EXISTS (SELECT 1 FROM clue_ranks WHERE question_id = OLD.id AND category_id = OLD.category_id AND value = OLD.value)
+    BEGIN
+        UPDATE clue_ranks SET question_id = (
+                SELECT question_id FROM clue_ranks
+                WHERE category_id = OLD.category_id AND value = OLD.value
+                ORDER BY rank DESC LIMIT 1)
+            WHERE category_id = OLD.category_id AND value = OLD.value AND question_id = OLD.id;
+        DELETE FROM clue_ranks
+            WHERE category_id = OLD.category_id AND value = OLD.value
+            AND rank = (SELECT MAX(rank) FROM clue_ranks WHERE category_id = OLD.category_id AND value = OLD.value);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_ranks_update_new
+    AFTER UPDATE OF value, category_id, playable ON questions
+    WHEN (OLD.category_id IS NOT NEW.category_id OR OLD.value IS NOT NEW.value OR OLD.playable IS NOT NEW.playable)
+    AND NEW.value IN ({_VALUES_SQL}) AND NEW.category_id IS NOT NULL AND NEW.playable
+    BEGIN
+        INSERT INTO clue_ranks (category_id, value, rank, question_id)
+            VALUES (NEW.category_id, NEW.value,
+                    COALESCE((SELECT MAX(rank) FROM clue_ranks WHERE category_id = NEW.category_id AND value = NEW.value), -1) + 1,
+                    NEW.id);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_final_ranks_insert
+    AFTER INSERT ON questions
+    WHEN NEW.value = {FINAL_VALUE} AND NEW.playable
+    BEGIN
+        INSERT INTO final_ranks (rank, question_id)
+            VALUES (COALESCE((SELECT MAX(rank) FROM final_ranks), -1) + 1, NEW.id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS questions_final_ranks_delete
+    AFTER DELETE ON questions
+    WHEN EXISTS (SELECT 1 FROM final_ranks WHERE question_id = OLD.id)
+    BEGIN
+        UPDATE final_ranks SET question_id = (SELECT question_id FROM final_ranks ORDER BY rank DESC LIMIT 1)
+            WHERE question_id = OLD.id;
+        DELETE FROM final_ranks WHERE rank = (SELECT MAX(rank) FROM final_ranks);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS questions_final_ranks_update
+    AFTER UPDATE OF value, playable ON questions
+    WHEN COALESCE(OLD.value = {FINAL_VALUE} AND OLD.playable, 0) != COALESCE(NEW.value = {FINAL_VALUE} AND NEW.playable, 0)
+    BEGIN
+        UPDATE final_ranks SET question_id = (SELECT question_id FROM final_ranks ORDER BY rank DESC LIMIT 1)
+            WHERE question_id = OLD.id;
+        DELETE FROM final_ranks
+            WHERE OLD.value = {FINAL_VALUE} AND OLD.playable AND rank = (SELECT MAX(rank) FROM final_ranks);
+        INSERT INTO final_ranks (rank, question_id)
+            SELECT COALESCE((SELECT MAX(rank) FROM final_ranks), -1) + 1, NEW.id
+            WHERE NEW.value = {FINAL_VALUE} AND NEW.playable;
+    END
+    ''',
+]
+
+def create_table(conn: sqlite3.Connection):
+    """Creates the questions table and its derived indexes, migrating an older db if needed."""
+    migrate(conn)
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Returns the schema version of the db, 0 for a legacy or empty db."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def needs_migration(conn: sqlite3.Connection) -> bool:
+    """True for an existing questions db below SCHEMA_VERSION, an empty db is simply created.
+
+    Migrating can delete rows (v3 drops duplicates), so tools refuse such a db and leave it
+    to scripts/migrate_db.py instead of migrating as a side effect.
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return False
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'questions'").fetchone() is not None
+
+def migrate(conn: sqlite3.Connection, analyze: bool = True) -> int:
+    """Applies every migration above the db's schema version, each in its own transaction.
+
+    Args:
+        conn (sqlite3.Connection): read-write connection to the questions db
+        analyze (bool): run ANALYZE after migrating so the planner has fresh statistics
+
+    Returns:
+        int: the schema version the db ended at
+    """
+    version = schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    for target, (description, step) in sorted(MIGRATIONS.items()):
+        if target <= version:
+            continue
+        logger.info(f"Migrating questions db to version {target}: {description}")
+        with conn:
+            conn.execute("BEGIN")
+            step(conn)
+            if target == SCHEMA_VERSION:
+                # steps only drop the derived indexes, they're built once against the final schema
+                _fill_eligible_index(conn)
+                _fill_sampling_index(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+        version = target
+
+    if analyze:
+        conn.execute("ANALYZE")
+    return version
+
+def _migrate_v1(conn: sqlite3.Connection):
+    """Normalizes categories into their own table and stores value as INTEGER, the derived
+    indexes are rebuilt keyed by category id after the last migration."""
+    # derived tables and triggers from before versioning are keyed by category title
+    _drop_derived_indexes(conn)
+
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'questions'"
+    ).fetchone()
+    if legacy:
+        conn.execute("ALTER TABLE questions RENAME TO questions_v0")
+
+    conn.execute(CATEGORIES_TABLE)
+    conn.execute(QUESTIONS_TABLE)
+
+    if legacy:
+        conn.execute("""
+            INSERT INTO categories (title)
+            SELECT DISTINCT category FROM questions_v0 WHERE category IS NOT NULL
+        """)
+        # INTEGER affinity already turned numeric strings into integers, anything else is unusable
+        copied = conn.execute("""
+            INSERT INTO questions (id, clue, answer, value, category_id, origin)
+            SELECT q.id, q.clue, q.answer, q.value, c.id, q.origin
+            FROM questions_v0 q LEFT JOIN categories c ON c.title = q.category
+            WHERE typeof(q.value) = 'integer'
+        """).rowcount
+        total = conn.execute("SELECT COUNT(*) FROM questions_v0").fetchone()[0]
+        if copied != total:
+            logger.warning(f"Dropped {total - copied} questions without an integer value.")
+        conn.execute("DROP TABLE questions_v0")
+
+    for statement in QUESTION_INDEXES:
+        conn.execute(statement)
+
+def _migrate_v2(conn: sqlite3.Connection):
+    """Adds the scrape checkpoint table."""
+    conn.execute(SCRAPED_GAMES_TABLE)
+
+def _migrate_v3(conn: sqlite3.Connection):
+    """Adds the unique content hash and removes the duplicates it finds."""
+    # not maintained row by row through the bulk delete
+    _drop_derived_indexes(conn)
+    conn.execute(CONTENT_HASH_COLUMN)
+    conn.create_function("content_hash", 3, content_hash, deterministic=True)
+    conn.execute("""
+        UPDATE questions SET content_hash = content_hash(clue, answer, (SELECT title FROM categories WHERE id = category_id))
+    """)
+    removed = conn.execute("""
+        DELETE FROM questions WHERE id NOT IN (SELECT MIN(id) FROM questions GROUP BY content_hash)
+    """).rowcount
+    logger.info(f"Removed {removed} duplicate questions.")
+    conn.execute(CONTENT_HASH_INDEX)
+
+def _migrate_v4(conn: sqlite3.Connection):
+    """Adds the playable flag, every question starts out playable."""
+    # the triggers gain playable conditions
+    _drop_derived_indexes(conn)
+    conn.execute(PLAYABLE_COLUMN)
+    conn.execute(PLAYABLE_INDEX)
+
+def _drop_derived_indexes(conn: sqlite3.Connection):
+    """Drops every trigger on questions and the derived tables, _fill_* recreate them."""
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN ('questions', 'eligible_categories')"
+    ).fetchall()
+    for (name,) in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    for table in ("category_values", "eligible_categories", "clue_ranks", "final_ranks"):
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+# version -> (description, step), applied in order by migrate
+MIGRATIONS = {
+    1: ("normalized categories, INTEGER values, covering and derived indexes", _migrate_v1),
+    2: ("scrape checkpoints", _migrate_v2),
+    3: ("unique content hash, duplicate questions removed", _migrate_v3),
+    4: ("playable flag", _migrate_v4),
+}
+
+@contextmanager
+def bulk_load(conn: sqlite3.Connection):
+    """Drops the derived indexes and their triggers for a bulk insert and rebuilds them once after.
+
+    Use inside the transaction that inserts the rows, if the block raises the indexes are
+    not rebuilt and rolling the transaction back restores them.
+    """
+    _drop_derived_indexes(conn)
+    yield
+    _fill_eligible_index(conn)
+    _fill_sampling_index(conn)
+
+def rebuild_eligible_index(conn: sqlite3.Connection):
+    """Recomputes category_values and eligible_categories from the questions table.
+
+    Used after bulk loads, the triggers keep it current otherwise.
+    """
+    with conn:
+        _fill_eligible_index(conn)
+    count = conn.execute("SELECT COUNT(*) FROM eligible_categories").fetchone()[0]
+    logger.info(f"Eligible category index rebuilt: {count} categories.")
+
+def _fill_eligible_index(conn: sqlite3.Connection):
+    # dropping also drops the compaction trigger, which would fight a bulk delete
+    conn.execute("DROP TABLE IF EXISTS eligible_categories")
+    conn.execute("DROP TABLE IF EXISTS category_values")
+    for statement in ELIGIBLE_INDEX:
+        conn.execute(statement)
+    conn.execute(f"""
+        INSERT INTO category_values (category_id, value, n)
+        SELECT category_id, value, COUNT(*)
+        FROM questions
+        WHERE value IN ({_VALUES_SQL}) AND category_id IS NOT NULL AND playable
+        GROUP BY category_id, value
+    """)
+    conn.execute(f"""
+        INSERT INTO eligible_categories (category_id)
+        SELECT category_id
+        FROM category_values
+        GROUP BY category_id
+        HAVING COUNT(*) = {len(BOARD_VALUES)}
+    """)
+
+def rebuild_sampling_index(conn: sqlite3.Connection):
+    """Recomputes clue_ranks and final_ranks from the questions table."""
+    with conn:
+        _fill_sampling_index(conn)
+    count = conn.execute("SELECT COUNT(*) FROM final_ranks").fetchone()[0]
+    logger.info(f"Sampling index rebuilt: {count} finals.")
+
+def _fill_sampling_index(conn: sqlite3.Connection):
+    conn.execute("DROP TABLE IF EXISTS clue_ranks")
+    conn.execute("DROP TABLE IF EXISTS final_ranks")
+    for statement in SAMPLING_INDEX:
+        conn.execute(statement)
+    conn.execute(f"""
+        INSERT INTO clue_ranks (category_id, value, rank, question_id)
+        SELECT category_id, value, ROW_NUMBER() OVER (PARTITION BY category_id, value ORDER BY id) - 1, id
+        FROM questions
+        WHERE value IN ({_VALUES_SQL}) AND category_id IS NOT NULL AND playable
+    """)
+    conn.execute(f"""
+        INSERT INTO final_ranks (rank, question_id)
+        SELECT ROW_NUMBER() OVER (ORDER BY id) - 1, id
+        FROM questions
+        WHERE value = {FINAL_VALUE} AND playable
+    """)
+
+def category_ids(conn: sqlite3.Connection, titles) -> dict[str, int]:
+    """Returns the category id for each title, adding categories that don't exist yet."""
+    titles = list(set(titles))
+    conn.executemany("INSERT OR IGNORE INTO categories (title) VALUES (?)", ((t,) for t in titles))
+    ids = {}
+    # stay under SQLite's bound parameter limit
+    for start in range(0, len(titles), 500):
+        chunk = titles[start:start + 500]
+        ids.update(conn.execute(
+            f"SELECT title, id FROM categories WHERE title IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+    return ids
+
+def checkpoint_games(conn: sqlite3.Connection, games: list[tuple[int, int]]) -> set[int]:
+    """Records (game id, question count) checkpoints, returns the ids whose questions should be inserted.
+
+    That is every id not recorded yet, plus ids recorded with 0 questions (incomplete or not
+    yet played) that now have some. Call inside the transaction that inserts the games'
+    questions and only insert those of the returned ids, so a game's rows and its
+    checkpoint commit or roll back together.
+    """
+    new = set()
+    for game_id, count in games:
+        cursor = conn.execute("""
+            INSERT INTO scraped_games (game_id, questions) VALUES (?, ?)
+            ON CONFLICT (game_id) DO UPDATE SET questions = excluded.questions, scraped_at = CURRENT_TIMESTAMP
+            WHERE scraped_games.questions = 0 AND excluded.questions > 0
+        """, (game_id, count))
+        if cursor.rowcount:
+            new.add(game_id)
+    return new
+
+def scraped_game_ids(conn: sqlite3.Connection) -> set[int]:
+    """Ids of every checkpointed game."""
+    return {row[0] for row in conn.execute("SELECT game_id FROM scraped_games")}
+
+def last_scraped_game_id(conn: sqlite3.Connection) -> int:
+    """Highest game id scraped with questions, 0 if there is none."""
+    return conn.execute("SELECT MAX(game_id) FROM scraped_games WHERE questions > 0").fetchone()[0] or 0
+
+def insert_questions(conn: sqlite3.Connection, rows) -> int:
+    """Inserts (clue, answer, value, category, origin) rows, resolving category titles to ids.
+
+    Rows whose content hash is already stored are ignored, so inserting is idempotent.
+    The caller owns the transaction, wrap calls in `with conn:`.
+
+    Returns:
+        int: number of rows inserted
+    """
+    rows = list(rows)
+    ids = category_ids(conn, (row[3] for row in rows if row[3] is not None))
+    cursor = conn.executemany(
+        "INSERT OR IGNORE INTO questions (clue, answer, value, category_id, origin, content_hash) VALUES (?,?,?,?,?,?)",
+        ((clue, answer, int(value), ids.get(category), origin, content_hash(clue, answer, category))
+         for clue, answer, value, category, origin in rows),
+    )
+    return cursor.rowcount
+
+def pick_eligible_categories(conn: sqlite3.Connection, num_categories: int, rng=None,
+                             exclude: Callable[[str], bool] | None = None) -> list[str]:
+    """Picks up to num_categories distinct random eligible categories with primary key lookups.
+
+    Args:
+        conn (sqlite3.Connection): connection to the questions db
+        num_categories (int): number of categories wanted
+        rng (random.Random, optional): random source, defaults to the random module
+        exclude (Callable[[str], bool], optional): titles it returns True for are redrawn,
+            up to EXCLUDE_RETRIES times, and only used when nothing else is left
+
+    Returns:
+        list[str]: category titles in random order, fewer if not enough are eligible
+    """
+    rng = rng or random
+
+    total = conn.execute("SELECT MAX(id) FROM eligible_categories").fetchone()[0] or 0
+    picked: list[str] = []
+    rejected: list[str] = []
+    drawn: set[int] = set()
+
+    for _ in range(EXCLUDE_RETRIES + 1 if exclude else 1):
+        wanted = num_categories - len(picked)
+        available = total - len(drawn)
+        if wanted <= 0 or available <= 0:
+            break
+
+        # oversample when excluding so a few played categories don't cost another round trip
+        count = min(available, wanted * 2 if exclude else wanted)
+        if not drawn:
+            ids = rng.sample(range(1, total + 1), count)
+        elif available < total // 2:
+            ids = rng.sample([i for i in range(1, total + 1) if i not in drawn], count)
+        else:
+            ids = []
+            while len(ids) < count:
+                i = rng.randint(1, total)
+                if i not in drawn and i not in ids:
+                    ids.append(i)
+        drawn.update(ids)
+
+        rows = conn.execute(f"""
+            SELECT e.id, c.title
+            FROM eligible_categories e JOIN categories c ON c.id = e.category_id
+            WHERE e.id IN ({','.join('?' * len(ids))})
+        """, ids).fetchall()
+        titles = dict(rows)
+        for i in ids:
+            if i not in titles:
+                continue
+            if exclude and exclude(titles[i]):
+                rejected.append(titles[i])
+            elif len(picked) < num_categories:
+                picked.append(titles[i])
+
+    if len(picked) < num_categories and rejected:
+        logger.warning(f"Reusing {min(len(rejected), num_categories - len(picked))} recently played categories.")
+        picked += rejected[:num_categories - len(picked)]
+    return picked
+
+def random_clue_ids(conn: sqlite3.Connection, picks: list[tuple[str, int]], rng=None,
+                    exclude: Callable[[int], bool] | None = None) -> dict[tuple[str, int], int]:
+    """Picks a uniformly random question id for each (category, value) with indexed point lookups.
+
+    Args:
+        conn (sqlite3.Connection): connection to the questions db
+        picks (list[tuple[str, int]]): (category title, value) pairs wanted
+        rng (random.Random, optional): random source, defaults to the random module
+        exclude (Callable[[int], bool], optional): question ids it returns True for are
+            redrawn with an untried rank, up to EXCLUDE_RETRIES times per pair
+
+    Returns:
+        dict[tuple[str, int], int]: question id per pair, pairs without questions are missing
+    """
+    rng = rng or random
+    if not picks:
+        return {}
+
+    # clue_ranks holds ranks 0..n-1 per pair, MAX(rank) is a single index seek per pair
+    keys = ", ".join("(?, ?)" for _ in picks)
+    params = [p for pick in picks for p in pick]
+    rows = conn.execute(f"""
+        WITH picks(title, value) AS (VALUES {keys})
+        SELECT picks.title, picks.value, c.id,
+               (SELECT MAX(rank) FROM clue_ranks r WHERE r.category_id = c.id AND r.value = picks.value)
+        FROM picks JOIN categories c ON c.title = picks.title
+    """, params).fetchall()
+
+    pending = {(title, value): (category_id, max_rank + 1)
+               for title, value, category_id, max_rank in rows if max_rank is not None}
+    tried: dict[tuple[str, int], set[int]] = {pair: set() for pair in pending}
+    result: dict[tuple[str, int], int] = {}
+
+    for _ in range(EXCLUDE_RETRIES + 1 if exclude else 1):
+        if not pending:
+            break
+
+        ranks = []
+        for (title, value), (category_id, count) in pending.items():
+            # only ranks not tried yet, so a redraw never lands on the same excluded clue
+            rank = rng.randrange(count)
+            while rank in tried[title, value]:
+                rank = rng.randrange(count)
+            tried[title, value].add(rank)
+            ranks.append((title, value, category_id, rank))
+
+        keys = ", ".join("(?, ?, ?, ?)" for _ in ranks)
+        params = [p for rank in ranks for p in rank]
+        rows = conn.execute(f"""
+            WITH picks(title, value, category_id, rank) AS (VALUES {keys})
+            SELECT picks.title, picks.value, r.question_id
+            FROM picks JOIN clue_ranks r
+                ON r.category_id = picks.category_id AND r.value = picks.value AND r.rank = picks.rank
+        """, params).fetchall()
+
+        for title, value, question_id in rows:
+            pair = (title, value)
+            # the latest draw is kept as a fallback in case every retry is excluded
+            result[pair] = question_id
+            if not (exclude and exclude(question_id)) or len(tried[pair]) == pending[pair][1]:
+                del pending[pair]
+        # pairs whose rank vanished (deleted since MAX(rank) was read) are not retried
+        for title, value, _, _ in ranks:
+            if (title, value) not in result:
+                pending.pop((title, value), None)
+
+    return result
+
+def random_final_id(conn: sqlite3.Connection, rng=None, exclude: Callable[[int], bool] | None = None) -> int | None:
+    """Picks a uniformly random final jeopardy question id with indexed point lookups.
+
+    Ids exclude returns True for are redrawn up to EXCLUDE_RETRIES times.
+    """
+    rng = rng or random
+
+    max_rank = conn.execute("SELECT MAX(rank) FROM final_ranks").fetchone()[0]
+    if max_rank is None:
+        return None
+
+    question_id = None
+    tried: set[int] = set()
+    for _ in range(EXCLUDE_RETRIES + 1 if exclude else 1):
+        rank = rng.randrange(max_rank + 1)
+        while rank in tried:
+            rank = rng.randrange(max_rank + 1)
+        tried.add(rank)
+
+        row = conn.execute("SELECT question_id FROM final_ranks WHERE rank = ?", (rank,)).fetchone()
+        if row:
+            question_id = row[0]
+            if not (exclude and exclude(question_id)):
+                break
+        if len(tried) > max_rank:
+            break
+    return question_id
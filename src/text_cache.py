@@ -0,0 +1,63 @@
+from __future__ import annotations
+from collections import OrderedDict
+import logging
+import pygame
+
+# logger
+logger = logging.getLogger(__name__)
+
+# rendered text surfaces kept, a board frame needs about 45 and each screen a handful more
+TEXT_CACHE_ENTRIES = 512
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (text, font, color, antialias).
+
+    Board titles, dollar values, names and scores are the same strings frame after frame,
+    so font.render only runs the first time a string is drawn in a font and color. The
+    least recently used surface is dropped once more than max_entries are held. Callers
+    only blit the returned surfaces, they must not draw on them.
+
+    Attributes:
+        max_entries: surfaces kept, 0 disables caching
+        hits: renders served from the cache
+        misses: renders that ran font.render
+    """
+
+    def __init__(self, max_entries: int = TEXT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple, antialias: bool = True) -> pygame.Surface:
+        """font.render(text, antialias, color), from the cache when possible."""
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if self.max_entries:
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drops every cached surface, e.g. after the fonts were reloaded for a new resolution."""
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def describe(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"{len(self._surfaces)} surfaces, {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+# shared by every draw function
+text_cache = TextCache()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+import logging
+import pygame
+
+# logger
+logger = logging.getLogger(__name__)
+
+# wrap results kept, one per distinct (text, font, width) drawn
+WRAP_CACHE_ENTRIES = 1024
+# word widths kept per font before its table is started over
+WORD_CACHE_ENTRIES = 16384
+
+class TextWrapper:
+    """
+    Word wrapping in linear time with cached measurements.
+
+    Every word is measured once per font with font.size and every character's advance is
+    read once from font.metrics, a line's width is then the sum of its word widths plus
+    its spaces. Words wider than a line are split at the longest prefix that fits, found by
+    binary search over the running sum of glyph advances. Whole wrap results are memoized
+    per (text, font, width) in an LRU, so redrawing the same clue costs a dict lookup.
+
+    Widths are summed rather than measured per line, kerning across a space can make a
+    line a pixel or two wider or narrower than font.size of the joined line would.
+
+    Attributes:
+        hits: wraps served from the memo
+        misses: wraps computed
+    """
+
+    def __init__(self, max_entries: int = WRAP_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._wraps: OrderedDict[tuple, tuple[str, ...]] = OrderedDict()
+        self._words: dict[pygame.font.Font, dict[str, int]] = {}
+        self._glyphs: dict[pygame.font.Font, dict[str, int]] = {}
+
+    def width(self, font: pygame.font.Font, word: str) -> int:
+        """Pixel width of word, measured once per font."""
+        widths = self._words.setdefault(font, {})
+        width = widths.get(word)
+        if width is None:
+            if len(widths) >= WORD_CACHE_ENTRIES:
+                widths.clear()
+            width = widths[word] = font.size(word)[0]
+        return width
+
+    def _advances(self, font: pygame.font.Font, word: str) -> list[int]:
+        glyphs = self._glyphs.setdefault(font, {})
+        missing = [ch for ch in set(word) if ch not in glyphs]
+        if missing:
+            for ch, metrics in zip(missing, font.metrics("".join(missing))):
+                # None for characters the font has no glyph for
+                glyphs[ch] = metrics[4] if metrics else font.size(ch)[0]
+        return [glyphs[ch] for ch in word]
+
+    def split_word(self, font: pygame.font.Font, word: str, max_width: int) -> list[str]:
+        """Breaks a word wider than max_width into pieces that fit, at least one character each."""
+        # running sum of glyph advances over the whole word, computed once
+        ends = list(accumulate(self._advances(font, word)))
+        pieces = []
+        start, offset = 0, 0
+        while start < len(word):
+            # longest piece from start whose glyphs fit
+            cut = max(start + 1, bisect_right(ends, offset + max_width, start))
+            pieces.append(word[start:cut])
+            start, offset = cut, ends[cut - 1]
+        return pieces
+
+    def wrap(self, text: str, font: pygame.font.Font, max_width: int) -> tuple[str, ...]:
+        """Wraps text into lines no wider than max_width, words wider than a line are broken up."""
+        key = (text, font, max_width)
+        lines = self._wraps.get(key)
+        if lines is not None:
+            self._wraps.move_to_end(key)
+            self.hits += 1
+            return lines
+
+        self.misses += 1
+        lines = self._wrap(text, font, max_width)
+        if self.max_entries:
+            self._wraps[key] = lines
+            if len(self._wraps) > self.max_entries:
+                self._wraps.popitem(last=False)
+        return lines
+
+    def _wrap(self, text: str, font: pygame.font.Font, max_width: int) -> tuple[str, ...]:
+        space = self.width(font, " ")
+        lines: list[str] = []
+        current: list[str] = []
+        current_width = 0
+
+        for word in text.split(" "):
+            word_width = self.width(font, word)
+
+            # a word too long for any line gets lines of its own
+            if word_width > max_width:
+                if current:
+                    lines.append(" ".join(current))
+                    current, current_width = [], 0
+                lines.extend(self.split_word(font, word, max_width))
+                continue
+
+            if not current:
+                current, current_width = [word], word_width
+            elif current_width + space + word_width <= max_width:
+                current.append(word)
+                current_width += space + word_width
+            else:
+                lines.append(" ".join(current))
+                current, current_width = [word], word_width
+
+        if current:
+            lines.append(" ".join(current))
+        return tuple(lines)
+
+    def clear(self):
+        """Drops the memo and every measurement, e.g. after the fonts were reloaded."""
+        self._wraps.clear()
+        self._words.clear()
+        self._glyphs.clear()
+
+    def describe(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"{len(self._wraps)} wraps, {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+# shared by every draw function
+text_wrapper = TextWrapper()